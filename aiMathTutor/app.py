@@ -1,7 +1,8 @@
 import streamlit as st
-from core.rag.generator import ProblemGenerator
-from core.openai.generator import OpenAIProblemGenerator
-import json
+from core.rag.generator import get_problem_generator
+from core.openai.generator import get_openai_problem_generator, get_stream_stats
+from core.problem.template_registry import get_template_registry
+from core.knowledge.knowledge_map import get_knowledge_map_snapshot
 from ui.components.history_viewer import HistoryViewer
 import nest_asyncio
 import asyncio
@@ -59,6 +60,9 @@ def initialize_session_state():
     if "user_id" not in st.session_state:
         st.session_state.user_id = "test_user"  # 실제 구현시 로그인 시스템과 연동
         logger.info("세션 상태 초기화: user_id = test_user")
+    if "quiz_problems" not in st.session_state:
+        st.session_state.quiz_problems = []  # 현재 문제를 제외한 퀴즈 문항
+        logger.info("세션 상태 초기화: quiz_problems = []")
     if "problem_history" not in st.session_state:
         st.session_state.problem_history = []  # 문제 히스토리 저장용
         logger.info("세션 상태 초기화: problem_history = []")
@@ -160,12 +164,74 @@ def display_problem_area(problem: dict, key_prefix: str, is_current: bool = Fals
         st.markdown("</div>", unsafe_allow_html=True)
 
 
+def generate_problem_for_concept(
+    concept_id: str, difficulty: str, on_field=None
+) -> dict:
+    """
+    템플릿이 있는 개념은 템플릿으로 바로 생성하고, 없으면 OpenAI로 생성
+    - on_field를 주면 OpenAI 응답을 스트리밍으로 받아 필드가 완성될 때마다 전달
+    """
+    problem = get_template_registry().generate_problem(concept_id, difficulty)
+    if problem is not None:
+        logger.info(f"템플릿으로 문제 생성 - 개념: {concept_id}")
+        return problem
+    return get_openai_problem_generator().generate_problem(
+        concept_id, difficulty, on_field
+    )
+
+
+def generate_quiz_for_concept(
+    concept_id: str, difficulty: str, problem_count: int, on_problem=None
+) -> list:
+    """
+    퀴즈 생성
+    - 템플릿이 있는 개념은 템플릿의 배치 생성으로 한 번에 생성
+    - 없으면 OpenAI 호출을 동시에 진행하고, 완성되는 문항부터 on_problem으로 전달
+    """
+    registry = get_template_registry()
+    if registry.has_template(concept_id):
+        logger.info(f"템플릿으로 퀴즈 생성 - 개념: {concept_id}")
+        problems = registry.generate_problems(concept_id, difficulty, problem_count)
+        for problem in problems:
+            if on_problem:
+                on_problem(problem)
+        return problems
+
+    generator = get_openai_problem_generator()
+    problems = []
+
+    async def collect():
+        async for problem in generator.generate_quiz(
+            concept_id, difficulty, problem_count
+        ):
+            problem["id"] = str(uuid.uuid4())
+            problems.append(problem)
+            if on_problem:
+                on_problem(problem)
+
+    asyncio.get_event_loop().run_until_complete(collect())
+    return problems
+
+
 def generate_next_problem(next_problem_info: dict, problem_type: str):
     """다음 문제 생성"""
     try:
-        generator = OpenAIProblemGenerator()
-        new_problem = generator.generate_problem(
-            next_problem_info["concept"], next_problem_info["difficulty"]
+        # 문제 본문이 완성되면 해설을 기다리지 않고 먼저 보여줌
+        streaming = st.empty()
+        shown = {}
+
+        def show_field(key: str, value):
+            shown[key] = value
+            with streaming.container():
+                if "question" in shown:
+                    st.markdown(f"**문제:** {shown['question']}")
+                for i, option in enumerate(shown.get("options", []), 1):
+                    st.write(f"{i}. {option}")
+                if "explanation" not in shown:
+                    st.caption("해설 생성 중...")
+
+        new_problem = generate_problem_for_concept(
+            next_problem_info["concept"], next_problem_info["difficulty"], show_field
         )
 
         # 현재 문제를 히스토리에 추가
@@ -179,29 +245,6 @@ def generate_next_problem(next_problem_info: dict, problem_type: str):
         st.error(f"문제 생성 중 오류가 발생했습니다: {str(e)}")
 
 
-def load_knowledge_map():
-    """지식 맵 데이터를 로드합니다."""
-    with open("data/knowledge_map.json", "r", encoding="utf-8") as f:
-        return json.load(f)
-
-
-def get_units_for_domain(knowledge_map, domain_id):
-    """선택된 도메인의 단원 목록을 반환합니다."""
-    for domain in knowledge_map["domains"]:
-        if domain["id"] == domain_id:
-            return domain["units"]
-    return []
-
-
-def get_concepts_for_unit(knowledge_map, domain_id, unit_id):
-    """선택된 단원의 개념 목록을 반환합니다."""
-    units = get_units_for_domain(knowledge_map, domain_id)
-    for unit in units:
-        if unit["id"] == unit_id:
-            return unit["concepts"]
-    return []
-
-
 def main():
     # 메인 컨텐츠
     st.title("🎓 AI 수학 튜터")
@@ -218,37 +261,36 @@ def main():
 
         st.header("학습 경로 설정")
 
-        # 지식 맵 로드
-        knowledge_map = load_knowledge_map()
+        # 지식 맵 (파일이 바뀌면 백그라운드에서 다시 읽은 스냅샷)
+        knowledge_map_snapshot = get_knowledge_map_snapshot()
+        knowledge_map = knowledge_map_snapshot.value
 
         # 도메인 선택
-        domain_options = [(d["id"], d["name"]) for d in knowledge_map["domains"]]
+        domain_names = dict(knowledge_map.domain_options)
         selected_domain_id = st.selectbox(
             "도메인",
-            options=[d[0] for d in domain_options],
-            format_func=lambda x: next(d[1] for d in domain_options if d[0] == x),
+            options=list(domain_names),
+            format_func=domain_names.get,
             key="domain_selector",
         )
 
         # 선택된 도메인의 단원 목록
-        units = get_units_for_domain(knowledge_map, selected_domain_id)
-        unit_options = [(u["id"], u["name"]) for u in units]
+        unit_names = dict(knowledge_map.get_units(selected_domain_id))
         selected_unit_id = st.selectbox(
             "단원",
-            options=[u[0] for u in unit_options],
-            format_func=lambda x: next(u[1] for u in unit_options if u[0] == x),
+            options=list(unit_names),
+            format_func=unit_names.get,
             key="unit_selector",
         )
 
         # 선택된 단원의 개념 목록
-        concepts = get_concepts_for_unit(
-            knowledge_map, selected_domain_id, selected_unit_id
+        concept_names = dict(
+            knowledge_map.get_concepts(selected_domain_id, selected_unit_id)
         )
-        concept_options = [(c["id"], c["name"]) for c in concepts]
         selected_concept_id = st.selectbox(
             "개념",
-            options=[c[0] for c in concept_options],
-            format_func=lambda x: next(c[1] for c in concept_options if c[0] == x),
+            options=list(concept_names),
+            format_func=concept_names.get,
             key="concept_selector",
         )
 
@@ -263,6 +305,17 @@ def main():
         st.write(f"단원: {selected_unit_id}")
         st.write(f"개념: {selected_concept_id}")
         st.write(f"문제 수: {st.session_state.problem_count}개")
+        st.caption(
+            f"지식 맵 v{knowledge_map_snapshot.version} "
+            f"(색인 {knowledge_map_snapshot.build_seconds * 1000:.0f} ms)"
+        )
+        stream_stats = get_stream_stats()
+        if stream_stats and stream_stats["streams"]:
+            st.caption(
+                f"스트리밍 생성 {stream_stats['streams']}회 - 문제 표시 평균 "
+                f"{stream_stats['avg_time_to_question']:.1f}초, 전체 평균 "
+                f"{stream_stats['avg_time_to_problem']:.1f}초"
+            )
         logger.info(
             f"학습 경로 설정 - 도메인: {selected_domain_id}, 단원: {selected_unit_id}, 개념: {selected_concept_id}, 문제 수: {st.session_state.problem_count}"
         )
@@ -286,27 +339,46 @@ def main():
             if st.button(
                 "📝 새로운 문제 생성", key="openai_gen", use_container_width=True
             ):
-                logger.info("OpenAI 기반 새 문제 생성 시작")
+                problem_count = st.session_state.problem_count
+                logger.info(f"OpenAI 기반 퀴즈 생성 시작 - {problem_count}문항")
+                progress = st.progress(0.0, text=f"0/{problem_count} 문항 생성")
+                preview = st.container()
+                preview_items = []
+
+                def show_progress(problem: dict):
+                    # 완성된 문항부터 미리 보여줌
+                    done = len(preview_items) + 1
+                    preview_items.append(problem)
+                    progress.progress(
+                        min(done / problem_count, 1.0),
+                        text=f"{done}/{problem_count} 문항 생성",
+                    )
+                    preview.markdown(f"**{done}.** {problem['question']}")
+
                 with st.spinner("OpenAI를 통해 문제를 생성중입니다..."):
                     try:
-                        generator = OpenAIProblemGenerator()
-                        # 현재 문제를 히스토리에 추가
+                        # 현재 문제와 이전 퀴즈 문항을 히스토리에 추가
+                        previous = st.session_state.quiz_problems
                         if st.session_state.current_problem:
+                            previous = [st.session_state.current_problem] + previous
+                        history_ids = {
+                            p.get("id") for p in st.session_state.problem_history
+                        }
+                        for prev in previous:
                             # 중복 체크 후 히스토리에 추가
-                            current_id = st.session_state.current_problem.get("id")
-                            if not any(
-                                p.get("id") == current_id
-                                for p in st.session_state.problem_history
-                            ):
-                                st.session_state.problem_history.append(
-                                    st.session_state.current_problem
-                                )
+                            if prev.get("id") not in history_ids:
+                                st.session_state.problem_history.append(prev)
                                 logger.info("이전 문제를 히스토리에 추가")
-                        # 새 문제 생성
-                        problem = generator.generate_problem(selected_concept_id, "중")
-                        st.session_state.current_problem = problem
+                        # 퀴즈 생성 (템플릿이 없는 개념만 OpenAI를 동시 호출)
+                        problems = generate_quiz_for_concept(
+                            selected_concept_id, "중", problem_count, show_progress
+                        )
+                        if not problems:
+                            raise ValueError("생성된 문항이 없습니다.")
+                        st.session_state.current_problem = problems[0]
+                        st.session_state.quiz_problems = problems[1:]
                         st.session_state.current_tab = "openai"
-                        logger.info("새 문제 생성 완료")
+                        logger.info(f"퀴즈 생성 완료 - {len(problems)}문항")
                         st.rerun()
                     except Exception as e:
                         error_msg = f"문제 생성 중 오류가 발생했습니다: {str(e)}"
@@ -314,6 +386,14 @@ def main():
                         st.error(error_msg)
                         return
 
+        # 퀴즈의 나머지 문항 표시
+        if st.session_state.current_tab == "openai" and st.session_state.quiz_problems:
+            st.markdown(
+                f"### 퀴즈 문항 ({len(st.session_state.quiz_problems) + 1}문항 중 2번부터)"
+            )
+            for idx, prob in enumerate(st.session_state.quiz_problems):
+                display_problem_area(prob, f"openai_quiz_{idx}", False)
+
         # 문제 히스토리 표시 (최신 문제가 위에 오도록)
         if st.session_state.problem_history:
             st.markdown("### 이전 문제들")
@@ -348,7 +428,7 @@ def main():
                 logger.info("RAG 기반 새 문제 생성 시작")
                 with st.spinner("유사 문제를 검색하여 새로운 문제를 생성중입니다..."):
                     try:
-                        generator = ProblemGenerator()
+                        generator = get_problem_generator()
                         problem = generator.generate_problem(selected_concept_id, "중")
                         st.session_state.current_problem = problem
                         st.session_state.current_tab = "rag"
@@ -0,0 +1,57 @@
+"""배치 임베딩 처리량 벤치마크
+
+문제 은행 전체를 (1) 문제 하나씩 create_embedding으로, (2) 길이순 정렬된
+배치 인코딩으로 임베딩하여 CPU에서의 초당 처리 문제 수를 비교합니다.
+
+실행 (aiMathTutor 디렉토리에서):
+    CUDA_VISIBLE_DEVICES= python -m benchmarks.bench_batch_embedding --batch-size 64
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from core.rag.embeddings import ProblemEmbedding
+from core.rag.generator import ProblemGenerator
+
+
+class _NullVectorStore:
+    """기록 비용을 제외하기 위해 벡터를 버리는 저장소"""
+
+    def __init__(self):
+        self.count = 0
+
+    def add_vectors(self, vectors: np.ndarray, problems) -> None:
+        self.count += len(vectors)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=ProblemEmbedding.BATCH_SIZE)
+    parser.add_argument("--chunk-size", type=int, default=ProblemEmbedding.CHUNK_SIZE)
+    parser.add_argument("--repeat", type=int, default=1, help="문제 은행 반복 횟수")
+    args = parser.parse_args()
+
+    problems = ProblemGenerator().problems * args.repeat
+    embedding = ProblemEmbedding(batch_size=args.batch_size, chunk_size=args.chunk_size)
+    embedding.create_embedding("warm up")
+
+    start = time.perf_counter()
+    for problem in problems:
+        embedding.create_embedding(problem["text"])
+    per_row_seconds = time.perf_counter() - start
+
+    embedding.vector_store = _NullVectorStore()
+    start = time.perf_counter()
+    embedding.batch_embed_problems(problems)
+    batched_seconds = time.perf_counter() - start
+
+    print(f"문제 수: {len(problems)}, batch_size={args.batch_size}")
+    print(f"문제별 인코딩: {len(problems) / per_row_seconds:8.1f} problems/sec")
+    print(f"배치 인코딩:   {len(problems) / batched_seconds:8.1f} problems/sec")
+    print(f"속도 향상:     {per_row_seconds / batched_seconds:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
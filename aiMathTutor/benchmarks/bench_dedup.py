@@ -0,0 +1,85 @@
+"""유사 중복 검출 벤치마크
+
+합성 문제를 색인한 뒤, 숫자와 단어 하나를 바꾼 변형 문제와 새 문제를 섞어 검사하여
+검사당 지연 시간과 중복률(정답 대비 재현율/오탐률)을 출력합니다.
+
+실행 (aiMathTutor 디렉토리에서):
+    python -m benchmarks.bench_dedup --size 100000 --queries 2000
+"""
+
+import argparse
+import random
+import re
+import time
+
+from core.problem.dedup import NearDuplicateDetector
+
+VOCABULARY_SIZE = 5000
+WORDS_PER_PROBLEM = 12
+
+
+def _vocabulary(rng: random.Random):
+    """한글 음절 2~3개로 된 임의 단어 목록"""
+    return [
+        "".join(chr(0xAC00 + rng.randrange(11172)) for _ in range(rng.randint(2, 3)))
+        for _ in range(VOCABULARY_SIZE)
+    ]
+
+
+def _synthetic_text(rng: random.Random, vocabulary) -> str:
+    """숫자가 섞인 임의 단어 문장"""
+    words = rng.sample(vocabulary, WORDS_PER_PROBLEM)
+    for position in rng.sample(range(WORDS_PER_PROBLEM), 3):
+        words[position] = f"{words[position]} {rng.randint(2, 999)}"
+    return " ".join(words) + "?"
+
+
+def _variant(rng: random.Random, text: str, vocabulary) -> str:
+    """숫자를 바꾸고 단어 하나를 바꾼 변형 문제"""
+    words = re.sub(r"\d+", lambda _: str(rng.randint(2, 999)), text).split(" ")
+    words[rng.randrange(len(words))] = rng.choice(vocabulary)
+    return " ".join(words)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    detector = NearDuplicateDetector()
+    vocabulary = _vocabulary(rng)
+    texts = [_synthetic_text(rng, vocabulary) for _ in range(args.size)]
+
+    start = time.perf_counter()
+    for i, text in enumerate(texts):
+        detector.add(str(i), text)
+    build_seconds = time.perf_counter() - start
+
+    # 절반은 기존 문제의 변형, 절반은 새 문제
+    queries = []
+    for q in range(args.queries):
+        if q % 2 == 0:
+            original = texts[rng.randrange(args.size)]
+            queries.append((_variant(rng, original, vocabulary), True))
+        else:
+            queries.append((_synthetic_text(rng, vocabulary), False))
+
+    true_positive = false_positive = 0
+    for q, (text, is_duplicate) in enumerate(queries):
+        found = detector.check(f"q{q}", text) is not None
+        true_positive += found and is_duplicate
+        false_positive += found and not is_duplicate
+
+    stats = detector.get_stats()
+    n_duplicates = sum(is_duplicate for _, is_duplicate in queries)
+    print(f"색인 문제 수: {args.size} (색인 {build_seconds:.1f}초)")
+    print(f"검사당 평균 시간: {stats['avg_check_ms']:.3f} ms")
+    print(f"중복률: {stats['duplicate_rate']:.3f}")
+    print(f"변형 문제 검출률: {true_positive / n_duplicates:.3f}")
+    print(f"새 문제 오탐률: {false_positive / (len(queries) - n_duplicates):.3f}")
+
+
+if __name__ == "__main__":
+    main()
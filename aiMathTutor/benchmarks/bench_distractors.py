@@ -0,0 +1,60 @@
+"""오답 생성 벤치마크
+
+임의의 덧셈 문제 묶음에 대해 오답 엔진으로 보기 세트를 한 번에 만들고,
+문제마다 반복문으로 오답을 뽑는 기존 방식과 처리 시간을 비교합니다.
+
+실행 (aiMathTutor 디렉토리에서):
+    python -m benchmarks.bench_distractors --size 100000
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from core.problem.distractors import build_option_sets, generate_distractors
+
+
+def _rejection_options(correct_answer: int):
+    """기존 방식: 무작위로 뽑고 겹치면 다시 뽑기"""
+    options = [str(correct_answer)]
+    while len(options) < 4:
+        wrong_answer = correct_answer + random.randint(-10, 10)
+        if wrong_answer != correct_answer and str(wrong_answer) not in options:
+            options.append(str(wrong_answer))
+    random.shuffle(options)
+    return options
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=100000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    operands = rng.integers(1, 1000, size=(args.size, 2))
+    answers = operands.sum(axis=1)
+
+    start = time.perf_counter()
+    wrong = generate_distractors(answers, operands, rng=rng)
+    options, positions = build_option_sets(answers, wrong, rng)
+    vectorized_seconds = time.perf_counter() - start
+
+    assert (options[np.arange(args.size), positions] == answers).all()
+    assert all(len(set(row)) == 4 for row in options.tolist())
+
+    start = time.perf_counter()
+    for answer in answers.tolist():
+        _rejection_options(answer)
+    loop_seconds = time.perf_counter() - start
+
+    print(f"보기 세트 수: {args.size}")
+    print(f"오답 엔진: {vectorized_seconds:.3f}초")
+    print(
+        f"반복 추출: {loop_seconds:.3f}초 ({loop_seconds / vectorized_seconds:.1f}배)"
+    )
+
+
+if __name__ == "__main__":
+    main()
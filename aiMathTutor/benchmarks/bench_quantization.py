@@ -0,0 +1,62 @@
+"""임베딩 양자화 벤치마크
+
+float32 / float16 / int8 저장 방식별로 검색 행렬의 메모리 크기, 쿼리 지연 시간,
+float32 정확 검색 대비 recall@k 손실을 재점수화 유무에 따라 출력합니다.
+
+실행 (aiMathTutor 디렉토리에서):
+    python -m benchmarks.bench_quantization --size 100000 --dim 768 --queries 100
+"""
+
+import argparse
+
+import numpy as np
+
+from core.rag.vector_store import (
+    NumpyVectorStore,
+    QuantizedVectorStore,
+    evaluate_recall,
+)
+from benchmarks.bench_vector_store import _synthetic_problems
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors, problems = _synthetic_problems(args.size, args.dim, rng)
+    queries = vectors[rng.choice(args.size, args.queries, replace=False)]
+    queries = queries + 0.1 * rng.normal(size=queries.shape).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+    exact = NumpyVectorStore.from_matrix(vectors, problems)
+    recall_key = f"recall@{args.top_k}"
+
+    print(f"문제 수: {args.size}, 차원: {args.dim}, 쿼리: {args.queries}")
+    print(
+        f"{'storage':<10}{'rescore':>8}{'memory(MB)':>12}{'ms/query':>10}{'recall':>10}"
+    )
+    baseline = evaluate_recall(exact, exact, queries, args.top_k)
+    print(
+        f"{'float32':<10}{'-':>8}{vectors.nbytes / 2**20:>12.1f}"
+        f"{baseline['latency_ms']:>10.3f}{baseline[recall_key]:>10.4f}"
+    )
+
+    for storage in ("float16", "int8"):
+        for rescore_factor in (1, 4):
+            store = QuantizedVectorStore.from_matrix(
+                vectors, problems, storage, rescore_factor
+            )
+            result = evaluate_recall(store, exact, queries, args.top_k)
+            print(
+                f"{storage:<10}{rescore_factor:>8}{store.memory_bytes / 2**20:>12.1f}"
+                f"{result['latency_ms']:>10.3f}{result[recall_key]:>10.4f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""적응형 요청 제한기 벤치마크
+
+분당 요청 수, 분당 토큰 수, 동시 요청 수 한도를 강제하는 가짜 OpenAI 서버를
+로컬에서 띄웁니다. 한도를 넘으면 429(요청/토큰)나 503(동시 요청)과 함께
+x-ratelimit-* / retry-after 헤더를 돌려줍니다. 같은 요청 묶음을 고정 동시성
+방식과 AdaptiveLimiter로 보내 완료 시간, 처리량, 제한 응답 수를 비교합니다.
+
+실행 (aiMathTutor 디렉토리에서):
+    python -m benchmarks.bench_rate_limiter --requests 200 --rpm 3000 --tpm 150000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from core.openai.rate_limiter import AdaptiveLimiter
+
+BURST_SECONDS = 1.0  # 서버 버킷은 1초 치까지만 모임 (순간 폭주를 막음)
+
+
+class FakeLimits:
+    def __init__(self, rpm: float, tpm: float, max_concurrency: int, latency: float):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_concurrency = max_concurrency
+        self.latency = latency
+        self.requests = rpm * BURST_SECONDS / 60
+        self.tokens = tpm * BURST_SECONDS / 60
+        self.in_flight = 0
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+        self.counts = {"ok": 0, "429": 0, "503": 0}
+
+    def admit(self, tokens: int):
+        """(상태 코드, 헤더) 반환"""
+        with self.lock:
+            now = time.monotonic()
+            elapsed, self.updated = now - self.updated, now
+            self.requests = min(
+                self.rpm * BURST_SECONDS / 60, self.requests + elapsed * self.rpm / 60
+            )
+            self.tokens = min(
+                self.tpm * BURST_SECONDS / 60, self.tokens + elapsed * self.tpm / 60
+            )
+            headers = {
+                "x-ratelimit-limit-requests": str(self.rpm),
+                "x-ratelimit-limit-tokens": str(self.tpm),
+            }
+            if self.in_flight >= self.max_concurrency:
+                self.counts["503"] += 1
+                headers["retry-after-ms"] = "200"
+                return 503, headers
+            if self.requests < 1 or self.tokens < tokens:
+                self.counts["429"] += 1
+                wait = max(
+                    (1 - self.requests) * 60 / self.rpm,
+                    (tokens - self.tokens) * 60 / self.tpm,
+                )
+                headers["retry-after-ms"] = str(int(wait * 1000) + 1)
+                headers["x-ratelimit-remaining-requests"] = str(int(self.requests))
+                headers["x-ratelimit-remaining-tokens"] = str(int(self.tokens))
+                return 429, headers
+            self.requests -= 1
+            self.tokens -= tokens
+            self.in_flight += 1
+            self.counts["ok"] += 1
+            headers["x-ratelimit-remaining-requests"] = str(int(self.requests))
+            headers["x-ratelimit-remaining-tokens"] = str(int(self.tokens))
+            return 200, headers
+
+    def done(self) -> None:
+        with self.lock:
+            self.in_flight -= 1
+
+
+def start_server(limits: FakeLimits) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            status, headers = limits.admit(body["tokens"])
+            if status == 200:
+                time.sleep(limits.latency * random.uniform(0.5, 1.5))
+                limits.done()
+            payload = json.dumps({"usage": {"total_tokens": body["tokens"]}}).encode()
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def run_fixed(url: str, sizes, concurrency: int) -> float:
+    """고정 동시성 + 고정 간격 재시도 (기존 방식)"""
+    semaphore = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(timeout=30) as client:
+
+        async def one(tokens: int):
+            async with semaphore:
+                while True:
+                    response = await client.post(url, json={"tokens": tokens})
+                    if response.status_code == 200:
+                        return
+                    await asyncio.sleep(0.1)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(tokens) for tokens in sizes))
+        return time.perf_counter() - start
+
+
+async def run_adaptive(url: str, sizes, limiter: AdaptiveLimiter) -> float:
+    async with httpx.AsyncClient(timeout=30) as client:
+
+        async def send(tokens: int):
+            response = await client.post(url, json={"tokens": tokens})
+            response.raise_for_status()
+            return response
+
+        async def one(tokens: int):
+            await limiter.call(
+                lambda: send(tokens),
+                tokens,
+                headers_of=lambda response: response.headers,
+                usage_of=lambda response: response.json()["usage"]["total_tokens"],
+            )
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(tokens) for tokens in sizes))
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--rpm", type=float, default=3000)
+    parser.add_argument("--tpm", type=float, default=150000)
+    parser.add_argument("--max-concurrency", type=int, default=12)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--fixed-concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    sizes = [rng.randint(50, 150) for _ in range(args.requests)]
+    total_tokens = sum(sizes)
+    ideal = max(args.requests * 60 / args.rpm, total_tokens * 60 / args.tpm)
+    print(
+        f"요청 {args.requests}개, 토큰 {total_tokens}개, 한도 {args.rpm:.0f} RPM / "
+        f"{args.tpm:.0f} TPM / 동시 {args.max_concurrency} (이론상 최소 {ideal:.1f}초)"
+    )
+
+    for name in ("고정 동시성", "적응형 제한기"):
+        limits = FakeLimits(args.rpm, args.tpm, args.max_concurrency, args.latency)
+        server = start_server(limits)
+        url = f"http://127.0.0.1:{server.server_port}/v1/chat/completions"
+        if name == "고정 동시성":
+            seconds = asyncio.run(run_fixed(url, sizes, args.fixed_concurrency))
+            extra = ""
+        else:
+            # 서버 한도를 모르는 기본값에서 시작하여 헤더로 학습
+            limiter = AdaptiveLimiter()
+            seconds = asyncio.run(run_adaptive(url, sizes, limiter))
+            stats = limiter.stats()
+            extra = (
+                f", 재시도 {stats['retries']}회, 최종 창 {stats['window']:.1f}, "
+                f"학습한 한도 {stats['requests_per_minute']:.0f} RPM"
+            )
+        server.shutdown()
+        print(
+            f"{name}: {seconds:.2f}초 ({args.requests / seconds:.1f} 요청/초), "
+            f"429 {limits.counts['429']}회, 503 {limits.counts['503']}회{extra}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""학급 단위 준비도/추천 벤치마크
+
+임의의 선수 관계를 가진 합성 지식 맵을 만들고, 사용자 × 개념 숙련도 행렬
+전체에 대해 준비도, 추천 난이도, 다음 개념을 한 번에 계산하는 시간과
+사용자/개념마다 check_concept_readiness를 호출하는 기존 방식의 시간을 비교합니다.
+
+실행 (aiMathTutor 디렉토리에서):
+    python -m benchmarks.bench_readiness --users 10000 --concepts 500
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from core.knowledge.learning_path_manager import LearningPathManager
+
+MAX_PREREQUISITES = 3
+
+
+def _synthetic_knowledge_map(n_concepts: int, rng: random.Random) -> dict:
+    """앞 번호 개념만 선수 개념으로 갖는 합성 지식 맵 (항상 DAG)"""
+    concepts = []
+    for i in range(n_concepts):
+        k = rng.randint(0, min(i, MAX_PREREQUISITES))
+        concepts.append(
+            {
+                "id": i,
+                "name": f"concept-{i}",
+                "prerequisites": rng.sample(range(i), k),
+                "mastery_threshold": round(rng.uniform(0.5, 0.9), 2),
+            }
+        )
+    return {"domains": [], "concepts": concepts, "learning_paths": []}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--concepts", type=int, default=500)
+    parser.add_argument("--loop-users", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as data_dir:
+        with open(os.path.join(data_dir, "knowledge_map.json"), "w") as f:
+            json.dump(_synthetic_knowledge_map(args.concepts, rng), f)
+        start = time.perf_counter()
+        manager = LearningPathManager(data_dir)
+        compile_seconds = time.perf_counter() - start
+
+    concept_ids = list(range(args.concepts))
+    mastery = np.random.default_rng(0).random((args.users, args.concepts))
+
+    start = time.perf_counter()
+    result = manager.get_batch_recommendations(mastery, concept_ids)
+    batch_seconds = time.perf_counter() - start
+
+    # 기존 방식은 일부 사용자만 측정하여 전체 시간을 추정
+    start = time.perf_counter()
+    for row in mastery[: args.loop_users]:
+        progress = dict(zip(concept_ids, row.tolist()))
+        for concept_id in concept_ids:
+            manager.check_concept_readiness(concept_id, progress)
+            manager.get_recommended_difficulty(concept_id, progress)
+    loop_seconds = (time.perf_counter() - start) * args.users / args.loop_users
+
+    with_next = sum(c is not None for c in result["next_concept"])
+    print(
+        f"사용자 {args.users}명 × 개념 {args.concepts}개 (DAG 컴파일 {compile_seconds:.2f}초)"
+    )
+    print(f"일괄 계산: {batch_seconds:.3f}초, 다음 개념이 있는 사용자 {with_next}명")
+    print(f"개별 호출 (추정): {loop_seconds:.1f}초")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""벡터 저장소 recall@k / 지연 시간 벤치마크
+
+합성 임베딩으로 각 백엔드를 만들고, NumPy 정확 검색 대비 recall@k와
+쿼리당 지연 시간을 출력합니다.
+
+실행 (aiMathTutor 디렉토리에서):
+    python -m benchmarks.bench_vector_store --size 50000 --dim 768 --queries 200
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from core.rag.vector_store import create_vector_store, evaluate_recall
+
+BACKENDS = ("numpy", "faiss-flat", "faiss-ivf", "faiss-hnsw")
+
+
+def _synthetic_problems(size: int, dim: int, rng: np.random.Generator):
+    """개념별로 군집된 정규화 벡터와 메타데이터 생성"""
+    n_concepts = max(1, size // 500)
+    centers = rng.normal(size=(n_concepts, dim)).astype(np.float32)
+    concept_ids = rng.integers(0, n_concepts, size=size)
+    vectors = centers[concept_ids] + 0.5 * rng.normal(size=(size, dim)).astype(
+        np.float32
+    )
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    difficulties = np.array(["하", "중", "상"])[rng.integers(0, 3, size=size)]
+    problems = [
+        {"id": str(i), "concept": f"concept-{c}", "difficulty": d}
+        for i, (c, d) in enumerate(zip(concept_ids, difficulties))
+    ]
+    return vectors, problems
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=50000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors, problems = _synthetic_problems(args.size, args.dim, rng)
+    queries = vectors[rng.choice(args.size, args.queries, replace=False)]
+    queries = queries + 0.1 * rng.normal(size=queries.shape).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+    exact = create_vector_store(args.dim, {"backend": "numpy"})
+    exact.add_vectors(vectors, problems)
+
+    print(f"문제 수: {args.size}, 차원: {args.dim}, 쿼리: {args.queries}")
+    print(
+        f"{'backend':<12}{'build(s)':>10}{'recall':>10}{'ms/query':>10}{'filtered':>10}"
+    )
+    for backend in BACKENDS:
+        start = time.perf_counter()
+        store = create_vector_store(args.dim, {"backend": backend})
+        store.add_vectors(vectors, problems)
+        build_seconds = time.perf_counter() - start
+
+        result = evaluate_recall(store, exact, queries, args.top_k)
+        filtered = evaluate_recall(
+            store, exact, queries, args.top_k, {"concept": "concept-0"}
+        )
+        print(
+            f"{backend:<12}{build_seconds:>10.2f}"
+            f"{result[f'recall@{args.top_k}']:>10.3f}{result['latency_ms']:>10.3f}"
+            f"{filtered[f'recall@{args.top_k}']:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
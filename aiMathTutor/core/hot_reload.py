@@ -0,0 +1,201 @@
+"""핫 리로드 모듈
+
+원본 파일(knowledge_map.json, 문제 은행 JSON)의 수정 시각/inode/크기를
+주기적으로 확인하고, 바뀌면 백그라운드 스레드에서 색인을 새로 만든 뒤
+변경 불가능한 스냅샷 객체를 통째로 교체합니다. 참조 대입은 원자적이므로
+읽는 쪽은 잠금 없이 항상 완성된 스냅샷 하나만 보며, 진행 중인 요청은
+시작할 때 받은 스냅샷을 끝까지 사용합니다.
+원본 파일 외의 변경(문제 저장소 변경 피드 등)도 게시된 값을 고치지 않고
+다음 값을 만들어 publish로 다음 버전을 게시합니다.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+logger = logging.getLogger(__name__)
+
+RELOAD_INTERVAL = 2.0  # 원본 파일 확인 주기 (초)
+
+T = TypeVar("T")
+
+FileSignature = Tuple[Tuple[str, int, int, int], ...]
+
+
+def file_signature(paths: Sequence[str]) -> FileSignature:
+    """파일별 (경로, inode, 크기, 수정 시각) (없는 파일은 -1)"""
+    signature = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            signature.append((path, st.st_ino, st.st_size, st.st_mtime_ns))
+        except OSError:
+            signature.append((path, -1, -1, -1))
+    return tuple(signature)
+
+
+class Snapshot(NamedTuple):
+    """한 번 만들어진 뒤 바뀌지 않는 색인 스냅샷"""
+
+    version: int  # 1부터 시작, 교체/게시할 때마다 1 증가
+    value: Any  # 색인 객체 (KnowledgeMap, ProblemGenerator 등)
+    signature: FileSignature  # 만들 때 확인한 원본 파일 상태
+    loaded_at: float  # 교체 시각 (time.time())
+    build_seconds: float  # 색인 생성에 걸린 시간
+
+
+class SnapshotWatcher(Generic[T]):
+    def __init__(
+        self,
+        paths: Sequence[str],
+        build: Callable[[Optional[Snapshot]], T],
+        name: str,
+        interval: float = RELOAD_INTERVAL,
+        on_swap: Optional[Callable[[Snapshot, Snapshot], None]] = None,
+    ):
+        """
+        원본 파일 감시 및 스냅샷 교체
+        Args:
+            paths (Sequence[str]): 감시할 원본 파일
+            build (Callable[[Optional[Snapshot]], T]): 원본에서 새 색인을 만드는
+                함수 (이전 스냅샷을 받으며, 첫 로드에서는 None)
+            name (str): 로그와 스레드 이름에 쓸 이름
+            interval (float): 원본 파일 확인 주기 (초)
+            on_swap (Optional[Callable]): 원본 파일로 다시 만든 스냅샷으로 교체한
+                직후 (이전, 새 스냅샷)으로 호출 (publish에서는 호출하지 않음)
+        """
+        self.paths: List[str] = list(paths)
+        self.build = build
+        self.name = name
+        self.interval = interval
+        self.on_swap = on_swap
+        self._snapshot: Optional[Snapshot] = None
+        self._failed_signature: Optional[FileSignature] = None  # 같은 실패 반복 방지
+        self._build_lock = threading.Lock()  # 색인 생성은 한 번에 하나만
+        self._swap_lock = threading.Lock()  # 교체와 게시의 버전 번호 직렬화
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def snapshot(self) -> Snapshot:
+        """현재 스냅샷 (처음 접근할 때만 만들 때까지 기다림)"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._build_lock:
+                if self._snapshot is None:
+                    self._swap(*self._build(file_signature(self.paths)))
+            snapshot = self._snapshot
+        return snapshot
+
+    def current(self) -> T:
+        return self.snapshot.value
+
+    @property
+    def version(self) -> int:
+        return self.snapshot.version
+
+    @property
+    def build_seconds(self) -> float:
+        return self.snapshot.build_seconds
+
+    def start(self) -> "SnapshotWatcher[T]":
+        """감시 스레드 시작 (이미 실행 중이면 무시)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name=f"hot-reload-{self.name}", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def check(self) -> bool:
+        """
+        원본 파일이 바뀌었으면 새 스냅샷을 만들어 교체
+        Returns:
+            bool: 교체했으면 True (실패하면 이전 스냅샷을 유지하고 False)
+        """
+        snapshot = self.snapshot
+        signature = file_signature(self.paths)
+        if signature in (snapshot.signature, self._failed_signature):
+            return False
+        with self._build_lock:
+            if signature in (self._snapshot.signature, self._failed_signature):
+                return False
+            try:
+                self._swap(*self._build(signature))
+            except Exception as e:
+                self._failed_signature = signature
+                logger.error(f"{self.name} 다시 읽기 실패, 이전 스냅샷 유지: {str(e)}")
+                return False
+        snapshot = self._snapshot
+        logger.info(
+            f"{self.name} 스냅샷 v{snapshot.version}으로 교체 "
+            f"({snapshot.build_seconds * 1000:.0f} ms)"
+        )
+        return True
+
+    def publish(self, value: T, build_seconds: float = 0.0) -> Snapshot:
+        """
+        원본 파일은 그대로 두고 새 값을 다음 버전으로 게시
+        Args:
+            value (T): 현재 값에 변경을 적용하여 새로 만든 값
+            build_seconds (float): 새 값을 만드는 데 걸린 시간
+        Returns:
+            Snapshot: 게시된 스냅샷
+        """
+        with self._swap_lock:
+            previous = self._snapshot  # 게시는 첫 스냅샷이 만들어진 뒤에만 호출됨
+            self._snapshot = Snapshot(
+                version=previous.version + 1,
+                value=value,
+                signature=previous.signature,
+                loaded_at=time.time(),
+                build_seconds=build_seconds,
+            )
+            return self._snapshot
+
+    def _build(self, signature: FileSignature) -> Tuple[T, FileSignature, float]:
+        start = time.perf_counter()
+        value = self.build(self._snapshot)
+        return value, signature, time.perf_counter() - start
+
+    def _swap(self, value: T, signature: FileSignature, build_seconds: float) -> None:
+        with self._swap_lock:
+            previous = self._snapshot
+            self._snapshot = Snapshot(
+                version=previous.version + 1 if previous else 1,
+                value=value,
+                signature=signature,
+                loaded_at=time.time(),
+                build_seconds=build_seconds,
+            )
+        if previous is not None and self.on_swap is not None:
+            try:
+                self.on_swap(previous, self._snapshot)
+            except Exception as e:
+                logger.error(f"{self.name} 이전 스냅샷 정리 실패: {str(e)}")
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"{self.name} 감시 중 오류: {str(e)}")
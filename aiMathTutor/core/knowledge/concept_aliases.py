@@ -0,0 +1,260 @@
+"""개념 별칭 모듈
+
+지식 맵 개념 ID(C1), 한국어 개념 이름(10000까지의 수), 영어 문제 은행의
+개념 이름(Carrying and Borrowing)을 서로 연결하는 별칭 표를 제공합니다.
+표는 한국어 → 영어 기본 번역과 문제 은행 개념/단원 이름의 유사도 매칭으로
+오프라인에서 한 번 만들어 data/concept_aliases.json에 저장하고, 실행 중에는
+정규화된 별칭 → 개념 dict로 O(1) 조회합니다.
+
+생성 (aiMathTutor 디렉토리에서):
+    python -m core.knowledge.concept_aliases
+"""
+
+import difflib
+import json
+import logging
+import os
+import re
+import threading
+from typing import Dict, List, Optional
+
+from .knowledge_map import KNOWLEDGE_MAP_FILE, get_knowledge_map
+
+logger = logging.getLogger(__name__)
+
+ALIASES_FILE = "data/concept_aliases.json"
+PROBLEM_BANK_FILE = "data/problems/fifth_grade_problems_all_english_v2.json"
+ALIASES_FORMAT_VERSION = 1
+
+NAME_MATCH_RATIO = 0.9  # 문자열 유사도 기준 (difflib)
+TOKEN_MATCH_RATIO = 0.6  # 단어 집합 겹침 기준 (Jaccard)
+STOP_WORDS = {"of", "and", "with", "the", "a", "to"}
+
+# 지식 맵 한국어 개념 이름 → 영어 표현 (유사도 매칭의 출발점)
+KOREAN_TO_ENGLISH = {
+    "10000까지의 수": ["Numbers up to 10000", "Place Value"],
+    "수의 크기 비교": ["Comparing Numbers"],
+    "자연수의 덧셈": [
+        "Addition of Natural Numbers",
+        "Carrying and Borrowing",
+        "Estimating Sums",
+    ],
+    "자연수의 뺄셈": [
+        "Subtraction of Natural Numbers",
+        "Carrying and Borrowing",
+        "Sequential Subtraction",
+    ],
+    "자연수의 곱셈": [
+        "Multiplication of Natural Numbers",
+        "Multiplication Tables",
+        "Grouping Models",
+    ],
+    "자연수의 나눗셈": ["Division of Natural Numbers", "Division with Remainders"],
+    "분수의 이해": ["Basic Fractions", "Proper and Improper Fractions"],
+    "분수의 덧셈": [
+        "Addition of Fractions",
+        "Addition of Like Fractions",
+        "Addition with Unlike Denominators",
+    ],
+    "분수의 뺄셈": [
+        "Subtraction of Fractions",
+        "Subtraction of Like Fractions",
+        "Subtraction with Unlike Denominators",
+    ],
+    "분수의 곱셈": ["Multiplication of Fractions"],
+    "분수의 나눗셈": ["Division of Fractions"],
+    "소수의 이해": ["Understanding Decimals", "Decimal Place Value"],
+    "소수의 덧셈과 뺄셈": ["Adding Decimals", "Subtracting Decimals"],
+    "소수의 곱셈과 나눗셈": ["Multiplying Decimals", "Dividing Decimals"],
+    "약수 찾기": ["Finding Factors", "Factors"],
+    "배수 찾기": ["Finding Multiples", "Multiples"],
+    "최대공약수": ["Greatest Common Divisor", "GCD"],
+    "최소공배수": ["Least Common Multiple", "LCM"],
+    "소수와 합성수": ["Prime and Composite Numbers", "Prime Factorization"],
+    "점과 선분": ["Points and Line Segments"],
+    "각의 이해": ["Understanding Angles", "Types of Angles"],
+    "평행과 수직": ["Parallel and Perpendicular Lines"],
+    "삼각형의 구성요소": ["Parts of a Triangle"],
+    "삼각형의 분류": ["Classifying Triangles"],
+    "삼각형의 내각": ["Angle Sum of Triangle"],
+    "삼각형의 합동": ["Congruent Triangles"],
+    "사각형의 구성요소": ["Parts of a Quadrilateral"],
+    "사각형의 분류": ["Classifying Quadrilaterals"],
+    "사각형의 성질": ["Properties of Quadrilaterals", "Area of Parallelograms"],
+    "원의 구성요소": ["Parts of a Circle", "Circles"],
+    "원의 성질": ["Properties of Circles", "Circumference"],
+    "원과 부채꼴": ["Circles and Sectors", "Area of Circle"],
+    "길이의 단위": ["Units of Length", "Unit Conversion"],
+    "시간의 덧셈과 뺄셈": ["Adding and Subtracting Time"],
+    "무게의 단위": ["Units of Mass", "Reading Scales"],
+    "들이의 단위": ["Units of Capacity", "Estimating Measures"],
+    "수 배열의 규칙": ["Number Patterns", "Arithmetic Sequences"],
+    "도형의 규칙": ["Shape Patterns", "Rule Identification"],
+    "막대그래프": ["Bar Graphs"],
+    "꺾은선그래프": ["Line Graphs"],
+    "확률의 기초": ["Probability Basics"],
+}
+
+
+def normalize_alias(text: str) -> str:
+    """별칭 비교용 정규화 (소문자, 기호/공백 정리)"""
+    text = re.sub(r"[^\w]+", " ", str(text).lower())
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _tokens(text: str) -> set:
+    """단어 집합 (복수형/진행형 어미는 떼어 냄)"""
+    return {
+        re.sub(r"(ing|es|s)$", "", t) or t
+        for t in normalize_alias(text).split()
+        if t not in STOP_WORDS
+    }
+
+
+def _similar(a: str, b: str, token_match: bool = True) -> bool:
+    """철자가 거의 같거나 (token_match이면) 핵심 단어가 충분히 겹치는지"""
+    a_norm, b_norm = normalize_alias(a), normalize_alias(b)
+    if difflib.SequenceMatcher(None, a_norm, b_norm).ratio() >= NAME_MATCH_RATIO:
+        return True
+    if not token_match:
+        return False
+    a_tokens, b_tokens = _tokens(a), _tokens(b)
+    union = a_tokens | b_tokens
+    return bool(union) and len(a_tokens & b_tokens) / len(union) >= TOKEN_MATCH_RATIO
+
+
+def build_alias_table(
+    knowledge_map_file: str = KNOWLEDGE_MAP_FILE,
+    problem_bank_file: str = PROBLEM_BANK_FILE,
+) -> List[Dict]:
+    """
+    지식 맵 개념마다 영어 별칭과 문제 은행 개념을 유사도로 매칭 (오프라인 1회)
+    - 영어 표현이 문제 은행 개념 이름과 비슷하면 그 개념을 연결
+    - 단원 이름과 철자가 거의 같으면 단원의 모든 개념을 연결
+    Returns:
+        List[Dict]: 개념별 {"id", "domain_id", "name", "english", "dataset_concepts", "related"}
+    """
+    knowledge_map = get_knowledge_map(knowledge_map_file)
+    with open(problem_bank_file, "r", encoding="utf-8") as f:
+        bank = json.load(f)
+    units: Dict[str, List[str]] = {}
+    for entry in bank:
+        units.setdefault(entry.get("unit", ""), []).append(entry.get("concept", ""))
+
+    records = []
+    for details in knowledge_map.concepts:
+        english = KOREAN_TO_ENGLISH.get(details["concept"], [])
+        matched = []
+        for alias in english:
+            for unit, concepts in units.items():
+                if _similar(alias, unit, token_match=False):
+                    matched.extend(concepts)
+                matched.extend(c for c in concepts if _similar(alias, c))
+
+        # 같은 단원의 개념과 선수 개념을 관련 개념으로 사용
+        unit_key = (details["domain_id"], details["unit_id"])
+        related = [
+            c["id"]
+            for c in knowledge_map.concepts_by_unit[unit_key]
+            if c["id"] != details["id"]
+        ] + [
+            p["id"]
+            for p in knowledge_map.prerequisites[(details["domain_id"], details["id"])]
+        ]
+
+        records.append(
+            {
+                "id": details["id"],
+                "domain_id": details["domain_id"],
+                "name": details["concept"],
+                "english": english,
+                "dataset_concepts": list(dict.fromkeys(matched)),
+                "related": list(dict.fromkeys(related)),
+            }
+        )
+    return records
+
+
+class ConceptAliases:
+    def __init__(self, records: List[Dict]):
+        """
+        별칭 → 개념 레코드 색인
+        - 같은 개념 ID가 여러 도메인에 있으면 ID 조회는 처음 나온 개념을 반환
+        Args:
+            records (List[Dict]): build_alias_table 결과
+        """
+        self.records = records
+        self._by_alias: Dict[str, Dict] = {}
+        self._by_dataset_concept: Dict[str, List[Dict]] = {}
+        for record in records:
+            for alias in [record["id"], record["name"], *record["english"]]:
+                self._by_alias.setdefault(normalize_alias(alias), record)
+            for concept in record["dataset_concepts"]:
+                self._by_dataset_concept.setdefault(
+                    normalize_alias(concept), []
+                ).append(record)
+
+    @classmethod
+    def load(cls, path: str = ALIASES_FILE) -> "ConceptAliases":
+        """저장된 별칭 표를 열고, 없거나 형식이 다르면 그 자리에서 생성"""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == ALIASES_FORMAT_VERSION:
+                return cls(data["concepts"])
+        except (OSError, ValueError) as e:
+            logger.warning(f"개념 별칭 표 로드 실패, 새로 생성합니다: {str(e)}")
+        return cls(build_alias_table())
+
+    def save(self, path: str = ALIASES_FILE) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": ALIASES_FORMAT_VERSION, "concepts": self.records},
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+
+    def resolve(self, concept: str) -> Optional[Dict]:
+        """개념 ID, 한국어 이름, 영어 별칭 중 무엇으로든 개념 레코드 조회"""
+        record = self._by_alias.get(normalize_alias(concept))
+        if record is None:
+            records = self._by_dataset_concept.get(normalize_alias(concept))
+            record = records[0] if records else None
+        return record
+
+    def dataset_concepts(self, concept: str) -> List[str]:
+        """문제 은행에서 사용할 영어 개념 이름 (매칭이 없으면 빈 목록)"""
+        record = self.resolve(concept)
+        return record["dataset_concepts"] if record else []
+
+    def related_concepts(self, concept: str) -> List[str]:
+        """관련 개념 ID (같은 단원의 개념과 선수 개념)"""
+        record = self.resolve(concept)
+        return record["related"] if record else []
+
+
+_shared_aliases: Optional[ConceptAliases] = None
+_shared_aliases_lock = threading.Lock()
+
+
+def get_concept_aliases() -> ConceptAliases:
+    """프로세스 전역 개념 별칭 표 반환 (처음 호출할 때 한 번만 로드)"""
+    global _shared_aliases
+    if _shared_aliases is None:
+        with _shared_aliases_lock:
+            if _shared_aliases is None:
+                _shared_aliases = ConceptAliases.load()
+    return _shared_aliases
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    aliases = ConceptAliases(build_alias_table())
+    aliases.save()
+    unmatched = [r["name"] for r in aliases.records if not r["dataset_concepts"]]
+    logger.info(
+        f"개념 {len(aliases.records)}개의 별칭 표를 저장했습니다. "
+        f"(문제 은행 개념이 없는 개념: {', '.join(unmatched) or '없음'})"
+    )
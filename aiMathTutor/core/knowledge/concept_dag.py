@@ -0,0 +1,202 @@
+"""Compiled Concept DAG
+
+This module compiles the concept prerequisite graph into dense NumPy form:
+concepts are renumbered in topological order, direct prerequisites are kept
+as a boolean adjacency matrix (and packed bitsets), and the transitive
+closure is precomputed so readiness checks become a single vectorized
+comparison of a mastery vector against a threshold vector.
+"""
+
+from collections import deque
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+
+DEFAULT_MASTERY_THRESHOLD = 0.7
+
+
+class ConceptDAG:
+    def __init__(
+        self,
+        concept_ids: List[Hashable],
+        prerequisites: np.ndarray,
+        thresholds: np.ndarray,
+    ):
+        """Initialize the compiled DAG.
+
+        Args:
+            concept_ids (List[Hashable]): Concept IDs in topological order
+            prerequisites (np.ndarray): (n, n) bool matrix, [i, j] is True if
+                concept j is a direct prerequisite of concept i
+            thresholds (np.ndarray): (n,) mastery threshold of each concept
+        """
+        self.concept_ids = concept_ids
+        self.index = {concept_id: i for i, concept_id in enumerate(concept_ids)}
+        self.prerequisites = prerequisites
+        self.prerequisite_bits = np.packbits(prerequisites, axis=1)
+        self.thresholds = thresholds
+        self.closure = self._transitive_closure(prerequisites)
+        self._chain_cache: Dict[Tuple[Hashable, Optional[Hashable]], List] = {}
+
+    @classmethod
+    def from_graph(
+        cls,
+        graph: nx.DiGraph,
+        default_threshold: float = DEFAULT_MASTERY_THRESHOLD,
+    ) -> "ConceptDAG":
+        """Compile a prerequisite graph (edge prereq -> concept).
+
+        Args:
+            graph (nx.DiGraph): Concept graph with optional
+                'mastery_threshold' node attributes
+            default_threshold (float): Threshold for nodes without one
+
+        Returns:
+            ConceptDAG: Compiled DAG
+        """
+        concept_ids = list(nx.topological_sort(graph))
+        index = {concept_id: i for i, concept_id in enumerate(concept_ids)}
+
+        prerequisites = np.zeros((len(concept_ids), len(concept_ids)), dtype=bool)
+        for prereq, concept in graph.edges:
+            prerequisites[index[concept], index[prereq]] = True
+
+        thresholds = np.array(
+            [
+                graph.nodes[concept_id].get("mastery_threshold", default_threshold)
+                for concept_id in concept_ids
+            ],
+            dtype=np.float64,
+        )
+        return cls(concept_ids, prerequisites, thresholds)
+
+    @staticmethod
+    def _transitive_closure(prerequisites: np.ndarray) -> np.ndarray:
+        """[i, j] is True if concept j is a direct or indirect prerequisite of i.
+
+        Rows are filled in topological order, so every prerequisite's row is
+        complete before it is merged into its dependents.
+        """
+        closure = prerequisites.copy()
+        for i in range(len(closure)):
+            direct = np.flatnonzero(prerequisites[i])
+            if len(direct):
+                closure[i] |= closure[direct].any(axis=0)
+        return closure
+
+    def __len__(self) -> int:
+        return len(self.concept_ids)
+
+    def mastery_vector(self, user_progress: Dict) -> np.ndarray:
+        """Convert a {concept_id: mastery} dict into a vector in DAG order."""
+        mastery = np.zeros(len(self), dtype=np.float64)
+        for concept_id, value in user_progress.items():
+            i = self.index.get(concept_id)
+            if i is not None:
+                mastery[i] = value
+        return mastery
+
+    def readiness(self, mastery: np.ndarray) -> np.ndarray:
+        """Readiness of every concept for one user.
+
+        Args:
+            mastery (np.ndarray): (n,) mastery vector in DAG order
+
+        Returns:
+            np.ndarray: (n,) bool, True if all direct prerequisites are mastered
+        """
+        unmastered = mastery < self.thresholds
+        return ~(self.prerequisites & unmastered).any(axis=1)
+
+    def batch_readiness(self, mastery: np.ndarray) -> np.ndarray:
+        """Readiness of every concept for many users at once.
+
+        Args:
+            mastery (np.ndarray): (users, n) mastery matrix in DAG order
+
+        Returns:
+            np.ndarray: (users, n) bool readiness matrix
+        """
+        unmastered = (mastery < self.thresholds).astype(np.float32)
+        # Number of unmastered direct prerequisites per (user, concept)
+        unmet = unmastered @ self.prerequisites.T.astype(np.float32)
+        return unmet == 0
+
+    def columns_to_dag_order(
+        self, mastery: np.ndarray, concept_ids: List[Hashable]
+    ) -> np.ndarray:
+        """Reorder a (users, len(concept_ids)) matrix into DAG column order.
+
+        Concepts missing from concept_ids get zero mastery.
+        """
+        source = np.full(len(self), -1, dtype=np.int64)
+        source[[self.index[c] for c in concept_ids]] = np.arange(len(concept_ids))
+        if (source >= 0).all():
+            return mastery[:, source]
+        ordered = np.zeros((len(mastery), len(self)), dtype=mastery.dtype)
+        ordered[:, source >= 0] = mastery[:, source[source >= 0]]
+        return ordered
+
+    def dependents(self, concept_id: Hashable) -> List[Hashable]:
+        """Concepts that list the given concept as a direct prerequisite."""
+        i = self.index.get(concept_id)
+        if i is None:
+            return []
+        return [self.concept_ids[j] for j in np.flatnonzero(self.prerequisites[:, i])]
+
+    def ancestors(self, concept_id: Hashable) -> List[Hashable]:
+        """All direct and indirect prerequisites in topological order."""
+        i = self.index.get(concept_id)
+        if i is None:
+            return []
+        return [self.concept_ids[j] for j in np.flatnonzero(self.closure[i])]
+
+    def shortest_prerequisite_chain(
+        self, target: Hashable, source: Optional[Hashable] = None
+    ) -> List[Hashable]:
+        """Shortest chain of prerequisites ending at the target concept.
+
+        Args:
+            target (Hashable): Target concept ID
+            source (Optional[Hashable]): Starting concept ID. If omitted, the
+                chain starts from the nearest concept with no prerequisites.
+
+        Returns:
+            List[Hashable]: Concept IDs from start to target (empty if none)
+        """
+        key = (target, source)
+        if key not in self._chain_cache:
+            self._chain_cache[key] = self._find_chain(target, source)
+        return self._chain_cache[key]
+
+    def _find_chain(self, target: Hashable, source: Optional[Hashable]) -> List:
+        if target not in self.index or (
+            source is not None and source not in self.index
+        ):
+            return []
+        target_idx = self.index[target]
+        if source is not None:
+            source_idx = self.index[source]
+            if source_idx != target_idx and not self.closure[target_idx, source_idx]:
+                return []
+
+        # Breadth-first search backwards along prerequisite edges
+        previous = {target_idx: None}
+        queue = deque([target_idx])
+        while queue:
+            i = queue.popleft()
+            direct = np.flatnonzero(self.prerequisites[i])
+            if (source is None and not len(direct)) or (
+                source is not None and i == self.index[source]
+            ):
+                chain = []
+                while i is not None:
+                    chain.append(self.concept_ids[i])
+                    i = previous[i]
+                return chain
+            for j in direct:
+                if j not in previous:
+                    previous[j] = i
+                    queue.append(j)
+        return []
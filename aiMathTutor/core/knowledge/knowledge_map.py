@@ -0,0 +1,139 @@
+"""지식 맵 모듈
+
+knowledge_map.json을 프로세스에서 한 번만 읽어 개념 ID/이름/단원별 색인,
+미리 풀어 둔 선수 개념 목록, 사이드바의 도메인 → 단원 → 개념 선택지를
+만들어 두고 모든 사용처(app.py, OpenAI 생성기, 템플릿 생성기)가 공유합니다.
+파일이 바뀌면 백그라운드에서 다시 색인하여 스냅샷을 교체하므로, 사용처는
+지식 맵 객체를 보관하지 말고 요청마다 get_knowledge_map()을 호출합니다.
+"""
+
+import json
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from core.hot_reload import Snapshot, SnapshotWatcher
+
+KNOWLEDGE_MAP_FILE = "data/knowledge_map.json"
+
+
+class KnowledgeMap:
+    def __init__(self, data: Dict):
+        """
+        색인된 지식 맵
+        - 같은 개념 ID가 여러 도메인에 있으면 ID 조회는 처음 나온 개념을 반환
+        Args:
+            data (Dict): knowledge_map.json 내용
+        """
+        self.data = data
+        self.domain_options: List[Tuple[str, str]] = []
+        self.unit_options: Dict[str, List[Tuple[str, str]]] = {}
+        self.concept_options: Dict[Tuple[str, str], List[Tuple[str, str]]] = {}
+        self.concepts: List[Dict] = []
+        self.concepts_by_id: Dict[str, Dict] = {}
+        self.concepts_by_name: Dict[str, Dict] = {}
+        self.concepts_by_unit: Dict[Tuple[str, str], List[Dict]] = {}
+
+        for domain in data.get("domains", []):
+            self.domain_options.append((domain["id"], domain["name"]))
+            units = self.unit_options.setdefault(domain["id"], [])
+            for unit in domain.get("units", []):
+                units.append((unit["id"], unit["name"]))
+                unit_key = (domain["id"], unit["id"])
+                unit_concepts = self.concepts_by_unit.setdefault(unit_key, [])
+                for concept in unit.get("concepts", []):
+                    details = {
+                        "id": concept["id"],
+                        "domain_id": domain["id"],
+                        "domain": domain["name"],
+                        "unit_id": unit["id"],
+                        "unit": unit["name"],
+                        "concept": concept["name"],
+                        "description": concept.get("description", ""),
+                        "prerequisites": concept.get("prerequisites", []),
+                        "difficulty_levels": concept.get("difficulty_levels", []),
+                    }
+                    self.concepts.append(details)
+                    unit_concepts.append(details)
+                    self.concepts_by_id.setdefault(concept["id"], details)
+                    self.concepts_by_name.setdefault(concept["name"], details)
+                self.concept_options[unit_key] = [
+                    (c["id"], c["concept"]) for c in unit_concepts
+                ]
+
+        # 선수 개념은 같은 도메인의 개념을 우선하여 한 번만 풀어 둠
+        by_domain = {(c["domain_id"], c["id"]): c for c in reversed(self.concepts)}
+        self.prerequisites: Dict[Tuple[str, str], List[Dict]] = {}
+        for details in self.concepts:
+            prerequisites = []
+            for prereq_id in details["prerequisites"]:
+                prereq = by_domain.get(
+                    (details["domain_id"], prereq_id),
+                    self.concepts_by_id.get(prereq_id),
+                )
+                if prereq is not None:
+                    prerequisites.append(prereq)
+            self.prerequisites.setdefault(
+                (details["domain_id"], details["id"]), prerequisites
+            )
+
+    @classmethod
+    def load(cls, path: str = KNOWLEDGE_MAP_FILE) -> "KnowledgeMap":
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return cls(json.load(f))
+        except FileNotFoundError:
+            raise FileNotFoundError("knowledge_map.json 파일을 찾을 수 없습니다.")
+
+    def get_concept(self, concept: str) -> Optional[Dict]:
+        """개념 ID 또는 이름으로 개념 상세 정보 조회"""
+        return self.concepts_by_id.get(concept) or self.concepts_by_name.get(concept)
+
+    def get_prerequisites(self, concept: str) -> List[Dict]:
+        """선수 개념들의 상세 정보"""
+        details = self.get_concept(concept)
+        if details is None:
+            return []
+        return self.prerequisites[(details["domain_id"], details["id"])]
+
+    def get_units(self, domain_id: str) -> List[Tuple[str, str]]:
+        """도메인의 (단원 ID, 이름) 목록"""
+        return self.unit_options.get(domain_id, [])
+
+    def get_concepts(self, domain_id: str, unit_id: str) -> List[Tuple[str, str]]:
+        """단원의 (개념 ID, 이름) 목록"""
+        return self.concept_options.get((domain_id, unit_id), [])
+
+
+_watchers: Dict[str, SnapshotWatcher] = {}
+_watchers_lock = threading.Lock()
+
+
+def _get_watcher(path: str) -> SnapshotWatcher:
+    watcher = _watchers.get(path)
+    if watcher is None:
+        with _watchers_lock:
+            watcher = _watchers.get(path)
+            if watcher is None:
+                watcher = SnapshotWatcher(
+                    [path], lambda previous: KnowledgeMap.load(path), "knowledge-map"
+                )
+                watcher.snapshot  # 첫 로드 실패는 호출한 쪽에 그대로 전달
+                _watchers[path] = watcher.start()
+    return watcher
+
+
+def get_knowledge_map(path: str = KNOWLEDGE_MAP_FILE) -> KnowledgeMap:
+    """
+    프로세스 전역 지식 맵 반환 (경로별로 처음 호출할 때 읽고, 이후 파일이
+    바뀌면 백그라운드에서 다시 읽어 교체)
+    Args:
+        path (str): knowledge_map.json 경로
+    Returns:
+        KnowledgeMap: 현재 스냅샷의 지식 맵
+    """
+    return _get_watcher(path).current()
+
+
+def get_knowledge_map_snapshot(path: str = KNOWLEDGE_MAP_FILE) -> Snapshot:
+    """현재 지식 맵 스냅샷 (버전, 생성 시간 확인용)"""
+    return _get_watcher(path).snapshot
@@ -7,6 +7,12 @@ import json
 import os
 from typing import Dict, List, Optional
 import networkx as nx
+import numpy as np
+
+from .concept_dag import DEFAULT_MASTERY_THRESHOLD, ConceptDAG
+
+DIFFICULTY_LEVELS = ("easy", "medium", "hard")
+DIFFICULTY_BOUNDARIES = (0.3, 0.7)  # Mastery levels where difficulty steps up
 
 
 class LearningPathManager:
@@ -17,8 +23,10 @@ class LearningPathManager:
             data_dir (str): Directory containing knowledge_map.json
         """
         self.knowledge_map_file = os.path.join(data_dir, "knowledge_map.json")
-        self.knowledge_map = self._load_knowledge_map()
+        self.knowledge_map = self._normalize(self._load_knowledge_map())
         self.concept_graph = self._build_concept_graph()
+        # Compiled once; readiness checks are vectorized against it
+        self.dag = ConceptDAG.from_graph(self.concept_graph)
 
     def _load_knowledge_map(self) -> dict:
         """Load the knowledge map from JSON file."""
@@ -30,6 +38,34 @@ class LearningPathManager:
                 "knowledge_map.json not found. Please ensure it exists in the data directory."
             )
 
+    @staticmethod
+    def _normalize(knowledge_map: dict) -> dict:
+        """Index concepts and learning paths by ID.
+
+        knowledge_map.json stores both as lists ("concept_ids" for path
+        sequences); the rest of this class works with dicts keyed by ID.
+        """
+        concepts = knowledge_map.get("concepts", {})
+        if isinstance(concepts, list):
+            concepts = {
+                concept["id"]: {
+                    "mastery_threshold": DEFAULT_MASTERY_THRESHOLD,
+                    **concept,
+                }
+                for concept in concepts
+            }
+        paths = knowledge_map.get("learning_paths", {})
+        if isinstance(paths, list):
+            paths = {
+                path["id"]: {
+                    "description": "",
+                    "sequence": path.get("concept_ids", []),
+                    **path,
+                }
+                for path in paths
+            }
+        return {**knowledge_map, "concepts": concepts, "learning_paths": paths}
+
     def _build_concept_graph(self) -> nx.DiGraph:
         """Build a directed graph of concept relationships."""
         graph = nx.DiGraph()
@@ -68,7 +104,10 @@ class LearningPathManager:
         if current_concept not in self.knowledge_map["concepts"]:
             return []
 
-        return self.knowledge_map["concepts"][current_concept]["next_concepts"]
+        concept_data = self.knowledge_map["concepts"][current_concept]
+        if "next_concepts" in concept_data:
+            return concept_data["next_concepts"]
+        return self.dag.dependents(current_concept)
 
     def get_prerequisites(self, concept: str) -> List[str]:
         """Get prerequisites for a concept.
@@ -97,20 +136,35 @@ class LearningPathManager:
         if concept not in self.knowledge_map["concepts"]:
             return False
 
-        # Check prerequisites
-        prerequisites = self.get_prerequisites(concept)
-        for prereq in prerequisites:
-            # Get required mastery threshold
-            required_mastery = self.knowledge_map["concepts"][prereq][
-                "mastery_threshold"
-            ]
+        ready = self.dag.readiness(self.dag.mastery_vector(user_progress))
+        return bool(ready[self.dag.index[concept]])
 
-            # Check user's mastery level
-            user_mastery = user_progress.get(prereq, 0)
-            if user_mastery < required_mastery:
-                return False
+    def get_ready_concepts(self, user_progress: dict) -> List[str]:
+        """Get every concept whose prerequisites the user has mastered.
 
-        return True
+        Args:
+            user_progress (dict): User's progress data containing mastery levels
+
+        Returns:
+            List[str]: Ready concept IDs in topological order
+        """
+        ready = self.dag.readiness(self.dag.mastery_vector(user_progress))
+        return [self.dag.concept_ids[i] for i in np.flatnonzero(ready)]
+
+    def get_prerequisite_chain(
+        self, target_concept: str, start_concept: Optional[str] = None
+    ) -> List[str]:
+        """Get the shortest chain of prerequisites leading to a concept.
+
+        Args:
+            target_concept (str): Concept ID to reach
+            start_concept (Optional[str]): Concept ID to start from. Defaults to
+                the nearest concept without prerequisites.
+
+        Returns:
+            List[str]: Concept IDs from the start to the target (empty if unreachable)
+        """
+        return self.dag.shortest_prerequisite_chain(target_concept, start_concept)
 
     def get_recommended_difficulty(self, concept: str, user_progress: dict) -> str:
         """Get recommended difficulty level for a concept based on user's progress.
@@ -126,13 +180,52 @@ class LearningPathManager:
             return "easy"
 
         mastery_level = user_progress.get(concept, 0)
+        return DIFFICULTY_LEVELS[
+            sum(mastery_level >= bound for bound in DIFFICULTY_BOUNDARIES)
+        ]
 
-        if mastery_level < 0.3:
-            return "easy"
-        elif mastery_level < 0.7:
-            return "medium"
-        else:
-            return "hard"
+    def get_batch_recommendations(
+        self, mastery: np.ndarray, concept_ids: Optional[List[str]] = None
+    ) -> dict:
+        """Get readiness, difficulty and next concept for many users in one pass.
+
+        Args:
+            mastery (np.ndarray): (users, concepts) mastery matrix
+            concept_ids (Optional[List[str]]): Concept ID of each column.
+                Defaults to the DAG's topological order (self.dag.concept_ids).
+
+        Returns:
+            dict: "concept_ids" (column order of the results),
+                "ready" (users, concepts) bool matrix,
+                "difficulty" (users, concepts) uint8 index into DIFFICULTY_LEVELS,
+                "next_concept" list with each user's first ready, unmastered
+                concept in topological order (None if there is none)
+        """
+        # Same dtype as mastery_vector/thresholds (float64) so a mastery exactly at
+        # a threshold compares the same way as in check_concept_readiness.
+        mastery = np.asarray(mastery, dtype=np.float64)
+        if concept_ids is not None and list(concept_ids) != self.dag.concept_ids:
+            mastery = self.dag.columns_to_dag_order(mastery, concept_ids)
+
+        ready = self.dag.batch_readiness(mastery)
+        difficulty = np.zeros(mastery.shape, dtype=np.uint8)
+        for bound in DIFFICULTY_BOUNDARIES:
+            difficulty += mastery >= bound
+
+        candidates = ready & (mastery < self.dag.thresholds)
+        first = candidates.argmax(axis=1)
+        has_next = candidates[np.arange(len(candidates)), first]
+        next_concept = [
+            self.dag.concept_ids[i] if found else None
+            for i, found in zip(first.tolist(), has_next.tolist())
+        ]
+
+        return {
+            "concept_ids": self.dag.concept_ids,
+            "ready": ready,
+            "difficulty": difficulty,
+            "next_concept": next_concept,
+        }
 
     def get_learning_path_progress(self, path_id: str, user_progress: dict) -> dict:
         """Get user's progress in a specific learning path.
@@ -154,11 +247,11 @@ class LearningPathManager:
         next_concepts = []
         current_concept = None
 
-        for concept in sequence:
-            mastery = user_progress.get(concept, 0)
-            threshold = self.knowledge_map["concepts"][concept]["mastery_threshold"]
+        mastery = self.dag.mastery_vector(user_progress)
+        mastered = mastery >= self.dag.thresholds
 
-            if mastery >= threshold:
+        for concept in sequence:
+            if mastered[self.dag.index[concept]]:
                 completed_concepts.append(concept)
             elif current_concept is None:
                 current_concept = concept
@@ -1,25 +1,141 @@
 """OpenAI API 클라이언트 클래스
 
 이 모듈은 OpenAI API를 호출하여 문제를 생성합니다.
+같은 요청의 응답은 디스크 응답 캐시에서 재사용합니다.
 """
 
-import os
-from typing import Optional
+import asyncio
+import json
+import logging
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple, TypeVar
 import openai
 from openai import AsyncOpenAI
+from .client_factory import get_api_key, get_async_openai_client
+from .rate_limiter import estimate_tokens, get_rate_limiter, usage_tokens
+from .response_cache import ResponseCache, get_response_cache, make_cache_key
+
+logger = logging.getLogger(__name__)
+
+PROBLEM_VARIANTS = 5  # 같은 문제 요청에 번갈아 제공할 응답 수
+HINT_VARIANTS = 3
+QUIZ_CONCURRENCY = 8  # 퀴즈 생성 시 동시에 진행할 최대 API 호출 수
+MAX_ATTEMPTS_RATIO = 2  # 검증 실패 문항을 다시 요청할 때 전체 요청 수 한도 (배수)
+
+T = TypeVar("T")
 
 
 class OpenAIClient:
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self, api_key: Optional[str] = None, cache: Optional[ResponseCache] = None
+    ):
+        """
+        Args:
+            api_key (Optional[str]): OpenAI API 키. 없으면 환경 변수의 키로 만든
+                공유 클라이언트(연결 풀)를 사용합니다.
+            cache (Optional[ResponseCache]): 응답 캐시. 없으면 공유 캐시를 사용합니다.
+        """
+        self.api_key = api_key or get_api_key()
+        # 키를 직접 지정한 경우에만 전용 클라이언트를 만듦
+        self._client = AsyncOpenAI(api_key=api_key) if api_key else None
+        self.cache = cache or get_response_cache()
+        self.limiter = get_rate_limiter()
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        """현재 이벤트 루프의 공유 비동기 클라이언트"""
+        return self._client or get_async_openai_client()
+
+    async def _complete(
+        self,
+        variants: int = 1,
+        validate: Optional[Callable[[str], object]] = None,
+        **request,
+    ) -> str:
+        """
+        chat.completions 호출 (같은 요청이면 캐시된 응답 본문을 반환)
+        Args:
+            variants (int): 키마다 유지할 응답 수
+            validate (Optional[Callable]): 응답 검증 함수 (예외가 나면 캐시하지 않음)
+            **request: model, messages와 샘플링 파라미터
+        Returns:
+            str: 응답 본문
         """
+
+        async def create() -> str:
+            # 요청 제한기를 거쳐 보내고 429/5xx는 백오프 후 재시도
+            raw = await self.limiter.call(
+                lambda: self.client.chat.completions.with_raw_response.create(
+                    **request
+                ),
+                estimate_tokens(request),
+                headers_of=lambda raw: raw.headers,
+                usage_of=usage_tokens,
+            )
+            content = raw.parse().choices[0].message.content
+            if validate is not None:
+                validate(content)
+            return content
+
+        return await self.cache.aget_or_create(
+            make_cache_key(**request), create, variants
+        )
+
+    async def fan_out(
+        self,
+        make_request: Callable[[int], Dict],
+        count: int,
+        parse: Callable[[int, str], T],
+        concurrency: int = QUIZ_CONCURRENCY,
+        variants: int = PROBLEM_VARIANTS,
+    ) -> AsyncIterator[Tuple[int, T]]:
+        """여러 요청을 동시에 보내고 검증된 결과를 완성되는 순서대로 반환합니다.
+
         Args:
-            api_key (Optional[str]): OpenAI API 키. 없으면 환경 변수에서 가져옵니다.
+            make_request (Callable[[int], Dict]): 번호별 chat.completions 요청 생성
+            count (int): 필요한 결과 수
+            parse (Callable[[int, str], T]): 번호와 응답 본문을 검증/변환하는 함수
+                (예외가 나면 그 결과는 버리고 새 번호로 다시 요청)
+            concurrency (int): 동시에 진행할 최대 API 호출 수
+            variants (int): 키마다 유지할 캐시 응답 수
+
+        Yields:
+            Tuple[int, T]: (요청 번호, 변환된 결과)
         """
-        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
-        if not self.api_key:
-            raise ValueError("OpenAI API 키가 필요합니다.")
+        semaphore = asyncio.Semaphore(concurrency)
 
-        self.client = AsyncOpenAI(api_key=self.api_key)
+        async def run(index: int) -> T:
+            request = make_request(index)
+            parsed: List[T] = []  # 새로 받은 응답은 검증할 때 만든 결과를 재사용
+            async with semaphore:
+                content = await self._complete(
+                    variants=variants,
+                    validate=lambda content: parsed.append(parse(index, content)),
+                    **request,
+                )
+            # 캐시 적중이면 검증 함수가 호출되지 않았으므로 여기서 한 번만 변환
+            return parsed[0] if parsed else parse(index, content)
+
+        max_attempts = count * MAX_ATTEMPTS_RATIO
+        tasks = {asyncio.ensure_future(run(i)): i for i in range(count)}
+        next_index = count
+        try:
+            while tasks:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    index = tasks.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        logger.warning(f"{index}번 요청 실패: {str(e)}")
+                        if next_index < max_attempts:
+                            tasks[asyncio.ensure_future(run(next_index))] = next_index
+                            next_index += 1
+                        continue
+                    yield index, result
+        finally:
+            # 소비자가 중간에 멈추면 남은 요청 취소
+            for task in tasks:
+                task.cancel()
 
     async def generate_problem(self, prompt: str) -> str:
         """OpenAI API를 사용하여 문제를 생성합니다.
@@ -34,7 +150,8 @@ class OpenAIClient:
             Exception: API 호출 중 오류 발생 시
         """
         try:
-            response = await self.client.chat.completions.create(
+            return await self._complete(
+                variants=PROBLEM_VARIANTS,
                 model="gpt-3.5-turbo",  # 또는 다른 적절한 모델
                 messages=[
                     {
@@ -50,8 +167,6 @@ class OpenAIClient:
                 response_format={"type": "json_object"},
             )
 
-            return response.choices[0].message.content
-
         except Exception as e:
             raise Exception(f"OpenAI API 호출 중 오류 발생: {str(e)}")
 
@@ -80,7 +195,7 @@ class OpenAIClient:
     "explanation": "답안이 정확하거나 틀린 이유에 대한 설명"
 }}"""
 
-            response = await self.client.chat.completions.create(
+            result = await self._complete(
                 model="gpt-3.5-turbo",  # 또는 다른 적절한 모델
                 messages=[
                     {
@@ -95,8 +210,7 @@ class OpenAIClient:
                 response_format={"type": "json_object"},
             )
 
-            result = response.choices[0].message.content
-            return result["is_correct"]
+            return json.loads(result)["is_correct"]
 
         except Exception as e:
             raise Exception(f"OpenAI API 호출 중 오류 발생: {str(e)}")
@@ -126,7 +240,8 @@ class OpenAIClient:
 이전 힌트와 중복되지 않고, 문제 해결에 도움이 되는 새로운 힌트를 생성해주세요.
 힌트는 직접적인 답을 알려주지 않고, 문제 해결 방향을 제시해야 합니다."""
 
-            response = await self.client.chat.completions.create(
+            hint = await self._complete(
+                variants=HINT_VARIANTS,
                 model="gpt-3.5-turbo",  # 또는 다른 적절한 모델
                 messages=[
                     {
@@ -140,7 +255,7 @@ class OpenAIClient:
                 max_tokens=200,
             )
 
-            return response.choices[0].message.content.strip()
+            return hint.strip()
 
         except Exception as e:
             raise Exception(f"OpenAI API 호출 중 오류 발생: {str(e)}")
@@ -0,0 +1,167 @@
+"""OpenAI 클라이언트 팩토리 모듈
+
+프로세스 전체에서 OpenAI 클라이언트를 하나만 만들어 공유합니다.
+HTTP keep-alive 연결과 TLS 세션을 요청 사이에 재사용하도록 연결 풀을
+조정한 httpx 클라이언트를 사용하고, 새로 연결한 횟수와 재사용한 횟수를
+기록합니다. 동기 클라이언트는 프로세스에 하나, 비동기 클라이언트는 연결이
+이벤트 루프에 묶이므로 이벤트 루프마다 하나씩 만듭니다.
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+from typing import Dict, Optional
+
+import httpx
+from dotenv import load_dotenv
+from openai import AsyncOpenAI, OpenAI
+
+MAX_CONNECTIONS = 32  # 퀴즈 동시 생성(QUIZ_CONCURRENCY)보다 넉넉하게
+MAX_KEEPALIVE_CONNECTIONS = 16
+KEEPALIVE_EXPIRY = 60.0  # 유휴 연결 유지 시간 (초)
+CONNECT_TIMEOUT = 10.0
+READ_TIMEOUT = 120.0  # GPT-4 응답 생성 대기 시간 포함
+MAX_RETRIES = 0  # 재시도는 rate_limiter가 헤더를 반영하여 직접 처리
+
+
+class ConnectionStats:
+    def __init__(self):
+        """요청 수와 새 TCP/TLS 연결 수 (나머지 요청은 기존 연결을 재사용)"""
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+        self.tls_handshakes = 0
+
+    def trace(self, event_name: str, info: Dict) -> None:
+        """httpcore trace 확장 콜백 (동기)"""
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self.connections += 1
+        elif event_name == "connection.start_tls.complete":
+            with self._lock:
+                self.tls_handshakes += 1
+
+    async def atrace(self, event_name: str, info: Dict) -> None:
+        """httpcore trace 확장 콜백 (비동기)"""
+        self.trace(event_name, info)
+
+    def count_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            reused = max(self.requests - self.connections, 0)
+            return {
+                "requests": self.requests,
+                "connections": self.connections,
+                "tls_handshakes": self.tls_handshakes,
+                "reused": reused,
+                "reuse_ratio": reused / self.requests if self.requests else 0.0,
+            }
+
+
+connection_stats = ConnectionStats()
+
+
+class _TracingTransport(httpx.HTTPTransport):
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        connection_stats.count_request()
+        request.extensions["trace"] = connection_stats.trace
+        return super().handle_request(request)
+
+
+class _AsyncTracingTransport(httpx.AsyncHTTPTransport):
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        connection_stats.count_request()
+        request.extensions["trace"] = connection_stats.atrace
+        return await super().handle_async_request(request)
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    )
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT)
+
+
+def get_api_key() -> str:
+    """
+    OpenAI API 키 (.env는 프로세스에서 한 번만 읽음)
+    Raises:
+        ValueError: API 키가 설정되지 않은 경우
+    """
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        load_dotenv()
+        _dotenv_loaded = True
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError(
+            "OpenAI API 키가 설정되지 않았습니다. "
+            ".env 파일에 OPENAI_API_KEY를 설정하거나 "
+            "환경 변수로 지정해주세요."
+        )
+    return api_key
+
+
+_dotenv_loaded = False
+_sync_client: Optional[OpenAI] = None
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = (
+    weakref.WeakKeyDictionary()
+)
+_clients_lock = threading.Lock()
+
+
+def get_openai_client() -> OpenAI:
+    """프로세스 전역 동기 OpenAI 클라이언트 반환"""
+    global _sync_client
+    if _sync_client is None:
+        with _clients_lock:
+            if _sync_client is None:
+                _sync_client = OpenAI(
+                    api_key=get_api_key(),
+                    max_retries=MAX_RETRIES,
+                    http_client=httpx.Client(
+                        transport=_TracingTransport(limits=_limits()),
+                        timeout=_timeout(),
+                    ),
+                )
+    return _sync_client
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """
+    현재 이벤트 루프의 비동기 OpenAI 클라이언트 반환
+    - 루프 밖에서 호출하면 현재 스레드의 기본 루프를 사용
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = asyncio.get_event_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        with _clients_lock:
+            client = _async_clients.get(loop)
+            if client is None:
+                client = AsyncOpenAI(
+                    api_key=get_api_key(),
+                    max_retries=MAX_RETRIES,
+                    http_client=httpx.AsyncClient(
+                        transport=_AsyncTracingTransport(limits=_limits()),
+                        timeout=_timeout(),
+                    ),
+                )
+                _async_clients[loop] = client
+    return client
+
+
+def get_connection_stats() -> Dict:
+    """OpenAI 요청 수, 새 연결 수, 연결 재사용 비율"""
+    return connection_stats.snapshot()
@@ -4,10 +4,20 @@ knowledge_map.json의 개념 구조를 활용하여 맞춤형 문제를 생성
 """
 
 import json
+import logging
 import os
-from typing import Dict, List, Optional
-from openai import OpenAI
-from dotenv import load_dotenv
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from core.knowledge.concept_aliases import get_concept_aliases
+from core.knowledge.knowledge_map import get_knowledge_map
+from .api_client import PROBLEM_VARIANTS, QUIZ_CONCURRENCY, OpenAIClient
+from .client_factory import get_openai_client
+from .rate_limiter import estimate_tokens, get_rate_limiter, usage_tokens
+from .response_cache import get_response_cache, make_cache_key
+from .stream_parser import IncrementalJSONParser
+
+logger = logging.getLogger(__name__)
 
 
 class OpenAIProblemGenerator:
@@ -17,68 +27,50 @@ class OpenAIProblemGenerator:
         Args:
             data_dir (str): 데이터 디렉토리 경로
         """
-        # 환경 변수 로드
-        load_dotenv()
-
-        # API 키 확인
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError(
-                "OpenAI API 키가 설정되지 않았습니다. "
-                ".env 파일에 OPENAI_API_KEY를 설정하거나 "
-                "환경 변수로 지정해주세요."
-            )
-
         self.knowledge_map_file = os.path.join(data_dir, "knowledge_map.json")
-        self.knowledge_map = self._load_knowledge_map()
-        self.client = OpenAI(api_key=api_key)  # API 키로 클라이언트 초기화
+        get_knowledge_map(self.knowledge_map_file)  # 경로 확인 겸 첫 로드
+        # 프로세스에서 공유하는 클라이언트 (연결 풀과 TLS 세션 재사용)
+        self.client = get_openai_client()
+        self.async_client = OpenAIClient()  # 퀴즈 동시 생성용
+        self.cache = get_response_cache()
+        self._metrics_lock = threading.Lock()
+        self.stream_metrics = {
+            "streams": 0,
+            "cache_hits": 0,
+            "time_to_question": 0.0,  # 누적 (초)
+            "time_to_problem": 0.0,
+        }
 
-    def _load_knowledge_map(self) -> dict:
-        """지식 맵을 로드합니다."""
-        try:
-            with open(self.knowledge_map_file, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except FileNotFoundError:
-            raise FileNotFoundError("knowledge_map.json 파일을 찾을 수 없습니다.")
+    @property
+    def knowledge_map(self):
+        """프로세스에서 공유하는 현재 지식 맵 스냅샷"""
+        return get_knowledge_map(self.knowledge_map_file)
 
     def _get_concept_details(self, concept_id: str) -> Optional[Dict]:
-        """개념 ID에 해당하는 상세 정보를 조회합니다."""
-        for domain in self.knowledge_map["domains"]:
-            for unit in domain["units"]:
-                for concept in unit["concepts"]:
-                    if concept["id"] == concept_id:
-                        return {
-                            "domain": domain["name"],
-                            "unit": unit["name"],
-                            "concept": concept["name"],
-                            "description": concept["description"],
-                            "prerequisites": concept["prerequisites"],
-                            "difficulty_levels": concept["difficulty_levels"],
-                        }
-        return None
+        """개념 ID(또는 한국어/영어 개념 이름)에 해당하는 상세 정보를 조회합니다."""
+        details = self.knowledge_map.get_concept(concept_id)
+        if details is None:
+            record = get_concept_aliases().resolve(concept_id)
+            if record is not None:
+                details = self.knowledge_map.get_concept(record["id"])
+        return details
 
     def _get_prerequisite_concepts(self, concept_id: str) -> List[Dict]:
         """선수 개념들의 정보를 조회합니다."""
-        concept_details = self._get_concept_details(concept_id)
-        if not concept_details:
-            return []
+        return self.knowledge_map.get_prerequisites(concept_id)
 
-        prereq_concepts = []
-        for prereq_id in concept_details["prerequisites"]:
-            prereq_details = self._get_concept_details(prereq_id)
-            if prereq_details:
-                prereq_concepts.append(prereq_details)
-        return prereq_concepts
-
-    def generate_problem(self, concept_id: str, difficulty: str) -> dict:
-        """주어진 개념과 난이도에 맞는 문제를 생성합니다.
+    def _build_request(
+        self, concept_id: str, difficulty: str, quiz_slot: Optional[tuple] = None
+    ) -> Tuple[Dict, Dict]:
+        """개념 정보를 조회하여 chat.completions 요청을 구성합니다.
 
         Args:
             concept_id (str): 개념 ID
             difficulty (str): 난이도 ('상', '중', '하')
+            quiz_slot (Optional[tuple]): 퀴즈 문항 (번호, 전체 문항 수)
 
         Returns:
-            dict: 생성된 문제 정보
+            Tuple[Dict, Dict]: (요청, 개념 정보)
         """
         # 개념 정보 조회
         concept_details = self._get_concept_details(concept_id)
@@ -86,53 +78,236 @@ class OpenAIProblemGenerator:
             raise ValueError(f"개념 ID {concept_id}를 찾을 수 없습니다.")
 
         # 선수 개념 정보 조회
-        prereq_concepts = self._get_prerequisite_concepts(concept_id)
+        prereq_concepts = self._get_prerequisite_concepts(concept_details["concept"])
 
         # 프롬프트 구성
         prompt = self._create_problem_prompt(
             concept_details, difficulty, prereq_concepts
         )
+        if quiz_slot is not None:
+            # 문항마다 프롬프트가 달라 서로 다른 문제가 생성되고 캐시 키도 구분됨
+            prompt += (
+                f"\n\n이 문제는 {quiz_slot[1]}문항 퀴즈의 {quiz_slot[0] + 1}번 문항입니다. "
+                "다른 문항과 겹치지 않는 상황과 수치를 사용해주세요."
+            )
+
+        request = {
+            "model": "gpt-4",
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "당신은 수학 교육 전문가입니다. 학생의 수준과 교육과정에 맞는 최적의 문제를 생성해주세요.",
+                },
+                {"role": "user", "content": prompt},
+            ],
+            "temperature": 0.8,
+        }
+        return request, concept_details
 
-        # OpenAI API 호출
+    def _finish_problem(
+        self, content: str, concept_details: Dict, difficulty: str
+    ) -> dict:
+        """응답을 파싱하고 개념 정보를 덧붙여 문제 데이터로 만듭니다."""
+        problem_data = self._parse_response(content)
+        problem_data.update(
+            {
+                "concept": concept_details["concept"],
+                "difficulty": difficulty,
+                "domain": concept_details["domain"],
+                "unit": concept_details["unit"],
+            }
+        )
+        return problem_data
+
+    def generate_problem(
+        self,
+        concept_id: str,
+        difficulty: str,
+        on_field: Optional[Callable[[str, Any], None]] = None,
+    ) -> dict:
+        """주어진 개념과 난이도에 맞는 문제를 생성합니다.
+
+        Args:
+            concept_id (str): 개념 ID
+            difficulty (str): 난이도 ('상', '중', '하')
+            on_field (Optional[Callable[[str, Any], None]]): 지정하면 스트리밍으로
+                생성하며, 응답의 필드(question, options, explanation 등)가
+                완성될 때마다 (키, 값)으로 호출
+
+        Returns:
+            dict: 생성된 문제 정보
+        """
+        request, concept_details = self._build_request(concept_id, difficulty)
+        start = time.perf_counter()
+        timing = {}
+
+        def create() -> str:
+            if on_field is not None:
+                # 필드 도착 여부와 관계없이 API 스트리밍 여부로 캐시 적중을 판단
+                timing["streamed"] = True
+                return self._stream_content(request, on_field, timing, start)
+            # 요청 제한기를 거쳐 보내고 429/5xx는 백오프 후 재시도
+            raw = get_rate_limiter().call_sync(
+                lambda: self.client.chat.completions.with_raw_response.create(
+                    **request
+                ),
+                estimate_tokens(request),
+                headers_of=lambda raw: raw.headers,
+                usage_of=usage_tokens,
+            )
+            content = raw.parse().choices[0].message.content
+            self._parse_response(content)  # 파싱할 수 없는 응답은 캐시하지 않음
+            return content
+
+        # OpenAI API 호출 (같은 프롬프트는 캐시된 응답 중 하나를 재사용)
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "당신은 수학 교육 전문가입니다. 학생의 수준과 교육과정에 맞는 최적의 문제를 생성해주세요.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.8,
+            content = self.cache.get_or_create(
+                make_cache_key(**request), create, PROBLEM_VARIANTS
             )
 
             # 응답 파싱 및 반환
-            problem_data = self._parse_response(response.choices[0].message.content)
-            problem_data.update(
-                {
-                    "concept": concept_details["concept"],
-                    "difficulty": difficulty,
-                    "domain": concept_details["domain"],
-                    "unit": concept_details["unit"],
-                }
-            )
-            return problem_data
+            problem = self._finish_problem(content, concept_details, difficulty)
 
         except Exception as e:
             raise Exception(f"문제 생성 중 오류 발생: {str(e)}")
 
+        if on_field is not None:
+            cached = not timing.get("streamed", False)
+            if cached:
+                # 캐시 적중: 저장된 응답의 필드를 한 번에 전달
+                self._emit_fields(
+                    IncrementalJSONParser().feed(content), on_field, timing, start
+                )
+            self._record_stream(timing, time.perf_counter() - start, cached)
+        return problem
+
+    def _stream_content(
+        self,
+        request: Dict,
+        on_field: Callable[[str, Any], None],
+        timing: Dict,
+        start: float,
+    ) -> str:
+        """스트리밍으로 응답을 받으며 필드가 완성될 때마다 on_field를 호출합니다."""
+        # 제한기는 응답 헤더가 도착하면 슬롯을 반환 (본문은 이어서 읽음)
+        raw = get_rate_limiter().call_sync(
+            lambda: self.client.chat.completions.with_raw_response.create(
+                stream=True, **request
+            ),
+            estimate_tokens(request),
+            headers_of=lambda raw: raw.headers,
+        )
+        parser = IncrementalJSONParser()
+        for chunk in raw.parse():
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                self._emit_fields(parser.feed(delta), on_field, timing, start)
+        content = parser.text
+        self._parse_response(content)  # 파싱할 수 없는 응답은 캐시하지 않음
+        return content
+
+    def _emit_fields(
+        self,
+        fields: List[Tuple[str, Any]],
+        on_field: Callable[[str, Any], None],
+        timing: Dict,
+        start: float,
+    ) -> None:
+        for key, value in fields:
+            if key == "question" and "time_to_question" not in timing:
+                timing["time_to_question"] = time.perf_counter() - start
+            on_field(key, value)
+
+    def _record_stream(self, timing: Dict, elapsed: float, cached: bool) -> None:
+        time_to_question = timing.get("time_to_question", elapsed)
+        with self._metrics_lock:
+            if cached:
+                self.stream_metrics["cache_hits"] += 1
+            else:
+                # 평균 시간은 실제로 API를 스트리밍한 요청만으로 계산
+                self.stream_metrics["streams"] += 1
+                self.stream_metrics["time_to_question"] += time_to_question
+                self.stream_metrics["time_to_problem"] += elapsed
+        logger.info(
+            f"스트리밍 문제 생성 - 문제 표시 {time_to_question:.2f}초, "
+            f"전체 {elapsed:.2f}초{' (캐시)' if cached else ''}"
+        )
+
+    def stream_stats(self) -> Dict:
+        """API 스트리밍 횟수, 캐시 적중 수, 평균 문제 표시 시간/전체 생성 시간 (초)"""
+        with self._metrics_lock:
+            stats = dict(self.stream_metrics)
+        streams = stats["streams"]
+        stats.update(
+            {
+                "avg_time_to_question": (
+                    stats["time_to_question"] / streams if streams else 0.0
+                ),
+                "avg_time_to_problem": (
+                    stats["time_to_problem"] / streams if streams else 0.0
+                ),
+            }
+        )
+        return stats
+
+    async def generate_quiz(
+        self,
+        concept_id: str,
+        difficulty: str,
+        problem_count: int,
+        concurrency: int = QUIZ_CONCURRENCY,
+    ) -> AsyncIterator[dict]:
+        """퀴즈 문항을 동시에 생성하여 완성되는 순서대로 반환합니다.
+
+        Args:
+            concept_id (str): 개념 ID
+            difficulty (str): 난이도 ('상', '중', '하')
+            problem_count (int): 생성할 문항 수
+            concurrency (int): 동시에 진행할 최대 API 호출 수
+
+        Yields:
+            dict: 검증된 문제 정보 (파싱에 실패한 문항은 새 요청으로 대체)
+        """
+        if not self._get_concept_details(concept_id):
+            raise ValueError(f"개념 ID {concept_id}를 찾을 수 없습니다.")
+        requests = {}
+
+        def make_request(index: int) -> Dict:
+            request, concept_details = self._build_request(
+                concept_id, difficulty, quiz_slot=(index, problem_count)
+            )
+            requests[index] = concept_details
+            return request
+
+        def parse(index: int, content: str) -> dict:
+            return self._finish_problem(content, requests[index], difficulty)
+
+        async for _, problem in self.async_client.fan_out(
+            make_request, problem_count, parse, concurrency
+        ):
+            yield problem
+
     def _create_problem_prompt(
         self, concept_details: Dict, difficulty: str, prereq_concepts: List[Dict]
     ) -> str:
         """문제 생성을 위한 프롬프트를 생성합니다."""
+        aliases = get_concept_aliases().resolve(concept_details["concept"]) or {}
+        english = ", ".join(
+            dict.fromkeys(
+                aliases.get("english", []) + aliases.get("dataset_concepts", [])
+            )
+        )
         prompt = f"""다음 조건에 맞는 수학 문제를 생성해주세요:
 
 1. 학습 개념:
    - 도메인: {concept_details['domain']}
    - 단원: {concept_details['unit']}
-   - 개념: {concept_details['concept']}
+   - 개념: {concept_details['concept']} ({concept_details['id']})
+   - 영어 개념 이름: {english or '없음'}
    - 개념 설명: {concept_details['description']}
+   - 관련 개념 ID: {', '.join(aliases.get('related', [])) or '없음'}
 
 2. 난이도: {difficulty}
 
@@ -183,6 +358,11 @@ class OpenAIProblemGenerator:
             for field in required_fields:
                 if field not in problem_data:
                     raise ValueError(f"응답에서 필수 필드 {field}를 찾을 수 없습니다.")
+            options = problem_data["options"]
+            if not isinstance(options, list) or not options:
+                raise ValueError("보기 목록이 비어 있습니다.")
+            if problem_data["correct_answer"] not in range(1, len(options) + 1):
+                raise ValueError("정답 번호가 보기 범위를 벗어났습니다.")
 
             return problem_data
 
@@ -190,3 +370,23 @@ class OpenAIProblemGenerator:
             raise ValueError("API 응답을 JSON으로 파싱할 수 없습니다.")
         except Exception as e:
             raise Exception(f"응답 파싱 중 오류 발생: {str(e)}")
+
+
+_shared_generator: Optional[OpenAIProblemGenerator] = None
+_shared_generator_lock = threading.Lock()
+
+
+def get_openai_problem_generator() -> OpenAIProblemGenerator:
+    """프로세스 전역 OpenAI 문제 생성기 반환 (요청마다 새로 만들지 않음)"""
+    global _shared_generator
+    if _shared_generator is None:
+        with _shared_generator_lock:
+            if _shared_generator is None:
+                _shared_generator = OpenAIProblemGenerator()
+    return _shared_generator
+
+
+def get_stream_stats() -> Optional[Dict]:
+    """공유 생성기의 스트리밍 생성 통계 (생성기를 아직 만들지 않았으면 None)"""
+    generator = _shared_generator
+    return generator.stream_stats() if generator is not None else None
@@ -0,0 +1,382 @@
+"""적응형 요청 제한 모듈
+
+OpenAI 호출을 보내기 전에 세 가지 한도를 확인합니다.
+- 동시 요청 창 (AIMD): 성공하면 창을 조금씩 넓히고(가산 증가), 429/503을
+  받으면 절반으로 줄입니다(곱셈 감소).
+- 분당 요청 수/토큰 수 토큰 버킷: 응답의 x-ratelimit-limit/remaining-*
+  헤더로 실제 한도와 남은 양을 맞추고, 응답의 usage로 예상 토큰과 실제
+  토큰의 차이를 정산합니다.
+- retry-after 헤더를 받으면 그 시간 동안 새 요청을 멈춥니다.
+재시도할 수 있는 오류(429, 5xx, 연결 오류)는 tenacity로 지터를 준 지수
+백오프 후 다시 보냅니다. 상태는 스레드 잠금으로 보호하므로 여러 Streamlit
+세션의 이벤트 루프와 동기 호출이 같은 제한기를 공유합니다.
+"""
+
+import asyncio
+import logging
+import re
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+import httpx
+from tenacity import (
+    AsyncRetrying,
+    Retrying,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+try:
+    import openai
+
+    _CONNECTION_ERRORS = (httpx.TransportError, openai.APIConnectionError)
+except ImportError:  # 가짜 서버 벤치마크는 openai 없이도 실행
+    _CONNECTION_ERRORS = (httpx.TransportError,)
+
+logger = logging.getLogger(__name__)
+
+REQUESTS_PER_MINUTE = 500  # 헤더로 실제 한도를 받기 전의 기본값
+TOKENS_PER_MINUTE = 40000
+INITIAL_CONCURRENCY = 4
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = 32
+DECREASE_FACTOR = 0.5
+MAX_ATTEMPTS = 6
+BACKOFF_MAX = 30.0  # 초
+POLL_INTERVAL = 0.05  # 동시 요청 창이 가득 찼을 때 다시 확인하는 간격 (초)
+DEFAULT_COMPLETION_TOKENS = 1000  # max_tokens가 없는 요청의 응답 토큰 추정치
+CHARS_PER_TOKEN = 2  # 한국어 위주 프롬프트의 대략적인 글자/토큰 비율
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+THROTTLE_STATUS = {429, 503}
+
+T = TypeVar("T")
+
+_DURATION_PART = re.compile(r"([\d.]+)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """'1s', '6m0s', '20ms', '0.5' 형식의 시간을 초로 변환"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def retry_after(headers) -> Optional[float]:
+    """retry-after-ms / retry-after 헤더의 대기 시간 (초)"""
+    if not headers:
+        return None
+    milliseconds = headers.get("retry-after-ms")
+    if milliseconds:
+        try:
+            return float(milliseconds) / 1000
+        except ValueError:
+            pass
+    return parse_duration(headers.get("retry-after"))
+
+
+def estimate_tokens(request: Dict) -> int:
+    """chat.completions 요청의 프롬프트 + 응답 토큰 추정치"""
+    prompt_chars = sum(
+        len(str(message.get("content", ""))) for message in request.get("messages", [])
+    )
+    return prompt_chars // CHARS_PER_TOKEN + request.get(
+        "max_tokens", DEFAULT_COMPLETION_TOKENS
+    )
+
+
+def usage_tokens(raw_response) -> Optional[float]:
+    """with_raw_response 응답의 실제 사용 토큰 수 (알 수 없으면 None)"""
+    try:
+        return raw_response.parse().usage.total_tokens
+    except AttributeError:
+        return None
+
+
+def status_code(error: BaseException) -> Optional[int]:
+    status = getattr(error, "status_code", None)
+    if status is None and isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+    return status
+
+
+def error_headers(error: BaseException):
+    response = getattr(error, "response", None)
+    return getattr(response, "headers", None)
+
+
+def is_retryable(error: BaseException) -> bool:
+    return status_code(error) in RETRYABLE_STATUS or isinstance(
+        error, _CONNECTION_ERRORS
+    )
+
+
+class TokenBucket:
+    def __init__(self, per_minute: float):
+        """
+        분당 한도의 토큰 버킷 (한 번에 최대 1분 치까지 모임)
+        Args:
+            per_minute (float): 분당 한도
+        """
+        self.per_minute = per_minute
+        self.available = per_minute
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self.available = min(
+            self.per_minute, self.available + elapsed * self.per_minute / 60
+        )
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """amount만큼 쓸 수 있을 때까지 기다릴 시간 (초)"""
+        self._refill(now)
+        # 한도보다 큰 요청은 버킷이 가득 찼을 때 보냄
+        amount = min(amount, self.per_minute)
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) * 60 / self.per_minute
+
+    def take(self, amount: float) -> None:
+        self.available -= amount
+
+    def sync(self, limit: Optional[float], remaining: Optional[float]) -> None:
+        """서버가 알려 준 한도/남은 양으로 맞춤 (서버 쪽이 더 적으면 따름)"""
+        if limit:
+            self.per_minute = limit
+        if remaining is not None:
+            self.available = min(self.available, remaining)
+
+
+class AdaptiveLimiter:
+    def __init__(
+        self,
+        requests_per_minute: float = REQUESTS_PER_MINUTE,
+        tokens_per_minute: float = TOKENS_PER_MINUTE,
+        initial_concurrency: float = INITIAL_CONCURRENCY,
+        min_concurrency: float = MIN_CONCURRENCY,
+        max_concurrency: float = MAX_CONCURRENCY,
+        decrease_factor: float = DECREASE_FACTOR,
+    ):
+        """
+        적응형 요청 제한기
+        Args:
+            requests_per_minute (float): 분당 요청 수 한도 (헤더로 갱신)
+            tokens_per_minute (float): 분당 토큰 수 한도 (헤더로 갱신)
+            initial_concurrency (float): 시작 동시 요청 창 크기
+            min_concurrency (float): 최소 창 크기
+            max_concurrency (float): 최대 창 크기
+            decrease_factor (float): 제한 응답을 받았을 때 창에 곱할 값
+        """
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.window = float(initial_concurrency)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.decrease_factor = decrease_factor
+        self.in_flight = 0
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+        self.metrics = {
+            "requests": 0,
+            "throttled": 0,
+            "retries": 0,
+            "errors": 0,
+            "wait_seconds": 0.0,
+        }
+
+    def _try_acquire(self, tokens: float) -> float:
+        """슬롯을 얻으면 0, 아니면 다시 시도할 때까지 기다릴 시간"""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+            if self.in_flight >= int(self.window):
+                return POLL_INTERVAL
+            wait = max(
+                self.requests.wait_time(1, now), self.tokens.wait_time(tokens, now)
+            )
+            if wait > 0:
+                return wait
+            self.requests.take(1)
+            self.tokens.take(tokens)
+            self.in_flight += 1
+            self.metrics["requests"] += 1
+            return 0.0
+
+    async def acquire(self, tokens: float) -> None:
+        """보낼 수 있을 때까지 비동기로 대기한 뒤 슬롯 확보"""
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait <= 0:
+                return
+            self._add_wait(wait)
+            await asyncio.sleep(wait)
+
+    def acquire_sync(self, tokens: float) -> None:
+        """acquire의 동기 버전"""
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait <= 0:
+                return
+            self._add_wait(wait)
+            time.sleep(wait)
+
+    def _add_wait(self, wait: float) -> None:
+        with self._lock:
+            self.metrics["wait_seconds"] += wait
+
+    def on_success(
+        self, headers=None, estimated_tokens: float = 0, used_tokens: float = None
+    ) -> None:
+        """성공 응답: 슬롯 반환, 창 가산 증가, 헤더/사용량으로 버킷 보정"""
+        with self._lock:
+            self.in_flight -= 1
+            # 창 하나 분량의 요청이 성공할 때마다 1 증가
+            self.window = min(self.max_concurrency, self.window + 1 / self.window)
+            if used_tokens is not None:
+                self.tokens.take(used_tokens - estimated_tokens)
+            self._sync_headers(headers)
+
+    def on_failure(self, error: BaseException, estimated_tokens: float = 0) -> None:
+        """실패 응답: 슬롯 반환, 제한 응답이면 창을 줄이고 retry-after 동안 멈춤"""
+        status = status_code(error)
+        headers = error_headers(error)
+        with self._lock:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if status in THROTTLE_STATUS:
+                self.metrics["throttled"] += 1
+                # 같은 순간에 몰려온 제한 응답에는 한 번만 줄임
+                if now - self._last_decrease > 1.0:
+                    self.window = max(
+                        self.min_concurrency, self.window * self.decrease_factor
+                    )
+                    self._last_decrease = now
+                delay = retry_after(headers)
+                if delay:
+                    self._paused_until = max(self._paused_until, now + delay)
+            else:
+                self.metrics["errors"] += 1
+                # 보내지 못한 요청의 토큰은 돌려줌
+                self.tokens.take(-estimated_tokens)
+            self._sync_headers(headers)
+
+    def _sync_headers(self, headers) -> None:
+        if not headers:
+            return
+
+        def number(name: str) -> Optional[float]:
+            try:
+                return float(headers.get(name))
+            except (TypeError, ValueError):
+                return None
+
+        for kind, bucket in (("requests", self.requests), ("tokens", self.tokens)):
+            bucket.sync(
+                number(f"x-ratelimit-limit-{kind}"),
+                number(f"x-ratelimit-remaining-{kind}"),
+            )
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self.metrics)
+            stats.update(
+                {
+                    "window": self.window,
+                    "in_flight": self.in_flight,
+                    "requests_per_minute": self.requests.per_minute,
+                    "tokens_per_minute": self.tokens.per_minute,
+                }
+            )
+        return stats
+
+    def _retrying_kwargs(self) -> Dict:
+        def count_retry(retry_state) -> None:
+            with self._lock:
+                self.metrics["retries"] += 1
+
+        return {
+            "retry": retry_if_exception(is_retryable),
+            "wait": wait_random_exponential(multiplier=0.5, max=BACKOFF_MAX),
+            "stop": stop_after_attempt(MAX_ATTEMPTS),
+            "before_sleep": count_retry,
+            "reraise": True,
+        }
+
+    async def call(
+        self,
+        send: Callable[[], Awaitable[T]],
+        estimated_tokens: float,
+        headers_of: Callable[[T], object] = lambda response: None,
+        usage_of: Callable[[T], Optional[float]] = lambda response: None,
+    ) -> T:
+        """
+        제한을 지키며 요청을 보내고, 재시도할 수 있는 오류는 백오프 후 다시 보냄
+        Args:
+            send (Callable[[], Awaitable[T]]): 요청을 한 번 보내는 코루틴 함수
+            estimated_tokens (float): 요청의 예상 토큰 수
+            headers_of (Callable): 응답에서 헤더를 꺼내는 함수
+            usage_of (Callable): 응답에서 실제 사용 토큰 수를 꺼내는 함수
+        Returns:
+            T: 응답
+        """
+        async for attempt in AsyncRetrying(**self._retrying_kwargs()):
+            with attempt:
+                await self.acquire(estimated_tokens)
+                try:
+                    response = await send()
+                except BaseException as e:
+                    self.on_failure(e, estimated_tokens)
+                    raise
+                self.on_success(
+                    headers_of(response), estimated_tokens, usage_of(response)
+                )
+        return response
+
+    def call_sync(
+        self,
+        send: Callable[[], T],
+        estimated_tokens: float,
+        headers_of: Callable[[T], object] = lambda response: None,
+        usage_of: Callable[[T], Optional[float]] = lambda response: None,
+    ) -> T:
+        """call의 동기 버전"""
+        for attempt in Retrying(**self._retrying_kwargs()):
+            with attempt:
+                self.acquire_sync(estimated_tokens)
+                try:
+                    response = send()
+                except BaseException as e:
+                    self.on_failure(e, estimated_tokens)
+                    raise
+                self.on_success(
+                    headers_of(response), estimated_tokens, usage_of(response)
+                )
+        return response
+
+
+_shared_limiter: Optional[AdaptiveLimiter] = None
+_shared_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> AdaptiveLimiter:
+    """프로세스 전역 OpenAI 요청 제한기 반환"""
+    global _shared_limiter
+    if _shared_limiter is None:
+        with _shared_limiter_lock:
+            if _shared_limiter is None:
+                _shared_limiter = AdaptiveLimiter()
+    return _shared_limiter
@@ -0,0 +1,271 @@
+"""LLM 응답 캐시 모듈
+
+모델, 메시지, 샘플링 파라미터를 정규화한 JSON의 해시를 키로 하여 OpenAI
+응답 본문을 SQLite에 저장합니다. 같은 프롬프트를 다시 보내면 API를 호출하지
+않고 저장된 응답을 돌려줍니다.
+- TTL이 지난 응답은 사용하지 않고, 전체 크기가 한도를 넘으면 가장 오래 전에
+  사용한 응답부터 지웁니다 (LRU). 전체 크기는 저장할 때마다 합계를 다시 구하지
+  않고 누적값으로 추적하며, 한도를 넘었을 때만 실제 합계로 확인합니다.
+- WAL 모드와 스레드별 연결을 사용하므로 여러 Streamlit 세션(스레드)과
+  프로세스가 동시에 읽을 수 있습니다.
+- variants를 N으로 주면 키마다 N개의 응답 슬롯을 두고 요청마다 슬롯을 무작위로
+  골라, 같은 요청을 반복해도 N가지 문제가 섞여 나옵니다.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILE = "data/cache/llm_responses.sqlite"
+DEFAULT_TTL = 7 * 24 * 3600  # 초
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT NOT NULL,
+    variant INTEGER NOT NULL,
+    response TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (key, variant)
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+CREATE INDEX IF NOT EXISTS responses_created_at ON responses (created_at);
+"""
+
+
+def make_cache_key(model: str, messages, **params) -> str:
+    """
+    요청 내용으로 캐시 키 생성 (내용이 같으면 항상 같은 키)
+    Args:
+        model (str): 모델 이름
+        messages: chat.completions 메시지 목록
+        **params: temperature, max_tokens, response_format 등 샘플링 파라미터
+    Returns:
+        str: SHA-256 16진수 키
+    """
+    payload = json.dumps(
+        {"model": model, "messages": messages, "params": params},
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        path: str = CACHE_FILE,
+        ttl: float = DEFAULT_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        """
+        SQLite 기반 LLM 응답 캐시
+        Args:
+            path (str): SQLite 파일 경로
+            ttl (float): 응답 유효 기간 (초)
+            max_bytes (int): 저장할 응답 본문의 최대 총 크기
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._metrics_lock = threading.Lock()
+        self.metrics = {
+            "hits": 0,
+            "misses": 0,
+            "bytes_read": 0,
+            "bytes_written": 0,
+            "evictions": 0,
+        }
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        connection = self._connection()
+        connection.executescript(_SCHEMA)
+        # 저장된 응답의 총 크기 (저장/삭제 시 증감, 다른 프로세스의 기록은 한도를
+        # 넘었을 때 실제 합계로 다시 확인할 때 반영)
+        self._total_bytes = self._stored_bytes(connection)
+
+    def _connection(self) -> sqlite3.Connection:
+        """스레드별 연결 (sqlite3 연결은 스레드 간에 공유하지 않음)"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def _stored_bytes(connection: sqlite3.Connection) -> int:
+        return connection.execute(
+            "SELECT COALESCE(SUM(bytes), 0) FROM responses"
+        ).fetchone()[0]
+
+    def _count(self, **deltas: int) -> None:
+        with self._metrics_lock:
+            for name, delta in deltas.items():
+                self.metrics[name] += delta
+
+    def get(self, key: str, variant: int = 0) -> Optional[str]:
+        """
+        저장된 응답 조회 (없거나 TTL이 지났으면 None)
+        Args:
+            key (str): make_cache_key 결과
+            variant (int): 응답 슬롯 번호
+        Returns:
+            Optional[str]: 응답 본문
+        """
+        now = time.time()
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT response, created_at FROM responses WHERE key = ? AND variant = ?",
+            (key, variant),
+        ).fetchone()
+        if row is None or now - row[1] > self.ttl:
+            self._count(misses=1)
+            return None
+        connection.execute(
+            "UPDATE responses SET accessed_at = ? WHERE key = ? AND variant = ?",
+            (now, key, variant),
+        )
+        self._count(hits=1, bytes_read=len(row[0].encode("utf-8")))
+        return row[0]
+
+    def put(self, key: str, response: str, variant: int = 0) -> None:
+        """응답 저장 후 총 크기가 한도를 넘으면 LRU 순서로 삭제"""
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        connection = self._connection()
+        replaced = connection.execute(
+            "SELECT bytes FROM responses WHERE key = ? AND variant = ?",
+            (key, variant),
+        ).fetchone()
+        connection.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+            (key, variant, response, size, now, now),
+        )
+        self._count(bytes_written=size)
+        self._evict(connection, now, size - (replaced[0] if replaced else 0))
+
+    def _evict(self, connection: sqlite3.Connection, now: float, added: int) -> None:
+        """
+        만료된 응답을 지우고, 총 크기가 한도를 넘으면 LRU 순서로 삭제
+        Args:
+            connection (sqlite3.Connection): 현재 스레드의 연결
+            now (float): 기준 시각
+            added (int): 방금 저장하여 늘어난 바이트 수
+        """
+        cutoff = now - self.ttl
+        expired, expired_bytes = connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM responses "
+            "WHERE created_at < ?",
+            (cutoff,),
+        ).fetchone()
+        evicted = 0
+        if expired:
+            evicted = connection.execute(
+                "DELETE FROM responses WHERE created_at < ?", (cutoff,)
+            ).rowcount
+        with self._metrics_lock:
+            self._total_bytes += added - expired_bytes
+            total = self._total_bytes
+
+        if total > self.max_bytes:
+            # 다른 프로세스가 기록한 응답까지 포함한 실제 합계로 확인
+            total = self._stored_bytes(connection)
+            # 오래 전에 사용한 응답부터 한도 안으로 들어올 때까지 삭제
+            rows = connection.execute(
+                "SELECT key, variant, bytes FROM responses ORDER BY accessed_at"
+            )
+            victims = []
+            for key, variant, size in rows:
+                if total <= self.max_bytes:
+                    break
+                victims.append((key, variant))
+                total -= size
+            connection.executemany(
+                "DELETE FROM responses WHERE key = ? AND variant = ?", victims
+            )
+            evicted += len(victims)
+            with self._metrics_lock:
+                self._total_bytes = total
+        if evicted:
+            self._count(evictions=evicted)
+
+    def get_or_create(
+        self, key: str, create: Callable[[], str], variants: int = 1
+    ) -> str:
+        """
+        캐시에 있으면 저장된 응답, 없으면 create()로 만들어 저장
+        Args:
+            key (str): make_cache_key 결과
+            create (Callable[[], str]): API를 호출하여 응답 본문을 반환하는 함수
+            variants (int): 키마다 유지할 응답 수 (요청마다 하나를 무작위로 선택)
+        Returns:
+            str: 응답 본문
+        """
+        variant = random.randrange(variants) if variants > 1 else 0
+        response = self.get(key, variant)
+        if response is None:
+            response = create()
+            self.put(key, response, variant)
+        return response
+
+    async def aget_or_create(
+        self, key: str, create: Callable[[], Awaitable[str]], variants: int = 1
+    ) -> str:
+        """
+        get_or_create의 비동기 버전 (create는 코루틴 함수)
+        - SQLite 조회/저장은 블로킹 호출이므로 작업 스레드에서 실행하여
+          이벤트 루프의 다른 요청을 막지 않음
+        """
+        variant = random.randrange(variants) if variants > 1 else 0
+        response = await asyncio.to_thread(self.get, key, variant)
+        if response is None:
+            response = await create()
+            await asyncio.to_thread(self.put, key, response, variant)
+        return response
+
+    def stats(self) -> Dict:
+        """적중/실패 횟수, 읽고 쓴 바이트, 저장된 응답 수와 총 크기"""
+        entries, total = (
+            self._connection()
+            .execute("SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM responses")
+            .fetchone()
+        )
+        with self._metrics_lock:
+            stats = dict(self.metrics)
+        lookups = stats["hits"] + stats["misses"]
+        stats.update(
+            {
+                "hit_ratio": stats["hits"] / lookups if lookups else 0.0,
+                "entries": entries,
+                "total_bytes": total,
+            }
+        )
+        return stats
+
+
+_shared_cache: Optional[ResponseCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """프로세스 전역 LLM 응답 캐시 반환"""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = ResponseCache()
+    return _shared_cache
@@ -0,0 +1,107 @@
+"""스트리밍 JSON 파서 모듈
+
+OpenAI 스트리밍 응답의 조각을 받는 대로 읽어, 최상위 JSON 객체의 필드가
+하나 완성될 때마다 (키, 값)을 돌려줍니다. 문제 생성 응답은 question,
+options, correct_answer, explanation 순서로 오므로 전체 응답을 기다리지 않고
+문제 본문부터 화면에 보여줄 수 있습니다.
+- 첫 '{' 앞의 글자(```json 등)와 객체가 닫힌 뒤의 글자는 무시합니다.
+- 완성된 필드 값만 json.loads로 해석하므로 반쯤 온 값은 돌려주지 않습니다.
+"""
+
+import json
+from typing import Any, List, Optional, Tuple
+
+
+class IncrementalJSONParser:
+    def __init__(self):
+        """최상위 JSON 객체의 필드를 완성되는 순서대로 꺼내는 파서"""
+        self.text = ""
+        self.fields = {}
+        self.done = False
+        self._pos = 0  # 다음에 읽을 위치
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._key: Optional[str] = None
+        self._token_start: Optional[int] = None  # 현재 읽는 키/값의 시작 위치
+        self._expecting = "key"  # 최상위에서 다음에 올 것: key, colon, value
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        응답 조각 추가
+        Args:
+            chunk (str): 스트리밍으로 받은 텍스트 조각
+        Returns:
+            List[Tuple[str, Any]]: 이번 조각으로 완성된 (키, 값) 목록
+        """
+        self.text += chunk
+        completed = []
+        text = self.text
+        while self._pos < len(text) and not self.done:
+            char = text[self._pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._end_token(self._pos + 1, completed)
+            elif self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+            elif char == '"':
+                self._in_string = True
+                if self._depth == 1:
+                    self._start_token(self._pos)
+            elif char in "{[":
+                if self._depth == 1:
+                    self._start_token(self._pos)
+                self._depth += 1
+            elif char in "}]":
+                if self._depth == 1:
+                    # 숫자/true/null 같은 스칼라 값은 닫는 괄호에서 끝남
+                    if self._token_start is not None:
+                        self._end_token(self._pos, completed)
+                    self.done = True
+                self._depth -= 1
+                if self._depth == 1:
+                    self._end_token(self._pos + 1, completed)
+            elif self._depth == 1:
+                if char == ",":
+                    if self._token_start is not None:
+                        self._end_token(self._pos, completed)
+                    self._expecting = "key"
+                elif char == ":":
+                    self._expecting = "value"
+                elif not char.isspace() and self._token_start is None:
+                    self._start_token(self._pos)
+            self._pos += 1
+        return completed
+
+    def _start_token(self, pos: int) -> None:
+        if self._token_start is None:
+            self._token_start = pos
+
+    def _end_token(self, end: int, completed: List[Tuple[str, Any]]) -> None:
+        raw = self.text[self._token_start : end].strip()
+        self._token_start = None
+        if self._expecting == "key":
+            self._key = json.loads(raw)
+            self._expecting = "colon"
+        elif self._expecting == "value":
+            value = json.loads(raw)
+            self.fields[self._key] = value
+            completed.append((self._key, value))
+            self._expecting = "key"
+
+    def result(self) -> dict:
+        """
+        완성된 전체 객체
+        Raises:
+            ValueError: 객체가 아직 닫히지 않은 경우
+        """
+        if not self.done:
+            raise ValueError("JSON 객체가 끝나지 않았습니다.")
+        return dict(self.fields)
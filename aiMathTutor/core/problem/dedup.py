@@ -0,0 +1,290 @@
+"""유사 중복 문제 검출 클래스
+
+이 모듈은 숫자만 바뀐 문제처럼 거의 같은 문제를 저장 전에 걸러냅니다.
+숫자를 가린 정규화 문장의 MinHash 서명을 LSH 버킷에 색인하여 후보만
+빠르게 찾고, 후보에 대해서만 추정 Jaccard 유사도(필요하면 임베딩 코사인)를
+계산합니다.
+"""
+
+import re
+import time
+import unicodedata
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+NUMBER_PATTERN = re.compile(r"\d+(?:[.,/]\d+)*")
+# 사칙연산/비교 기호는 문제의 뜻을 바꾸므로 지우지 않고 따로 떨어진 토큰으로 유지
+OPERATORS = "+-×÷/=<>≤≥"
+OPERATOR_ALIASES = str.maketrans({"−": "-", "*": "×", "∗": "×", "⋅": "×", "·": "×"})
+OPERATOR_PATTERN = re.compile(f"[{re.escape(OPERATORS)}]")
+PUNCTUATION_PATTERN = re.compile(rf"[^\w#\s{re.escape(OPERATORS)}]")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+
+def normalize_problem_text(text: str) -> str:
+    """비교용 문장 정규화 (소문자, 문장부호 제거, 숫자는 '#'으로 가림)
+
+    연산 기호(+ - × ÷ / = < >)는 남기므로 "7 + 3 = ?"와 "7 × 3 = ?"는
+    서로 다른 문장으로 정규화됩니다.
+
+    Args:
+        text (str): 문제 문장
+
+    Returns:
+        str: 정규화된 문장
+    """
+    text = unicodedata.normalize("NFKC", str(text)).lower()
+    text = text.translate(OPERATOR_ALIASES)
+    text = NUMBER_PATTERN.sub("#", text)
+    text = PUNCTUATION_PATTERN.sub(" ", text)
+    text = OPERATOR_PATTERN.sub(r" \g<0> ", text)
+    return WHITESPACE_PATTERN.sub(" ", text).strip()
+
+
+def problem_text(problem: Dict) -> str:
+    """저장소 형식(question)과 RAG 형식(text) 모두에서 문제 문장 추출"""
+    return str(problem.get("question") or problem.get("text") or "")
+
+
+class NearDuplicateDetector:
+    def __init__(
+        self,
+        num_perm: int = 64,
+        bands: int = 16,
+        threshold: float = 0.7,
+        shingle_size: int = 4,
+        encode: Optional[Callable[[List[str]], np.ndarray]] = None,
+        cosine_threshold: float = 0.95,
+        cosine_candidates: int = 8,
+        seed: int = 1,
+    ):
+        """
+        Args:
+            num_perm (int): MinHash 서명 길이
+            bands (int): LSH 밴드 수 (num_perm의 약수)
+            threshold (float): 중복으로 판단할 추정 Jaccard 유사도
+            shingle_size (int): 문자 n-gram 크기
+            encode (Optional[Callable]): 문장 목록을 정규화 임베딩으로 변환하는 함수
+                (지정하면 Jaccard가 기준 미만인 LSH 후보만 코사인으로 다시 확인)
+            cosine_threshold (float): 중복으로 판단할 임베딩 코사인 유사도
+            cosine_candidates (int): 코사인으로 확인할 최대 후보 수 (Jaccard 상위)
+            seed (int): 해시 순열 난수 시드
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm은 bands의 배수여야 합니다.")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.encode = encode
+        self.cosine_threshold = cosine_threshold
+        self.cosine_candidates = cosine_candidates
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, MERSENNE_PRIME, size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.integers(0, MERSENNE_PRIME, size=(num_perm, 1), dtype=np.uint64)
+
+        # 서명은 연속 행렬에 저장하여 후보 점수를 한 번의 비교로 계산
+        self._matrix = np.empty((1024, num_perm), dtype=np.uint32)
+        self._row_ids: List[Optional[str]] = []
+        self._id_to_row: Dict[str, int] = {}
+        self._texts: Dict[str, str] = {}
+        self._vectors: Dict[str, np.ndarray] = {}  # 코사인 확인 시에만 채움
+        self._exact: Dict[bytes, str] = {}  # 숫자만 다른 문제는 서명 전체가 같음
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+
+        self.checked = 0
+        self.duplicates = 0
+        self.cosine_checks = 0
+        self._check_seconds = 0.0
+
+    def __len__(self) -> int:
+        return len(self._id_to_row)
+
+    def __contains__(self, problem_id: str) -> bool:
+        return problem_id in self._id_to_row
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """정규화 문장의 MinHash 서명 (문장이 비어 있으면 None)
+
+        Args:
+            text (str): 문제 문장
+
+        Returns:
+            Optional[np.ndarray]: (num_perm,) uint32 서명
+        """
+        normalized = normalize_problem_text(text)
+        if not normalized:
+            return None
+        k = min(self.shingle_size, len(normalized))
+        shingles = {normalized[i : i + k] for i in range(len(normalized) - k + 1)}
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in shingles),
+            dtype=np.uint64,
+            count=len(shingles),
+        )
+        # (a * h + b) mod p 를 모든 순열에 대해 한 번에 계산 (uint64 자리 넘침은 그대로 둠)
+        permuted = (self._a * hashes[np.newaxis, :] + self._b) % MERSENNE_PRIME
+        return (permuted.min(axis=1) & MAX_HASH).astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [
+            signature[band * self.rows : (band + 1) * self.rows].tobytes()
+            for band in range(self.bands)
+        ]
+
+    def add(
+        self, problem_id: str, text: str, signature: Optional[np.ndarray] = None
+    ) -> None:
+        """
+        문제를 색인에 추가
+
+        Args:
+            problem_id (str): 문제 ID
+            text (str): 문제 문장
+            signature (Optional[np.ndarray]): 미리 계산한 서명
+        """
+        if signature is None:
+            signature = self.signature(text)
+        if signature is None:
+            return
+        if problem_id in self._id_to_row:
+            self.remove(problem_id)
+
+        row = len(self._row_ids)
+        if row == len(self._matrix):
+            grown = np.empty((2 * row, self.num_perm), dtype=np.uint32)
+            grown[:row] = self._matrix
+            self._matrix = grown
+        self._matrix[row] = signature
+        self._row_ids.append(problem_id)
+        self._id_to_row[problem_id] = row
+        self._texts[problem_id] = text
+        self._exact.setdefault(signature.tobytes(), problem_id)
+        for bucket, key in zip(self._buckets, self._band_keys(signature)):
+            bucket.setdefault(key, []).append(row)
+
+    def remove(self, problem_id: str) -> None:
+        """문제를 색인에서 제거"""
+        row = self._id_to_row.pop(problem_id, None)
+        if row is None:
+            return
+        signature = self._matrix[row]
+        self._row_ids[row] = None
+        self._texts.pop(problem_id, None)
+        self._vectors.pop(problem_id, None)
+        if self._exact.get(signature.tobytes()) == problem_id:
+            del self._exact[signature.tobytes()]
+        for bucket, key in zip(self._buckets, self._band_keys(signature)):
+            rows = bucket.get(key)
+            if rows is not None:
+                rows.remove(row)
+                if not rows:
+                    del bucket[key]
+
+    def candidates(self, signature: np.ndarray) -> np.ndarray:
+        """밴드 하나 이상이 일치하는 후보 행 번호"""
+        found = set()
+        for bucket, key in zip(self._buckets, self._band_keys(signature)):
+            rows = bucket.get(key)
+            if rows:
+                found.update(rows)
+        return np.fromiter(found, dtype=np.int64, count=len(found))
+
+    def find_duplicate(
+        self, text: str, signature: Optional[np.ndarray] = None
+    ) -> Optional[Tuple[str, float]]:
+        """
+        가장 유사한 중복 문제 검색
+
+        Args:
+            text (str): 검사할 문제 문장
+            signature (Optional[np.ndarray]): 미리 계산한 서명
+
+        Returns:
+            Optional[Tuple[str, float]]: (중복 문제 ID, 유사도) 또는 None
+        """
+        if signature is None:
+            signature = self.signature(text)
+        if signature is None:
+            return None
+        exact = self._exact.get(signature.tobytes())
+        if exact is not None:
+            return exact, 1.0
+
+        rows = self.candidates(signature)
+        if not len(rows):
+            return None
+        similarity = (self._matrix[rows] == signature).mean(axis=1)
+        best = int(similarity.argmax())
+        if similarity[best] >= self.threshold:
+            return self._row_ids[rows[best]], float(similarity[best])
+        top = np.argsort(-similarity, kind="stable")[: self.cosine_candidates]
+        return self._find_by_cosine(text, [self._row_ids[rows[i]] for i in top])
+
+    def _find_by_cosine(
+        self, text: str, candidate_ids: List[str]
+    ) -> Optional[Tuple[str, float]]:
+        """LSH 후보에 대해서만 임베딩 코사인으로 확인"""
+        if self.encode is None:
+            return None
+        self.cosine_checks += 1
+
+        missing = [i for i in candidate_ids if i not in self._vectors]
+        texts = [text] + [self._texts[i] for i in missing]
+        vectors = self.encode(texts)
+        if vectors is None:
+            return None
+        vectors = np.asarray(vectors, dtype=np.float32)
+        for problem_id, vector in zip(missing, vectors[1:]):
+            self._vectors[problem_id] = vector
+
+        scores = np.stack([self._vectors[i] for i in candidate_ids]) @ vectors[0]
+        best = int(scores.argmax())
+        if scores[best] >= self.cosine_threshold:
+            return candidate_ids[best], float(scores[best])
+        return None
+
+    def check(
+        self, problem_id: Optional[str], text: str
+    ) -> Optional[Tuple[str, float]]:
+        """
+        중복 여부를 확인하고 중복이 아니면 색인에 추가
+
+        Args:
+            problem_id (Optional[str]): 새 문제 ID (None이면 확인만 하고 색인에
+                추가하지 않음. 저장이 끝난 뒤 add로 추가)
+            text (str): 새 문제 문장
+
+        Returns:
+            Optional[Tuple[str, float]]: 중복이면 (기존 문제 ID, 유사도), 아니면 None
+        """
+        start = time.perf_counter()
+        signature = self.signature(text)
+        duplicate = self.find_duplicate(text, signature)
+        self._check_seconds += time.perf_counter() - start
+        self.checked += 1
+        if duplicate is not None:
+            self.duplicates += 1
+        elif problem_id is not None:
+            self.add(problem_id, text, signature)
+        return duplicate
+
+    def get_stats(self) -> Dict:
+        """검사 수, 중복률, 검사당 평균 시간"""
+        return {
+            "indexed": len(self),
+            "checked": self.checked,
+            "duplicates": self.duplicates,
+            "duplicate_rate": self.duplicates / self.checked if self.checked else 0.0,
+            "cosine_checks": self.cosine_checks,
+            "avg_check_ms": (
+                1000 * self._check_seconds / self.checked if self.checked else 0.0
+            ),
+        }
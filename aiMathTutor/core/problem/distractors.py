@@ -0,0 +1,141 @@
+"""오답 보기 생성 모듈
+
+여러 문제의 정답을 한 번에 받아 오개념 규칙(하나 차이, 자릿값 실수, 다른
+연산, 자릿수 바꿈, 최대가 아닌 공약수)으로 오답 후보 행렬을 만들고, NumPy
+정렬만으로 중복과 정답을 제거하여 문제별 오답을 고릅니다. 후보 뒤에는 항상
+서로 다른 예비 후보(max(정답 + 1, min_value)부터 1씩)를 붙이므로 다시 뽑는
+반복이 없습니다.
+"""
+
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .number_tables import get_number_tables
+
+DEFAULT_RULES = ("off_by_one", "place_value", "wrong_operation", "digit_swap")
+MAX_RATIO = 10  # 정답보다 이 배수 이상 큰 후보는 그럴듯하지 않으므로 제외
+
+
+def _off_by_one(answers: np.ndarray, operands: Optional[np.ndarray]) -> np.ndarray:
+    return np.stack([answers - 1, answers + 1], axis=1)
+
+
+def _place_value(answers: np.ndarray, operands: Optional[np.ndarray]) -> np.ndarray:
+    return np.stack([answers - 10, answers + 10], axis=1)
+
+
+def _wrong_operation(answers: np.ndarray, operands: Optional[np.ndarray]) -> np.ndarray:
+    """두 피연산자에 다른 연산을 적용한 값 (정답과 같은 값은 이후에 제외)"""
+    if operands is None or operands.shape[1] < 2:
+        return np.empty((len(answers), 0), dtype=np.int64)
+    a, b = operands[:, 0], operands[:, 1]
+    safe_b = np.where(b == 0, 1, b)
+    return np.stack([a + b, np.abs(a - b), a * b, a // safe_b], axis=1)
+
+
+def _digit_swap(answers: np.ndarray, operands: Optional[np.ndarray]) -> np.ndarray:
+    """일의 자리와 십의 자리를 바꾼 값 (한 자리 수는 정답 그대로라 이후에 제외)"""
+    ones, tens = answers % 10, (answers // 10) % 10
+    swapped = answers - ones - tens * 10 + ones * 10 + tens
+    return np.where(answers >= 10, swapped, answers)[:, None]
+
+
+def _non_greatest_divisor(
+    answers: np.ndarray, operands: Optional[np.ndarray]
+) -> np.ndarray:
+    """최대공약수 대신 고를 만한 다른 공약수 (가장 큰 진약수와 1)"""
+    safe = np.maximum(answers, 1)
+    spf = get_number_tables(int(safe.max(initial=1))).smallest_prime_factor(safe)
+    return np.stack([safe // spf, np.ones_like(answers)], axis=1)
+
+
+RULES: Dict[str, Callable[[np.ndarray, Optional[np.ndarray]], np.ndarray]] = {
+    "off_by_one": _off_by_one,
+    "place_value": _place_value,
+    "wrong_operation": _wrong_operation,
+    "digit_swap": _digit_swap,
+    "non_greatest_divisor": _non_greatest_divisor,
+}
+
+
+def generate_distractors(
+    answers: Sequence,
+    operands: Optional[Sequence] = None,
+    rules: Sequence[str] = DEFAULT_RULES,
+    n_wrong: int = 3,
+    min_value: int = 0,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    문제 묶음 전체의 오답을 한 번에 생성
+    - 규칙 후보를 무작위 순서로 우선 사용하고, 부족하면 max(정답 + 1, min_value)부터
+      1씩 늘려 채움
+    Args:
+        answers (Sequence): 문제별 정수 정답 (n,)
+        operands (Optional[Sequence]): 문제별 피연산자 (n, 2), 'wrong_operation'에 사용
+        rules (Sequence[str]): 사용할 오개념 규칙 이름 (RULES의 키)
+        n_wrong (int): 문제당 오답 수
+        min_value (int): 허용하는 가장 작은 오답
+        rng (Optional[np.random.Generator]): 난수 생성기
+    Returns:
+        np.ndarray: (n, n_wrong) 오답 행렬. 행 안의 값은 서로 다르고 정답과 다름
+    """
+    rng = rng or np.random.default_rng()
+    answers = np.asarray(answers, dtype=np.int64)
+    if operands is not None:
+        operands = np.asarray(operands, dtype=np.int64).reshape(len(answers), -1)
+
+    columns = [RULES[name](answers, operands) for name in rules]
+    rule_candidates = np.concatenate(columns, axis=1)
+    # 예비 후보는 max(정답 + 1, min_value)부터 세므로 항상 정답과 다르고,
+    # 서로 다르며, min_value 이상이라 n_wrong개를 보장
+    start = np.maximum(answers + 1, min_value)
+    fallback = start[:, None] + np.arange(n_wrong)
+    candidates = np.concatenate([rule_candidates, fallback], axis=1)
+    scores = np.concatenate(
+        [
+            rng.random(rule_candidates.shape),
+            np.broadcast_to(
+                np.arange(1, n_wrong + 1, dtype=np.float64), fallback.shape
+            ),
+        ],
+        axis=1,
+    )
+    too_large = candidates > np.maximum(answers * MAX_RATIO, answers + 10)[:, None]
+    too_large[:, rule_candidates.shape[1] :] = False  # 예비 후보는 항상 허용
+    scores[(candidates == answers[:, None]) | (candidates < min_value) | too_large] = (
+        np.inf
+    )
+
+    # 값으로 정렬하여 같은 값 중 점수가 가장 낮은 후보만 남김
+    order = np.argsort(scores, axis=1, kind="stable")
+    candidates = np.take_along_axis(candidates, order, axis=1)
+    scores = np.take_along_axis(scores, order, axis=1)
+    order = np.argsort(candidates, axis=1, kind="stable")
+    candidates = np.take_along_axis(candidates, order, axis=1)
+    scores = np.take_along_axis(scores, order, axis=1)
+    scores[:, 1:][candidates[:, 1:] == candidates[:, :-1]] = np.inf
+
+    picked = np.argsort(scores, axis=1, kind="stable")[:, :n_wrong]
+    return np.take_along_axis(candidates, picked, axis=1)
+
+
+def build_option_sets(
+    answers: Sequence,
+    distractors: np.ndarray,
+    rng: Optional[np.random.Generator] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    정답과 오답을 섞은 보기 행렬
+    Args:
+        answers (Sequence): 문제별 정답 (n,)
+        distractors (np.ndarray): (n, k) 오답 행렬
+        rng (Optional[np.random.Generator]): 난수 생성기
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (n, k + 1) 보기 행렬과 문제별 정답 위치 (0부터)
+    """
+    rng = rng or np.random.default_rng()
+    options = np.concatenate([np.asarray(answers)[:, None], distractors], axis=1)
+    order = np.argsort(rng.random(options.shape), axis=1)
+    return np.take_along_axis(options, order, axis=1), np.argmin(order, axis=1)
@@ -0,0 +1,119 @@
+"""정수론 표 모듈
+
+가장 작은 소인수 체(sieve)와 범위별 "최대공약수가 1보다 큰 수 쌍" 표를
+프로세스에서 한 번만 만들어 최대공약수/최소공배수/소인수분해/소수 템플릿이
+함께 사용합니다. 모든 템플릿이 get_number_tables()로 같은 인스턴스를 받습니다.
+"""
+
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_LIMIT = 100000
+
+
+def _sieve(limit: int) -> np.ndarray:
+    """0..limit 각 수의 가장 작은 소인수 (0, 1은 자기 자신)"""
+    spf = np.arange(limit + 1, dtype=np.int64)
+    for p in range(2, int(limit**0.5) + 1):
+        if spf[p] == p:
+            multiples = spf[p * p :: p]
+            multiples[multiples == np.arange(p * p, limit + 1, p)] = p
+    return spf
+
+
+class NumberTables:
+    def __init__(self, limit: int = DEFAULT_LIMIT):
+        """
+        정수론 표
+        Args:
+            limit (int): 체로 미리 계산할 가장 큰 수
+        """
+        self.limit = limit
+        self.smallest_prime_factors = _sieve(limit)
+        self.is_prime = self.smallest_prime_factors == np.arange(limit + 1)
+        self.is_prime[:2] = False
+        self.primes = np.flatnonzero(self.is_prime)
+        self._pair_tables: Dict[Tuple[int, int], np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def smallest_prime_factor(self, values) -> np.ndarray:
+        """각 값의 가장 작은 소인수 (1 이하는 그대로)"""
+        values = np.asarray(values, dtype=np.int64)
+        return self.smallest_prime_factors[np.clip(values, 0, self.limit)]
+
+    def prime_factors(self, n: int) -> List[int]:
+        """소인수분해 결과 (중복 포함, 오름차순)"""
+        factors = []
+        while n > 1:
+            p = int(self.smallest_prime_factors[n])
+            factors.append(p)
+            n //= p
+        return factors
+
+    def divisors(self, n: int) -> List[int]:
+        """약수 목록 (오름차순)"""
+        divisors = [1]
+        factors = self.prime_factors(n)
+        for p in sorted(set(factors)):
+            powers = [p**e for e in range(1, factors.count(p) + 1)]
+            divisors += [d * q for d in divisors for q in powers]
+        return sorted(divisors)
+
+    def common_factor_pairs(self, min_val: int, max_val: int) -> np.ndarray:
+        """
+        범위 안에서 최대공약수가 1보다 큰 모든 수 쌍 (범위별로 한 번만 계산)
+        Args:
+            min_val (int): 가장 작은 수
+            max_val (int): 가장 큰 수
+        Returns:
+            np.ndarray: (m, 2) 수 쌍 표
+        """
+        key = (min_val, max_val)
+        pairs = self._pair_tables.get(key)
+        if pairs is None:
+            with self._lock:
+                pairs = self._pair_tables.get(key)
+                if pairs is None:
+                    values = np.arange(min_val, max_val + 1, dtype=np.int32)
+                    a, b = np.meshgrid(values, values, indexing="ij")
+                    valid = np.gcd(a, b) > 1
+                    pairs = np.stack([a[valid], b[valid]], axis=1)
+                    self._pair_tables[key] = pairs
+        return pairs
+
+    def sample_common_factor_pairs(
+        self,
+        min_val: int,
+        max_val: int,
+        n: int,
+        rng: Optional[np.random.Generator] = None,
+    ) -> np.ndarray:
+        """최대공약수가 1보다 큰 수 쌍 n개를 고르게 추출 ((n, 2) 행렬)"""
+        rng = rng or np.random.default_rng()
+        pairs = self.common_factor_pairs(min_val, max_val)
+        return pairs[rng.integers(0, len(pairs), size=n)].astype(np.int64)
+
+
+_shared_tables: Optional[NumberTables] = None
+_shared_tables_lock = threading.Lock()
+
+
+def get_number_tables(limit: int = DEFAULT_LIMIT) -> NumberTables:
+    """
+    프로세스 전역 정수론 표 반환
+    - 처음 호출할 때 만들고, 더 큰 limit을 요청하면 그 크기로 다시 만듦
+    Args:
+        limit (int): 필요한 가장 큰 수
+    Returns:
+        NumberTables: 공유 정수론 표
+    """
+    global _shared_tables
+    tables = _shared_tables
+    if tables is None or tables.limit < limit:
+        with _shared_tables_lock:
+            if _shared_tables is None or _shared_tables.limit < limit:
+                _shared_tables = NumberTables(max(limit, DEFAULT_LIMIT))
+            tables = _shared_tables
+    return tables
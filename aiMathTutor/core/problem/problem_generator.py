@@ -2,13 +2,13 @@
 문제 생성을 위한 메인 생성기 모듈
 """
 
-import json
 from typing import Dict, List, Optional
 from pathlib import Path
 import random
 import uuid
 
-from .templates.gcd_template import GCDProblemTemplate
+from core.knowledge.knowledge_map import get_knowledge_map
+from .template_registry import get_template_registry
 
 
 class ProblemGenerator:
@@ -19,20 +19,19 @@ class ProblemGenerator:
         Args:
             knowledge_map_path: knowledge_map.json 파일의 경로
         """
-        self.knowledge_map = self._load_knowledge_map(knowledge_map_path)
-        self.templates = {"Greatest Common Divisor": GCDProblemTemplate()}
+        get_knowledge_map(knowledge_map_path)  # 경로 확인 겸 첫 로드
+        self.knowledge_map_path = knowledge_map_path
+        # 템플릿 모듈은 개념의 문제가 처음 요청될 때 가져옴
+        self.templates = get_template_registry()
 
-    def _load_knowledge_map(self, path: str) -> Dict:
-        """knowledge_map.json 파일 로드"""
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+    @property
+    def knowledge_map(self):
+        """현재 지식 맵 스냅샷 (파일이 바뀌면 다시 읽은 지식 맵)"""
+        return get_knowledge_map(self.knowledge_map_path)
 
     def _get_concept_info(self, concept: str) -> Optional[Dict]:
-        """주어진 개념에 대한 정보 조회"""
-        for item in self.knowledge_map:
-            if item.get("concept") == concept:
-                return item
-        return None
+        """주어진 개념(ID 또는 이름)에 대한 정보 조회"""
+        return self.knowledge_map.get_concept(concept)
 
     def _generate_problem_id(self) -> str:
         """UUID를 사용하여 고유한 문제 ID 생성"""
@@ -98,7 +97,7 @@ class ProblemGenerator:
             raise ValueError("Original problem missing concept metadata")
 
         template = self.templates.get(concept)
-        if not template:
+        if not template or not hasattr(template, "generate_similar_problem"):
             raise ValueError(f"No template available for concept: {concept}")
 
         problem = template.generate_similar_problem(original_problem, variation_type)
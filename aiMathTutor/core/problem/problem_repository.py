@@ -1,9 +1,12 @@
 import json
 import os
-from typing import Dict, List, Optional
+import threading
+from typing import Callable, Dict, List, Optional
 from datetime import datetime
 import logging
 
+from .dedup import NearDuplicateDetector, problem_text
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,10 +28,61 @@ class ProblemRepository:
             )
             self.history_file = os.path.join(self.problems_dir, "user_history.json")
             self.problems_by_concept = {}  # 개념별 문제 캐시
+            self._listeners: List[Callable[[Dict], None]] = []  # 변경 피드 구독자
+            self._event_seq = 0
+            self._listener_lock = threading.Lock()
+            # 중복 검사부터 파일 저장까지를 묶음 (dedup 색인과 문제 파일은 스레드에
+            # 안전하지 않으므로 동시에 저장하면 둘 다 검사를 통과하거나 색인이 깨짐)
+            self._write_lock = threading.RLock()
+            self.dedup = NearDuplicateDetector()  # 저장 전 유사 중복 검사
             self._ensure_files_exist()
-            self._load_problems()
+            for problem in self._load_problems():
+                self.dedup.add(problem.get("id"), problem_text(problem))
             self._is_initialized = True
 
+    def subscribe(self, listener: Callable[[Dict], None]) -> None:
+        """문제 저장/삭제 변경 피드 구독
+
+        Args:
+            listener: {"seq", "type": "save" | "delete", "problem", "timestamp"}
+                이벤트를 받는 함수
+        """
+        with self._listener_lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[Dict], None]) -> None:
+        """변경 피드 구독 해제"""
+        with self._listener_lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def _publish(self, event_type: str, problem: Dict) -> None:
+        """구독자에게 변경 이벤트 전달 (구독자 오류는 저장 결과에 영향을 주지 않음)"""
+        with self._listener_lock:
+            self._event_seq += 1
+            event = {
+                "seq": self._event_seq,
+                "type": event_type,
+                "problem": problem,
+                "timestamp": datetime.now().isoformat(),
+            }
+            listeners = list(self._listeners)
+
+        for listener in listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                logger.error(f"변경 피드 구독자 오류: {str(e)}")
+
+    def get_dedup_stats(self) -> Dict:
+        """유사 중복 검사 통계 (검사 수, 중복률, 검사당 평균 시간)"""
+        return self.dedup.get_stats()
+
+    def get_all_problems(self) -> List[Dict]:
+        """저장된 모든 문제 반환"""
+        return self._load_problems()
+
     def _ensure_files_exist(self):
         """필요한 디렉토리와 파일이 존재하는지 확인하고 없으면 생성"""
         os.makedirs(self.problems_dir, exist_ok=True)
@@ -98,29 +152,57 @@ class ProblemRepository:
             logger.error(f"문제 불러오기 실패: {str(e)}")
             return []
 
-    def save_problem(self, problem: Dict) -> str:
-        """새로운 문제를 저장하고 ID 반환"""
-        try:
-            # 기존 문제 불러오기
-            problems = self._load_problems()
-
-            # 문제 ID 및 생성 시간 추가
-            if "id" not in problem:
-                problem["id"] = str(len(problems) + 1).zfill(6)
-            problem["created_at"] = datetime.now().isoformat()
+    def save_problem(
+        self, problem: Dict, allow_duplicate: bool = False
+    ) -> Optional[str]:
+        """새로운 문제를 저장하고 ID 반환
 
-            # 문제 추가 및 저장
-            problems.append(problem)
-            self._save_problems(problems)
-
-            # 개념별 캐시 업데이트
-            concept = problem.get("concept")
-            if concept:
-                if concept not in self.problems_by_concept:
-                    self.problems_by_concept[concept] = []
-                self.problems_by_concept[concept].append(problem)
+        숫자만 다른 문제처럼 이미 저장된 문제와 거의 같으면 저장하지 않고
+        None을 반환합니다 (problem에는 ID를 붙이지 않음).
+        allow_duplicate=True면 검사를 생략합니다.
+        """
+        try:
+            text = problem_text(problem)
+            with self._write_lock:
+                if not allow_duplicate:
+                    # ID를 붙이기 전에 검사하여 거부된 문제에 가짜 ID가 남지 않도록
+                    duplicate = self.dedup.check(None, text)
+                    if duplicate is not None:
+                        duplicate_id, similarity = duplicate
+                        logger.info(
+                            f"유사 중복 문제라 저장하지 않았습니다. "
+                            f"기존 ID: {duplicate_id} (유사도 {similarity:.2f})"
+                        )
+                        return None
+
+                # 기존 문제 불러오기
+                problems = self._load_problems()
+
+                # 문제 ID 및 생성 시간 추가
+                if "id" not in problem:
+                    # 삭제 후 저장해도 기존 ID와 겹치지 않도록 (변경 피드는 ID로 문제를 구분)
+                    used_ids = {p.get("id") for p in problems}
+                    next_id = len(problems) + 1
+                    while str(next_id).zfill(6) in used_ids:
+                        next_id += 1
+                    problem["id"] = str(next_id).zfill(6)
+
+                problem["created_at"] = datetime.now().isoformat()
+
+                # 문제 추가 및 저장
+                problems.append(problem)
+                self._save_problems(problems)
+                self.dedup.add(problem["id"], text)
 
-            logger.info(f"새로운 문제가 저장되었습니다. ID: {problem['id']}")
+                # 개념별 캐시 업데이트
+                concept = problem.get("concept")
+                if concept:
+                    if concept not in self.problems_by_concept:
+                        self.problems_by_concept[concept] = []
+                    self.problems_by_concept[concept].append(problem)
+
+                logger.info(f"새로운 문제가 저장되었습니다. ID: {problem['id']}")
+                self._publish("save", problem)
             return problem["id"]
         except Exception as e:
             logger.error(f"문제 저장 실패: {str(e)}")
@@ -154,22 +236,27 @@ class ProblemRepository:
     def delete_problem(self, problem_id: str) -> bool:
         """문제 삭제"""
         try:
-            problems = self._load_problems()
-            filtered_problems = [p for p in problems if p.get("id") != problem_id]
-
-            if len(filtered_problems) < len(problems):
-                self._save_problems(filtered_problems)
-
-                # 개념별 캐시 업데이트
-                for concept in self.problems_by_concept:
-                    self.problems_by_concept[concept] = [
-                        p
-                        for p in self.problems_by_concept[concept]
-                        if p.get("id") != problem_id
-                    ]
-
-                logger.info(f"문제가 삭제되었습니다. ID: {problem_id}")
-                return True
+            with self._write_lock:
+                problems = self._load_problems()
+                filtered_problems = [p for p in problems if p.get("id") != problem_id]
+                deleted_problems = [p for p in problems if p.get("id") == problem_id]
+                if len(filtered_problems) < len(problems):
+                    self._save_problems(filtered_problems)
+
+                    # 개념별 캐시 업데이트
+                    for concept in self.problems_by_concept:
+                        self.problems_by_concept[concept] = [
+                            p
+                            for p in self.problems_by_concept[concept]
+                            if p.get("id") != problem_id
+                        ]
+
+                    self.dedup.remove(problem_id)
+                    logger.info(f"문제가 삭제되었습니다. ID: {problem_id}")
+                    # 저장/삭제 이벤트 순서가 파일 변경 순서와 같도록 잠금 안에서 전달
+                    for problem in deleted_problems:
+                        self._publish("delete", problem)
+                    return True
             return False
         except Exception as e:
             logger.error(f"문제 삭제 실패: {str(e)}")
@@ -0,0 +1,302 @@
+"""템플릿 레지스트리 모듈
+
+core/problem/templates/ 아래의 *_template.py 모듈을 가져오지 않고 구문만
+읽어 담당 개념(CONCEPTS)과 템플릿 클래스를 찾아 두고, 개념의 문제가 처음
+요청될 때 해당 모듈만 가져옵니다. 지식 맵 개념 ID/이름으로 조회할 수 있어
+app.py가 템플릿이 있는 개념은 LLM 호출 없이 바로 문제를 만들 수 있습니다.
+
+실행 (aiMathTutor 디렉토리에서):
+    python -m core.problem.template_registry
+"""
+
+import ast
+import importlib
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from core.knowledge.concept_aliases import get_concept_aliases
+from core.knowledge.knowledge_map import KNOWLEDGE_MAP_FILE, get_knowledge_map
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), "templates")
+TEMPLATES_PACKAGE = "core.problem.templates"
+
+# 앱의 난이도 표기 → 템플릿 난이도
+DIFFICULTY_MAP = {"하": "easy", "중": "medium", "상": "hard"}
+DIFFICULTY_ORDER = ["하", "중", "상"]
+LATENCY_WINDOW = 1000  # 개념별로 보관할 최근 지연 시간 수 (메모리 상한)
+
+
+def _read_declarations(path: str) -> Optional[Tuple[List[str], str]]:
+    """모듈 구문에서 CONCEPTS 값과 첫 템플릿 클래스 이름 읽기 (실행하지 않음)"""
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    concepts, class_name = None, None
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(t, ast.Name) and t.id == "CONCEPTS" for t in node.targets
+        ):
+            concepts = list(ast.literal_eval(node.value))
+        elif (
+            isinstance(node, ast.ClassDef)
+            and node.name.endswith("Template")
+            and class_name is None
+        ):
+            class_name = node.name
+    if not concepts or class_name is None:
+        return None
+    return concepts, class_name
+
+
+class TemplateRegistry:
+    def __init__(
+        self,
+        templates_dir: str = TEMPLATES_DIR,
+        knowledge_map_file: str = KNOWLEDGE_MAP_FILE,
+    ):
+        """
+        개념별 문제 템플릿 레지스트리
+        Args:
+            templates_dir (str): 템플릿 모듈 디렉토리
+            knowledge_map_file (str): 개념 ID → 이름 변환에 사용할 지식 맵
+        """
+        self.templates_dir = templates_dir
+        self.knowledge_map_file = knowledge_map_file
+        self._entries: Optional[Dict[str, Tuple[str, str]]] = None
+        self._concept_names: Optional[Tuple[object, Dict[str, str]]] = None
+        self._instances: Dict[Tuple[str, str], object] = {}
+        self._latencies: Dict[str, deque] = {}  # 개념별 최근 LATENCY_WINDOW개
+        self._counts: Dict[str, int] = {}  # 개념별 전체 생성 수
+        self._lock = threading.Lock()
+
+    @property
+    def entries(self) -> Dict[str, Tuple[str, str]]:
+        """개념 이름 → (모듈 이름, 클래스 이름) (처음 접근할 때 디렉토리를 훑음)"""
+        if self._entries is None:
+            with self._lock:
+                if self._entries is None:
+                    self._entries = self._discover()
+        return self._entries
+
+    def _discover(self) -> Dict[str, Tuple[str, str]]:
+        entries = {}
+        for filename in sorted(os.listdir(self.templates_dir)):
+            if not filename.endswith("_template.py"):
+                continue
+            try:
+                declarations = _read_declarations(
+                    os.path.join(self.templates_dir, filename)
+                )
+            except (OSError, SyntaxError, ValueError) as e:
+                logger.warning(f"템플릿 모듈 읽기 실패 ({filename}): {str(e)}")
+                continue
+            if declarations is None:
+                continue
+            concepts, class_name = declarations
+            for concept in concepts:
+                entries[concept] = (filename[: -len(".py")], class_name)
+        return entries
+
+    def _get_concept_names(self) -> Dict[str, str]:
+        """지식 맵 개념 ID → 이름 (같은 ID가 여러 번 나오면 처음 것을 사용)"""
+        try:
+            knowledge_map = get_knowledge_map(self.knowledge_map_file)
+        except (OSError, ValueError) as e:
+            logger.warning(f"지식 맵 로드 실패: {str(e)}")
+            return {}
+        # 지식 맵 스냅샷이 교체되었을 때만 다시 만듦
+        if self._concept_names is None or self._concept_names[0] is not knowledge_map:
+            self._concept_names = (
+                knowledge_map,
+                {
+                    concept_id: details["concept"]
+                    for concept_id, details in knowledge_map.concepts_by_id.items()
+                },
+            )
+        return self._concept_names[1]
+
+    def resolve(self, concept: str) -> Optional[str]:
+        """개념 ID 또는 이름을 템플릿이 담당하는 개념 이름으로 변환"""
+        if concept in self.entries:
+            return concept
+        name = self._get_concept_names().get(concept)
+        return name if name in self.entries else None
+
+    def has_template(self, concept: str) -> bool:
+        return self.resolve(concept) is not None
+
+    def get(self, concept: str):
+        """
+        개념의 템플릿 인스턴스 (모듈은 처음 요청될 때 가져옴)
+        Args:
+            concept (str): 지식 맵 개념 ID 또는 개념 이름
+        Returns:
+            템플릿 인스턴스 또는 None
+        """
+        name = self.resolve(concept)
+        if name is None:
+            return None
+        entry = self.entries[name]
+        instance = self._instances.get(entry)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(entry)
+                if instance is None:
+                    module_name, class_name = entry
+                    module = importlib.import_module(
+                        f"{TEMPLATES_PACKAGE}.{module_name}"
+                    )
+                    instance = getattr(module, class_name)()
+                    self._instances[entry] = instance
+        return instance
+
+    def generate_problem(self, concept: str, difficulty: str) -> Optional[Dict]:
+        """
+        템플릿으로 앱 형식의 객관식 문제 생성 (템플릿이 없으면 None)
+        Args:
+            concept (str): 지식 맵 개념 ID 또는 개념 이름
+            difficulty (str): 난이도 ('상', '중', '하')
+        Returns:
+            Optional[Dict]: question/options/correct_answer/explanation 형식의 문제
+        """
+        problems = self.generate_problems(concept, difficulty, 1)
+        return problems[0] if problems else None
+
+    def generate_problems(self, concept: str, difficulty: str, n: int) -> List[Dict]:
+        """
+        템플릿으로 앱 형식의 객관식 문제 n개를 한 번에 생성 (템플릿이 없으면 빈 목록)
+        - 템플릿에 generate_problems(difficulty, n)이 있으면 한 번의 배치 호출로 생성
+        Args:
+            concept (str): 지식 맵 개념 ID 또는 개념 이름
+            difficulty (str): 난이도 ('상', '중', '하')
+            n (int): 생성할 문제 수
+        Returns:
+            List[Dict]: question/options/correct_answer/explanation 형식의 문제 목록
+        """
+        start = time.perf_counter()
+        template = self.get(concept)
+        if template is None or n <= 0:
+            return []
+
+        template_difficulty = DIFFICULTY_MAP.get(difficulty, "medium")
+        if hasattr(template, "generate_problems"):
+            raws = template.generate_problems(template_difficulty, n)
+        else:
+            raws = [template.generate_problem(template_difficulty) for _ in range(n)]
+        problems = [self._to_app_problem(raw, concept, difficulty) for raw in raws]
+
+        # 배치로 만든 문제는 문제당 평균 시간으로 기록
+        elapsed_ms = (time.perf_counter() - start) * 1000 / len(problems)
+        name = self.resolve(concept)
+        with self._lock:
+            self._latencies.setdefault(name, deque(maxlen=LATENCY_WINDOW)).extend(
+                [elapsed_ms] * len(problems)
+            )
+            self._counts[name] = self._counts.get(name, 0) + len(problems)
+        return problems
+
+    def _to_app_problem(self, raw: Dict, concept: str, difficulty: str) -> Dict:
+        """템플릿 형식(options 딕셔너리, 정답 문자)을 앱 형식으로 변환"""
+        keys = sorted(raw["options"])
+        level = (
+            DIFFICULTY_ORDER.index(difficulty) if difficulty in DIFFICULTY_ORDER else 1
+        )
+        return {
+            "id": str(uuid.uuid4()),
+            "question": raw["question"],
+            "options": [raw["options"][k] for k in keys],
+            "correct_answer": keys.index(raw["answer"]) + 1,
+            "explanation": raw["explanation"],
+            "concept": self.resolve(concept),
+            "difficulty": difficulty,
+            "next_problems": {
+                "similar": {"concept": concept, "difficulty": difficulty},
+                "harder": {
+                    "concept": concept,
+                    "difficulty": DIFFICULTY_ORDER[min(level + 1, 2)],
+                },
+                "related": {
+                    "concept": self._related_concept(concept),
+                    "difficulty": difficulty,
+                },
+            },
+        }
+
+    @staticmethod
+    def _related_concept(concept: str) -> str:
+        """관련 개념 (같은 단원의 개념과 선수 개념 중 하나, 없으면 같은 개념)"""
+        related = get_concept_aliases().related_concepts(concept)
+        return random.choice(related) if related else concept
+
+    def coverage(self) -> Dict:
+        """
+        지식 맵 개념 중 템플릿이 있는 개념의 비율
+        Returns:
+            Dict: {"covered": [...], "missing": [...], "ratio": float}
+        """
+        covered, missing = [], []
+        for concept_id, name in self._get_concept_names().items():
+            (covered if name in self.entries else missing).append(concept_id)
+        total = len(covered) + len(missing)
+        return {
+            "covered": covered,
+            "missing": missing,
+            "ratio": len(covered) / total if total else 0.0,
+        }
+
+    def latency_report(self) -> Dict[str, Dict]:
+        """개념별 템플릿 문제 생성 횟수와 최근 LATENCY_WINDOW개의 지연 시간 (ms)"""
+        with self._lock:
+            windows = {
+                concept: (self._counts[concept], sorted(latencies))
+                for concept, latencies in self._latencies.items()
+            }
+        report = {}
+        for concept, (count, ordered) in windows.items():
+            report[concept] = {
+                "count": count,
+                "avg_ms": sum(ordered) / len(ordered),
+                "p95_ms": ordered[int(0.95 * (len(ordered) - 1))],
+                "max_ms": ordered[-1],
+            }
+        return report
+
+
+_shared_registry = None
+_shared_registry_lock = threading.Lock()
+
+
+def get_template_registry() -> TemplateRegistry:
+    """프로세스 전역 템플릿 레지스트리 반환"""
+    global _shared_registry
+    if _shared_registry is None:
+        with _shared_registry_lock:
+            if _shared_registry is None:
+                _shared_registry = TemplateRegistry()
+    return _shared_registry
+
+
+if __name__ == "__main__":
+    registry = get_template_registry()
+    coverage = registry.coverage()
+    print(
+        f"템플릿 적용 개념: {len(coverage['covered'])}개 "
+        f"({coverage['ratio']:.0%}), 미적용: {', '.join(coverage['missing'])}"
+    )
+    for concept_id in coverage["covered"]:
+        for difficulty in DIFFICULTY_ORDER:
+            for _ in range(100):
+                registry.generate_problem(concept_id, difficulty)
+    for concept, stats in registry.latency_report().items():
+        print(
+            f"{concept}: {stats['count']}회, 평균 {stats['avg_ms']:.3f} ms, "
+            f"p95 {stats['p95_ms']:.3f} ms, 최대 {stats['max_ms']:.3f} ms"
+        )
@@ -2,9 +2,19 @@
 최대공약수(GCD) 문제 생성을 위한 템플릿 모듈
 """
 import random
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import math
 
+import numpy as np
+
+from ..distractors import build_option_sets, generate_distractors
+from ..number_tables import get_number_tables
+
+# 템플릿 레지스트리가 모듈을 가져오지 않고 읽는 담당 개념 (지식 맵 개념 이름)
+CONCEPTS = ('최대공약수', 'Greatest Common Divisor')
+
+GCD_RULES = ('non_greatest_divisor', 'off_by_one', 'digit_swap')
+
 class GCDProblemTemplate:
     def __init__(self):
         # 난이도별 숫자 범위 정의
@@ -15,43 +25,21 @@ class GCDProblemTemplate:
         }
         
     def _generate_number_pair(self, difficulty: str) -> Tuple[int, int]:
-        """난이도에 따른 숫자 쌍 생성"""
+        """난이도에 따른 숫자 쌍 생성 (최대공약수가 1보다 큰 쌍 표에서 추출)"""
         min_val, max_val = self.difficulty_ranges[difficulty]
-        
-        # 첫 번째 숫자 생성
-        num1 = random.randint(min_val, max_val)
-        
-        # GCD가 1이 되지 않도록 두 번째 숫자 생성
-        while True:
-            num2 = random.randint(min_val, max_val)
-            if math.gcd(num1, num2) > 1:
-                break
-                
-        return num1, num2
+        num1, num2 = get_number_tables(max_val).sample_common_factor_pairs(
+            min_val, max_val, 1
+        )[0]
+        return int(num1), int(num2)
     
     def _generate_wrong_answers(self, correct_gcd: int, num1: int, num2: int) -> List[int]:
-        """오답 보기 생성"""
-        wrong_answers = set()
-        
-        # 공약수가 아닌 수를 포함
-        wrong_answers.add(correct_gcd + 1)
-        wrong_answers.add(correct_gcd - 1 if correct_gcd > 1 else 2)
-        
-        # 두 수의 공약수 중 GCD가 아닌 수를 포함
-        smaller_num = min(num1, num2)
-        for i in range(1, smaller_num + 1):
-            if num1 % i == 0 and num2 % i == 0 and i != correct_gcd:
-                wrong_answers.add(i)
-                if len(wrong_answers) >= 3:
-                    break
-        
-        # 필요한 경우 추가 오답 생성
-        while len(wrong_answers) < 3:
-            wrong = random.randint(1, correct_gcd * 2)
-            if wrong != correct_gcd:
-                wrong_answers.add(wrong)
-                
-        return list(wrong_answers)[:3]
+        """오답 보기 생성 (최대가 아닌 공약수, 하나 차이 등 오개념 규칙)"""
+        wrong_answers = generate_distractors(
+            [correct_gcd],
+            rules=GCD_RULES,
+            min_value=1,
+        )
+        return [int(x) for x in wrong_answers[0]]
     
     def generate_problem(self, difficulty: str) -> Dict:
         """주어진 난이도에 따른 GCD 문제 생성"""
@@ -86,6 +74,40 @@ class GCDProblemTemplate:
         
         return problem
 
+    def generate_problems(self, difficulty: str, n: int,
+                          rng: Optional[np.random.Generator] = None) -> List[Dict]:
+        """
+        주어진 난이도의 GCD 문제 n개를 한 번에 생성
+        - 수 쌍은 정수론 표에서 추출하고 최대공약수는 numpy.gcd로 한 번에 계산
+        Args:
+            difficulty: 문제 난이도 ('easy', 'medium', 'hard')
+            n: 생성할 문제 수
+            rng: 난수 생성기
+        Returns:
+            generate_problem과 같은 형식의 문제 목록
+        """
+        rng = rng or np.random.default_rng()
+        min_val, max_val = self.difficulty_ranges[difficulty]
+        pairs = get_number_tables(max_val).sample_common_factor_pairs(
+            min_val, max_val, n, rng
+        )
+        gcds = np.gcd(pairs[:, 0], pairs[:, 1])
+        wrong_answers = generate_distractors(gcds, rules=GCD_RULES, min_value=1, rng=rng)
+        option_sets, positions = build_option_sets(gcds, wrong_answers, rng)
+
+        problems = []
+        for (num1, num2), correct_gcd, options, position in zip(
+            pairs.tolist(), gcds.tolist(), option_sets.tolist(), positions.tolist()
+        ):
+            problems.append({
+                "question": f"{num1}와 {num2}의 최대공약수(GCD)는 얼마인가요?",
+                "options": {chr(65 + i): str(option) for i, option in enumerate(options)},
+                "answer": chr(65 + position),
+                "explanation": f"{num1}과 {num2}의 공약수를 구하고, 그 중 가장 큰 수를 찾습니다.\n"
+                             f"정답은 {correct_gcd}입니다."
+            })
+        return problems
+
     def generate_similar_problem(self, original_problem: Dict, variation_type: str = 'numbers') -> Dict:
         """기존 문제와 유사한 새로운 문제 생성"""
         # 원본 문제에서 숫자 추출
@@ -0,0 +1,62 @@
+"""
+최소공배수(LCM) 문제 생성을 위한 템플릿 모듈
+"""
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..distractors import build_option_sets, generate_distractors
+from ..number_tables import get_number_tables
+
+# 템플릿 레지스트리가 모듈을 가져오지 않고 읽는 담당 개념 (지식 맵 개념 이름)
+CONCEPTS = ('최소공배수', 'Least Common Multiple')
+
+# 두 수의 곱을 최소공배수로 착각하는 경우가 'wrong_operation'에 포함됨
+LCM_RULES = ('wrong_operation', 'off_by_one', 'place_value')
+
+class LCMProblemTemplate:
+    def __init__(self):
+        # 난이도별 숫자 범위 정의 (최소공배수가 너무 커지지 않도록 GCD보다 좁게)
+        self.difficulty_ranges = {
+            'easy': (2, 12),
+            'medium': (4, 30),
+            'hard': (10, 60)
+        }
+
+    def generate_problems(self, difficulty: str, n: int,
+                          rng: Optional[np.random.Generator] = None) -> List[Dict]:
+        """
+        주어진 난이도의 LCM 문제 n개를 한 번에 생성
+        - 서로소가 아닌 수 쌍을 정수론 표에서 추출하여 곱과 최소공배수가 다르도록 함
+        Args:
+            difficulty: 문제 난이도 ('easy', 'medium', 'hard')
+            n: 생성할 문제 수
+            rng: 난수 생성기
+        Returns:
+            question/options/answer/explanation 형식의 문제 목록
+        """
+        rng = rng or np.random.default_rng()
+        min_val, max_val = self.difficulty_ranges[difficulty]
+        pairs = get_number_tables(max_val).sample_common_factor_pairs(
+            min_val, max_val, n, rng
+        )
+        lcms = np.lcm(pairs[:, 0], pairs[:, 1])
+        wrong_answers = generate_distractors(lcms, pairs, rules=LCM_RULES, min_value=1, rng=rng)
+        option_sets, positions = build_option_sets(lcms, wrong_answers, rng)
+
+        problems = []
+        for (num1, num2), correct_lcm, options, position in zip(
+            pairs.tolist(), lcms.tolist(), option_sets.tolist(), positions.tolist()
+        ):
+            problems.append({
+                "question": f"{num1}와 {num2}의 최소공배수(LCM)는 얼마인가요?",
+                "options": {chr(65 + i): str(option) for i, option in enumerate(options)},
+                "answer": chr(65 + position),
+                "explanation": f"{num1}과 {num2}의 공배수 중 가장 작은 수를 찾습니다.\n"
+                             f"정답은 {correct_lcm}입니다."
+            })
+        return problems
+
+    def generate_problem(self, difficulty: str) -> Dict:
+        """주어진 난이도에 따른 LCM 문제 생성"""
+        return self.generate_problems(difficulty, 1)[0]
@@ -0,0 +1,147 @@
+"""(개념, 난이도) 색인 모듈
+
+문제 목록을 로드할 때 한 번만 정규화된 (개념, 난이도) 키로 묶어
+후보 문제 행 번호 배열을 O(1)에 조회할 수 있도록 합니다.
+"""
+
+import random
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+Key = Tuple[str, str]
+
+
+def normalize_key(concept: str, difficulty: str) -> Key:
+    """개념과 난이도를 색인 키로 정규화"""
+    return str(concept).strip().lower(), str(difficulty).strip().lower()
+
+
+class ConceptIndex:
+    def __init__(self):
+        """(개념, 난이도) → 문제 행 번호 색인 초기화"""
+        self._buffers: Dict[Key, np.ndarray] = {}
+        self._sizes: Dict[Key, int] = {}
+
+    @classmethod
+    def build(cls, problems: Iterable[dict]) -> "ConceptIndex":
+        """
+        문제 목록으로 색인 생성
+        Args:
+            problems (Iterable[dict]): 행 순서대로 정렬된 문제 목록
+        Returns:
+            ConceptIndex: 생성된 색인
+        """
+        grouped: Dict[Key, List[int]] = {}
+        for row, problem in enumerate(problems):
+            key = normalize_key(
+                problem.get("concept", ""), problem.get("difficulty", "")
+            )
+            grouped.setdefault(key, []).append(row)
+
+        index = cls()
+        for key, rows in grouped.items():
+            index._buffers[key] = np.asarray(rows, dtype=np.int64)
+            index._sizes[key] = len(rows)
+        return index
+
+    def copy(self) -> "ConceptIndex":
+        """버퍼까지 복사한 색인 (복사본에 추가/삭제해도 원본은 바뀌지 않음)"""
+        index = ConceptIndex()
+        index._buffers = {key: buffer.copy() for key, buffer in self._buffers.items()}
+        index._sizes = dict(self._sizes)
+        return index
+
+    def __len__(self) -> int:
+        return sum(self._sizes.values())
+
+    def keys(self) -> List[Key]:
+        return list(self._sizes)
+
+    def add(self, row: int, concept: str, difficulty: str) -> None:
+        """
+        새 문제 행을 색인에 추가 (버퍼가 가득 차면 두 배로 확장)
+        Args:
+            row (int): 문제 행 번호
+            concept (str): 수학 개념
+            difficulty (str): 난이도
+        """
+        key = normalize_key(concept, difficulty)
+        size = self._sizes.get(key, 0)
+        buffer = self._buffers.get(key)
+        if buffer is None or size == len(buffer):
+            grown = np.empty(max(8, 2 * size), dtype=np.int64)
+            if size:
+                grown[:size] = buffer[:size]
+            buffer = self._buffers[key] = grown
+        buffer[size] = row
+        self._sizes[key] = size + 1
+
+    def remove(self, row: int, concept: str, difficulty: str) -> bool:
+        """
+        문제 행을 색인에서 제거 (마지막 원소와 자리를 바꿔 O(1)에 제거, 순서는 유지하지 않음)
+        Returns:
+            bool: 제거 여부
+        """
+        key = normalize_key(concept, difficulty)
+        size = self._sizes.get(key, 0)
+        if not size:
+            return False
+        buffer = self._buffers[key]
+        positions = np.flatnonzero(buffer[:size] == row)
+        if not len(positions):
+            return False
+        buffer[positions[0]] = buffer[size - 1]
+        self._sizes[key] = size - 1
+        return True
+
+    def candidates(self, concept: str, difficulty: str) -> np.ndarray:
+        """
+        (개념, 난이도)에 해당하는 문제 행 번호 배열 (복사하지 않은 읽기 전용 뷰)
+        """
+        key = normalize_key(concept, difficulty)
+        size = self._sizes.get(key, 0)
+        if not size:
+            return np.empty(0, dtype=np.int64)
+        view = self._buffers[key][:size]
+        view.flags.writeable = False
+        return view
+
+    def difficulty_candidates(self, difficulty: str) -> np.ndarray:
+        """난이도만 일치하는 모든 문제 행 번호 (개념 수만큼의 배열을 이어 붙임)"""
+        _, difficulty_key = normalize_key("", difficulty)
+        parts = [
+            self._buffers[key][:size]
+            for key, size in self._sizes.items()
+            if key[1] == difficulty_key and size
+        ]
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate(parts))
+
+    def count(self, concept: str, difficulty: str) -> int:
+        return self._sizes.get(normalize_key(concept, difficulty), 0)
+
+    def sample(
+        self,
+        concept: str,
+        difficulty: str,
+        k: int,
+        rng: Optional[random.Random] = None,
+    ) -> np.ndarray:
+        """
+        후보 목록을 복사하지 않고 k개의 행 번호를 비복원 추출
+        Args:
+            concept (str): 수학 개념
+            difficulty (str): 난이도
+            k (int): 추출할 개수
+            rng (Optional[random.Random]): 난수 생성기
+        Returns:
+            np.ndarray: 추출된 행 번호 (최대 k개)
+        """
+        candidates = self.candidates(concept, difficulty)
+        k = min(k, len(candidates))
+        if k <= 0:
+            return candidates[:0]
+        positions = (rng or random).sample(range(len(candidates)), k)
+        return candidates[positions]
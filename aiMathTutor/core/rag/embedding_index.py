@@ -0,0 +1,483 @@
+"""임베딩 인덱스 모듈
+
+문제 임베딩 벡터를 연속된 float32 행렬(vector_embeddings.bin)과
+ID/오프셋 테이블(vector_embeddings.json)로 디스크에 저장하고,
+numpy.memmap으로 로드합니다. 원본 데이터셋의 내용 해시가 바뀌면
+인덱스는 무효화되어 다시 생성됩니다.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .quantization import SCORE_CHUNK_ROWS, STORAGE_DTYPES, ScalarQuantizer
+
+logger = logging.getLogger(__name__)
+
+INDEX_FORMAT_VERSION = 1
+
+
+def compute_source_hash(source_file: str, *extra: str) -> str:
+    """원본 데이터셋 파일의 내용 해시를 계산합니다.
+
+    Args:
+        source_file (str): 해시를 계산할 파일 경로
+        *extra (str): 해시에 함께 포함할 값 (모델 이름 등)
+
+    Returns:
+        str: SHA-256 16진수 문자열
+    """
+    digest = hashlib.sha256()
+    with open(source_file, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    for value in extra:
+        digest.update(b"\0")
+        digest.update(str(value).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class EmbeddingIndexWriter:
+    def __init__(
+        self,
+        index: "EmbeddingIndex",
+        ids: List[str],
+        dim: int,
+        source_hash: str,
+        model_name: str,
+    ):
+        """임베딩 인덱스 작성기 초기화
+
+        임시 파일에 memmap 행렬을 미리 할당하고, commit 시점에
+        원자적으로 교체합니다.
+
+        Args:
+            index (EmbeddingIndex): 기록 대상 인덱스
+            ids (List[str]): 행 순서대로 정렬된 문제 ID 목록
+            dim (int): 임베딩 차원
+            source_hash (str): 원본 데이터셋 내용 해시
+            model_name (str): 임베딩 모델 이름
+        """
+        self.index = index
+        self.ids = list(ids)
+        self.dim = dim
+        self.source_hash = source_hash
+        self.model_name = model_name
+        self._id_to_row = {problem_id: row for row, problem_id in enumerate(self.ids)}
+        self._cursor = 0
+
+        os.makedirs(index.index_dir, exist_ok=True)
+        self._tmp_vectors_file = index.vectors_file + ".tmp"
+        if self.ids:
+            self._matrix = np.memmap(
+                self._tmp_vectors_file,
+                dtype=EmbeddingIndex.VECTOR_DTYPE,
+                mode="w+",
+                shape=(len(self.ids), dim),
+            )
+        else:
+            open(self._tmp_vectors_file, "wb").close()
+            self._matrix = None
+
+    def add_vectors(
+        self,
+        vectors: np.ndarray,
+        problems: Optional[List[dict]] = None,
+        rows: Optional[np.ndarray] = None,
+    ) -> None:
+        """벡터를 인덱스 행렬에 기록합니다.
+
+        행 위치는 rows, 문제 ID 순으로 결정되며 둘 다 없으면 순차적으로
+        기록합니다. 길이순으로 정렬된 배치도 원래 행 위치에 기록됩니다.
+
+        Args:
+            vectors (np.ndarray): (n, dim) 임베딩 행렬
+            problems (Optional[List[dict]]): 벡터에 대응하는 문제 목록
+            rows (Optional[np.ndarray]): 기록할 행 위치
+        """
+        vectors = np.asarray(vectors, dtype=EmbeddingIndex.VECTOR_DTYPE)
+        if vectors.ndim == 1:
+            vectors = vectors[np.newaxis, :]
+        if problems is not None and len(problems) != len(vectors):
+            raise ValueError("벡터 수와 문제 수가 일치하지 않습니다.")
+
+        if rows is None and problems is not None:
+            rows = np.fromiter(
+                (self._id_to_row[p["id"]] for p in problems),
+                dtype=np.int64,
+                count=len(problems),
+            )
+
+        if rows is None:
+            start = self._cursor
+            self._matrix[start : start + len(vectors)] = vectors
+            self._cursor += len(vectors)
+        else:
+            self._matrix[np.asarray(rows)] = vectors
+
+    def commit(self) -> None:
+        """기록한 행렬과 ID/오프셋 테이블을 확정하고 인덱스를 다시 엽니다."""
+        if self._matrix is not None:
+            self._matrix.flush()
+            self._matrix = None
+
+        row_bytes = self.dim * np.dtype(EmbeddingIndex.VECTOR_DTYPE).itemsize
+        meta = {
+            "version": INDEX_FORMAT_VERSION,
+            "model": self.model_name,
+            "dim": self.dim,
+            "count": len(self.ids),
+            "dtype": np.dtype(EmbeddingIndex.VECTOR_DTYPE).name,
+            "source_hash": self.source_hash,
+            "built_at": datetime.now().isoformat(),
+            "ids": self.ids,
+            "offsets": [row * row_bytes for row in range(len(self.ids))],
+        }
+
+        tmp_meta_file = self.index.meta_file + ".tmp"
+        with open(tmp_meta_file, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+        # 벡터 파일을 먼저 교체하고 메타 파일을 마지막에 교체해야
+        # 메타 파일이 가리키는 벡터가 항상 완성된 상태로 유지됩니다.
+        os.replace(self._tmp_vectors_file, self.index.vectors_file)
+        os.replace(tmp_meta_file, self.index.meta_file)
+        logger.info(f"임베딩 인덱스 {len(self.ids)}개를 저장했습니다.")
+
+        self.index.load(self.source_hash)
+
+
+class EmbeddingIndex:
+    VECTOR_DTYPE = np.float32
+
+    def __init__(
+        self, index_dir: str = "data/embeddings", name: str = "vector_embeddings"
+    ):
+        """디스크 기반 임베딩 인덱스 초기화
+
+        Args:
+            index_dir (str): 인덱스 파일 디렉토리
+            name (str): 인덱스 파일 이름 (확장자 제외)
+        """
+        self.index_dir = index_dir
+        self.name = name
+        self.vectors_file = os.path.join(index_dir, f"{name}.bin")
+        self.meta_file = os.path.join(index_dir, f"{name}.json")
+        self.meta: Dict = {}
+        self.vectors: Optional[np.ndarray] = None
+        self.ids: List[str] = []
+        self.id_to_row: Dict[str, int] = {}
+        self.tombstones: Set[int] = set()  # 삭제되었지만 아직 압축되지 않은 행
+        self._lock = threading.RLock()  # 추가/삭제/압축 직렬화
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.vectors is not None
+
+    @property
+    def count(self) -> int:
+        return len(self.ids)
+
+    @property
+    def dim(self) -> int:
+        return self.meta.get("dim", 0)
+
+    @property
+    def revision(self) -> int:
+        return self.meta.get("revision", 0)
+
+    @property
+    def tombstone_ratio(self) -> float:
+        return len(self.tombstones) / self.count if self.count else 0.0
+
+    @property
+    def row_bytes(self) -> int:
+        return self.dim * np.dtype(self.VECTOR_DTYPE).itemsize
+
+    def _read_meta(self) -> Optional[Dict]:
+        """ID/오프셋 테이블을 읽습니다."""
+        try:
+            with open(self.meta_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def stored_model_name(self) -> Optional[str]:
+        """디스크 인덱스를 만든 임베딩 모델 이름 (인덱스가 없으면 None)"""
+        meta = self._read_meta()
+        return meta.get("model") if meta else None
+
+    def is_valid(self, source_hash: str) -> bool:
+        """디스크 인덱스가 주어진 원본 해시와 일치하는지 확인합니다."""
+        meta = self._read_meta()
+        return bool(
+            meta
+            and meta.get("version") == INDEX_FORMAT_VERSION
+            and meta.get("source_hash") == source_hash
+            and os.path.exists(self.vectors_file)
+        )
+
+    def load(self, source_hash: Optional[str] = None) -> bool:
+        """인덱스를 memmap으로 엽니다.
+
+        Args:
+            source_hash (Optional[str]): 기대하는 원본 해시. 다르면 로드하지 않음
+
+        Returns:
+            bool: 로드 성공 여부
+        """
+        meta = self._read_meta()
+        if not meta or meta.get("version") != INDEX_FORMAT_VERSION:
+            return False
+        if source_hash is not None and meta.get("source_hash") != source_hash:
+            logger.info("원본 데이터셋이 변경되어 임베딩 인덱스를 무효화합니다.")
+            return False
+
+        count, dim = meta["count"], meta["dim"]
+        expected_bytes = count * dim * np.dtype(self.VECTOR_DTYPE).itemsize
+        try:
+            if os.path.getsize(self.vectors_file) != expected_bytes:
+                logger.warning("임베딩 인덱스 파일 크기가 올바르지 않습니다.")
+                return False
+        except OSError:
+            return False
+
+        with self._lock:
+            self._open(meta)
+        return True
+
+    def _open(self, meta: Dict) -> None:
+        """메타 정보에 맞게 벡터 파일을 memmap으로 다시 엽니다."""
+        count, dim = meta["count"], meta["dim"]
+        if count:
+            self.vectors = np.memmap(
+                self.vectors_file,
+                dtype=self.VECTOR_DTYPE,
+                mode="r",
+                shape=(count, dim),
+            )
+        else:
+            # 빈 파일은 mmap 할 수 없으므로 빈 행렬로 대체
+            self.vectors = np.empty((0, dim), dtype=self.VECTOR_DTYPE)
+
+        self.meta = meta
+        self.ids = meta["ids"]
+        self.id_to_row = {problem_id: row for row, problem_id in enumerate(self.ids)}
+        self.tombstones = set(meta.get("tombstones", []))
+
+    def _write_meta(self, meta: Dict) -> None:
+        tmp_meta_file = self.meta_file + ".tmp"
+        with open(tmp_meta_file, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_meta_file, self.meta_file)
+
+    def append(self, ids: List[str], vectors: np.ndarray) -> None:
+        """새 문제 벡터를 파일 끝에 추가합니다.
+
+        Args:
+            ids (List[str]): 추가할 문제 ID 목록
+            vectors (np.ndarray): (n, dim) 정규화된 임베딩 행렬
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=self.VECTOR_DTYPE)
+        if vectors.ndim == 1:
+            vectors = vectors[np.newaxis, :]
+        if len(ids) != len(vectors) or vectors.shape[1] != self.dim:
+            raise ValueError("추가할 벡터의 크기가 올바르지 않습니다.")
+
+        with self._lock:
+            start = self.count
+            with open(self.vectors_file, "ab") as f:
+                f.write(vectors.tobytes())
+
+            meta = dict(self.meta)
+            meta["ids"] = self.ids + list(ids)
+            meta["offsets"] = self.meta.get("offsets", []) + [
+                (start + i) * self.row_bytes for i in range(len(ids))
+            ]
+            meta["count"] = len(meta["ids"])
+            meta["revision"] = self.revision + 1
+            self._write_meta(meta)
+            self._open(meta)
+
+    def delete(self, ids: List[str]) -> List[int]:
+        """문제 ID의 현재 행을 삭제 표시(tombstone)합니다.
+
+        실제 제거는 compact에서 수행합니다.
+
+        Returns:
+            List[int]: 삭제 표시된 행 번호 목록
+        """
+        with self._lock:
+            rows = [self.id_to_row[i] for i in ids if i in self.id_to_row]
+            tombstones = self.tombstones | set(rows)
+            if tombstones == self.tombstones:
+                return rows
+            meta = dict(self.meta)
+            meta["tombstones"] = sorted(tombstones)
+            meta["revision"] = self.revision + 1
+            self._write_meta(meta)
+            self.meta = meta
+            self.tombstones = tombstones
+            return rows
+
+    def compact(self, chunk_rows: int = SCORE_CHUNK_ROWS) -> List[str]:
+        """삭제 표시된 행을 제거한 새 파일로 원자적으로 교체합니다.
+
+        Returns:
+            List[str]: 압축 후 남은 문제 ID 목록 (행 순서)
+        """
+        with self._lock:
+            return self.install_compacted(self.write_compacted(chunk_rows))
+
+    def write_compacted(self, chunk_rows: int = SCORE_CHUNK_ROWS) -> Dict:
+        """현재 상태에서 삭제 표시된 행을 뺀 임시 벡터 파일을 기록합니다.
+
+        인덱스 상태는 바꾸지 않으므로 호출하는 쪽의 잠금 밖에서 실행할 수
+        있습니다. install_compacted로 교체합니다.
+
+        Returns:
+            Dict: 압축 계획 (임시 파일, 남은 ID, 기준 리비전)
+        """
+        with self._lock:
+            vectors, ids, tombstones = self.vectors, self.ids, set(self.tombstones)
+            revision = self.revision
+        live_rows = np.asarray(
+            [row for row in range(len(ids)) if row not in tombstones],
+            dtype=np.int64,
+        )
+
+        tmp_vectors_file = self.vectors_file + ".tmp"
+        with open(tmp_vectors_file, "wb") as f:
+            for start in range(0, len(live_rows), chunk_rows):
+                rows = live_rows[start : start + chunk_rows]
+                f.write(np.ascontiguousarray(vectors[rows]).tobytes())
+        return {
+            "vectors_file": tmp_vectors_file,
+            "ids": [ids[row] for row in live_rows],
+            "revision": revision,
+        }
+
+    def install_compacted(self, plan: Dict) -> Optional[List[str]]:
+        """write_compacted로 기록한 파일로 교체합니다.
+
+        계획을 만든 뒤 인덱스가 바뀌었으면 교체하지 않습니다.
+
+        Returns:
+            Optional[List[str]]: 압축 후 남은 문제 ID 목록 (교체하지 않았으면 None)
+        """
+        with self._lock:
+            if plan["revision"] != self.revision:
+                os.remove(plan["vectors_file"])
+                logger.info("압축 중 임베딩 인덱스가 바뀌어 압축을 미룹니다.")
+                return None
+            live_ids = plan["ids"]
+            meta = dict(self.meta)
+            meta["ids"] = live_ids
+            meta["offsets"] = [row * self.row_bytes for row in range(len(live_ids))]
+            meta["count"] = len(live_ids)
+            meta["tombstones"] = []
+            meta["revision"] = self.revision + 1
+
+            os.replace(plan["vectors_file"], self.vectors_file)
+            self._write_meta(meta)
+            self._open(meta)
+            logger.info(f"임베딩 인덱스를 압축했습니다. 남은 문제: {len(live_ids)}개")
+            return live_ids
+
+    def copy(self) -> "EmbeddingIndex":
+        """같은 파일을 여는 복사본
+
+        추가/삭제/압축은 ID 목록, 삭제 표시, memmap을 새로 만들어 교체하므로
+        복사본을 수정해도 원본이 보는 상태는 바뀌지 않습니다.
+        """
+        with self._lock:
+            index = copy.copy(self)
+        index._lock = threading.RLock()
+        return index
+
+    def create_writer(
+        self, ids: List[str], dim: int, source_hash: str, model_name: str
+    ) -> EmbeddingIndexWriter:
+        """새 인덱스를 기록할 작성기를 생성합니다."""
+        return EmbeddingIndexWriter(self, ids, dim, source_hash, model_name)
+
+    def get_vector(self, problem_id: str) -> Optional[np.ndarray]:
+        """문제 ID에 해당하는 벡터를 반환합니다."""
+        row = self.id_to_row.get(problem_id)
+        if row is None or row in self.tombstones or self.vectors is None:
+            return None
+        return self.vectors[row]
+
+    def load_quantized(self, mode: str) -> Tuple[np.ndarray, ScalarQuantizer]:
+        """압축된 행렬을 memmap으로 엽니다. 없거나 오래되었으면 청크 단위로 생성합니다.
+
+        Args:
+            mode (str): 'float16' 또는 'int8'
+
+        Returns:
+            Tuple[np.ndarray, ScalarQuantizer]: (n, dim) 압축 행렬과 양자화기
+        """
+        if self.vectors is None:
+            raise ValueError("임베딩 인덱스가 로드되지 않았습니다.")
+
+        codes_file = os.path.join(self.index_dir, f"{self.name}.{mode}.bin")
+        codes_meta_file = os.path.join(self.index_dir, f"{self.name}.{mode}.json")
+        dtype = STORAGE_DTYPES[mode]
+        shape = (self.count, self.dim)
+
+        try:
+            with open(codes_meta_file, "r", encoding="utf-8") as f:
+                codes_meta = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            codes_meta = {}
+
+        if (
+            self.count
+            and codes_meta.get("source_hash") == self.meta.get("source_hash")
+            and codes_meta.get("count") == self.count
+            and codes_meta.get("revision", 0) == self.revision
+            and os.path.exists(codes_file)
+        ):
+            quantizer = ScalarQuantizer(mode, codes_meta.get("scale"))
+            return np.memmap(codes_file, dtype=dtype, mode="r", shape=shape), quantizer
+
+        quantizer = ScalarQuantizer(mode)
+        quantizer.fit(self.vectors)
+        if not self.count:
+            return np.empty(shape, dtype=dtype), quantizer
+
+        tmp_codes_file = codes_file + ".tmp"
+        codes = np.memmap(tmp_codes_file, dtype=dtype, mode="w+", shape=shape)
+        for start in range(0, self.count, SCORE_CHUNK_ROWS):
+            codes[start : start + SCORE_CHUNK_ROWS] = quantizer.encode(
+                self.vectors[start : start + SCORE_CHUNK_ROWS]
+            )
+        codes.flush()
+        del codes
+
+        tmp_meta_file = codes_meta_file + ".tmp"
+        with open(tmp_meta_file, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "source_hash": self.meta.get("source_hash"),
+                    "count": self.count,
+                    "revision": self.revision,
+                    "mode": mode,
+                    "scale": (
+                        None if quantizer.scale is None else quantizer.scale.tolist()
+                    ),
+                },
+                f,
+            )
+        os.replace(tmp_codes_file, codes_file)
+        os.replace(tmp_meta_file, codes_meta_file)
+        logger.info(f"{mode} 압축 임베딩 {self.count}개를 저장했습니다.")
+
+        return np.memmap(codes_file, dtype=dtype, mode="r", shape=shape), quantizer
@@ -1,16 +1,192 @@
-from sentence_transformers import SentenceTransformer
+import logging
+import os
+import threading
 import numpy as np
-from typing import List
+from typing import Iterator, List, Optional, Tuple, Union
+from .model_registry import ModelRegistry
+
+logger = logging.getLogger(__name__)
+
+# auto: 문장 임베딩 모델을 먼저 시도하고, 로드할 수 없으면 해싱 임베딩 사용
+EMBEDDING_BACKENDS = ("auto", "sentence-transformers", "hashing")
+
+
+class HashingEmbeddingModel:
+    N_FEATURES = 1024
+    NGRAM_RANGE = (2, 4)
+
+    def __init__(self, n_features: int = N_FEATURES, ngram_range=NGRAM_RANGE):
+        """
+        문자 n-gram 해싱 임베딩 (모델 파일 없이 밀리초 단위로 시작)
+        - SentenceTransformer와 같은 encode / get_sentence_embedding_dimension 제공
+        - 같은 입력에는 프로세스와 관계없이 항상 같은 벡터 반환
+        Args:
+            n_features (int): 벡터 차원 (해시 버킷 수)
+            ngram_range (tuple): 문자 n-gram 길이 범위
+        """
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        self.n_features = n_features
+        self.ngram_range = tuple(ngram_range)
+        self.vectorizer = HashingVectorizer(
+            analyzer="char_wb",
+            ngram_range=self.ngram_range,
+            n_features=n_features,
+            alternate_sign=False,
+            norm="l2",
+        )
+
+    @property
+    def name(self) -> str:
+        return self.model_name(self.n_features, self.ngram_range)
+
+    @staticmethod
+    def model_name(n_features: int = N_FEATURES, ngram_range=NGRAM_RANGE) -> str:
+        """설정으로 정해지는 모델 이름 (벡터라이저를 만들지 않음)"""
+        low, high = ngram_range
+        return f"hashing-char{low}-{high}-{n_features}"
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.n_features
+
+    def encode_sparse(self, texts: List[str]):
+        """(n, n_features) 희소 행렬 (1단계 후보 필터링용, 밀집 변환 없음)"""
+        return self.vectorizer.transform(texts)
+
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = None,
+        normalize_embeddings: bool = True,
+        convert_to_numpy: bool = True,
+        show_progress_bar: bool = False,
+    ) -> np.ndarray:
+        """L2 정규화된 float32 밀집 벡터 (batch_size 등은 인터페이스 호환용)"""
+        single = isinstance(sentences, str)
+        matrix = self.encode_sparse([sentences] if single else list(sentences))
+        dense = matrix.toarray().astype(np.float32)
+        return dense[0] if single else dense
+
+
+_hashing_model = None
+_backend_lock = threading.Lock()
+_auto_backend = (
+    None  # auto 모드에서 결정된 백엔드 (프로세스 전역, 실패한 로드를 반복하지 않음)
+)
+
+
+def get_hashing_model() -> HashingEmbeddingModel:
+    """프로세스 전역 해싱 임베딩 모델"""
+    global _hashing_model
+    if _hashing_model is None:
+        with _backend_lock:
+            if _hashing_model is None:
+                _hashing_model = HashingEmbeddingModel()
+    return _hashing_model
 
 
 class ProblemEmbedding:
-    def __init__(self):
+    MODEL_NAME = "paraphrase-multilingual-mpnet-base-v2"
+    BATCH_SIZE = 64  # 모델 한 번의 forward에 넣을 문장 수
+    CHUNK_SIZE = 1024  # 저장소로 한 번에 흘려보낼 문제 수
+
+    def __init__(
+        self,
+        batch_size: int = BATCH_SIZE,
+        chunk_size: int = CHUNK_SIZE,
+        backend: Optional[str] = None,
+    ):
         """
         문제 임베딩을 위한 클래스 초기화
-        - model: 다국어 지원 문장 임베딩 모델
+        - model: 다국어 지원 문장 임베딩 모델 (처음 사용할 때 레지스트리에서 로드)
+        Args:
+            batch_size (int): 인코딩 배치 크기
+            chunk_size (int): 벡터 저장소에 한 번에 기록할 문제 수
+            backend (Optional[str]): 'auto', 'sentence-transformers', 'hashing'
+                (없으면 환경 변수 EMBEDDING_BACKEND, 기본값 auto)
         """
-        self.model = SentenceTransformer("paraphrase-multilingual-mpnet-base-v2")
+        self.backend = backend or os.getenv("EMBEDDING_BACKEND", "auto")
+        if self.backend not in EMBEDDING_BACKENDS:
+            raise ValueError(f"지원하지 않는 임베딩 백엔드입니다: {self.backend}")
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
         self.vector_store = None  # VectorStore 초기화는 별도로 진행
+        self._adopted_backend = None  # auto 모드에서 디스크 인덱스를 따라 고른 백엔드
+
+    def resolve_backend(self) -> str:
+        """
+        실제로 사용할 백엔드 결정
+        - auto 모드는 처음 한 번 문장 임베딩 모델 로드를 시도하고 결과를 프로세스 전역에 기록
+        """
+        global _auto_backend
+        if self.backend != "auto":
+            return self.backend
+        if self._adopted_backend is not None:
+            return self._adopted_backend
+        if _auto_backend is None:
+            with _backend_lock:
+                if _auto_backend is None:
+                    try:
+                        ModelRegistry().get_model(self.MODEL_NAME)
+                        _auto_backend = "sentence-transformers"
+                    except Exception as e:
+                        logger.warning(
+                            f"문장 임베딩 모델을 불러올 수 없어 해싱 임베딩을 사용합니다: {str(e)}"
+                        )
+                        _auto_backend = "hashing"
+        return _auto_backend
+
+    def _backend_model_name(self, backend: str) -> str:
+        if backend == "hashing":
+            return HashingEmbeddingModel.model_name()
+        return self.MODEL_NAME
+
+    @property
+    def model_name(self) -> str:
+        """임베딩 인덱스 무효화에 쓰이는 백엔드별 모델 이름 (auto 모드는 모델 로드)"""
+        return self._backend_model_name(self.resolve_backend())
+
+    def candidate_model_names(self) -> List[str]:
+        """
+        모델을 로드하지 않고 알 수 있는 모델 이름 후보
+        - auto 모드에서 백엔드가 아직 정해지지 않았으면 두 백엔드의 이름 모두
+        """
+        backend = self.backend
+        if backend == "auto":
+            backend = self._adopted_backend or _auto_backend
+        if backend is None:
+            return [self.MODEL_NAME, HashingEmbeddingModel.model_name()]
+        return [self._backend_model_name(backend)]
+
+    def adopt_model_name(self, model_name: str) -> bool:
+        """
+        디스크 인덱스를 만든 모델 이름으로 auto 백엔드를 정함 (모델은 인코딩할 때 로드)
+        Args:
+            model_name (str): 인덱스 메타에 기록된 모델 이름
+        Returns:
+            bool: 이 설정에서 쓸 수 있는 이름이면 True
+        """
+        if model_name not in self.candidate_model_names():
+            return False
+        if self.backend == "auto":
+            self._adopted_backend = (
+                "hashing"
+                if model_name == HashingEmbeddingModel.model_name()
+                else "sentence-transformers"
+            )
+        return True
+
+    @property
+    def model(self):
+        """프로세스 전역에서 공유되는 임베딩 모델"""
+        if self.resolve_backend() == "hashing":
+            return get_hashing_model()
+        return ModelRegistry().get_model(self.MODEL_NAME)
+
+    @property
+    def dimension(self) -> int:
+        """임베딩 벡터 차원"""
+        return self.model.get_sentence_embedding_dimension()
 
     def create_embedding(self, problem_text: str) -> np.ndarray:
         """
@@ -22,14 +198,52 @@ class ProblemEmbedding:
         """
         return self.model.encode(problem_text, normalize_embeddings=True)
 
-    def batch_embed_problems(self, problems: List[dict]) -> None:
+    def iter_batch_embeddings(
+        self, texts: List[str], batch_size: int = None, chunk_size: int = None
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        텍스트를 길이순으로 정렬한 뒤 청크 단위로 임베딩
+        - 비슷한 길이의 문장끼리 배치를 구성하여 패딩을 최소화
+        Args:
+            texts (List[str]): 임베딩할 텍스트 목록
+            batch_size (int): 인코딩 배치 크기
+            chunk_size (int): 한 번에 반환할 텍스트 수
+        Yields:
+            Tuple[np.ndarray, np.ndarray]: (원본 위치 배열, (n, dim) 임베딩 행렬)
+        """
+        batch_size = batch_size or self.batch_size
+        chunk_size = max(chunk_size or self.chunk_size, batch_size)
+
+        lengths = np.fromiter((len(t) for t in texts), dtype=np.int64, count=len(texts))
+        order = np.argsort(-lengths, kind="stable")
+
+        for start in range(0, len(order), chunk_size):
+            positions = order[start : start + chunk_size]
+            embeddings = self.model.encode(
+                [texts[i] for i in positions],
+                batch_size=batch_size,
+                normalize_embeddings=True,
+                convert_to_numpy=True,
+                show_progress_bar=False,
+            )
+            yield positions, embeddings.astype(np.float32, copy=False)
+
+    def batch_embed_problems(
+        self, problems: List[dict], batch_size: int = None, chunk_size: int = None
+    ) -> None:
         """
         여러 문제를 일괄적으로 임베딩하여 저장
+        - 청크마다 벡터 저장소로 바로 흘려보내므로 전체 벡터 목록을 만들지 않음
         Args:
             problems (List[dict]): 임베딩할 문제 목록
+            batch_size (int): 인코딩 배치 크기
+            chunk_size (int): 벡터 저장소에 한 번에 기록할 문제 수
         """
-        if not self.vector_store:
+        if self.vector_store is None:
             raise ValueError("벡터 저장소가 초기화되지 않았습니다.")
 
-        embeddings = [self.create_embedding(p["text"]) for p in problems]
-        self.vector_store.add_vectors(embeddings, problems)
+        texts = [p["text"] for p in problems]
+        for positions, embeddings in self.iter_batch_embeddings(
+            texts, batch_size, chunk_size
+        ):
+            self.vector_store.add_vectors(embeddings, [problems[i] for i in positions])
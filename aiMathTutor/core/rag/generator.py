@@ -1,28 +1,306 @@
-import json
+import copy
+import hashlib
+import logging
 import random
+import threading
 import uuid
-from typing import List, Dict
+import numpy as np
+from typing import Iterable, List, Dict, Optional, Set, Tuple
+from core.hot_reload import Snapshot, SnapshotWatcher
+from core.knowledge.concept_aliases import get_concept_aliases
+from core.problem.distractors import build_option_sets, generate_distractors
+from .concept_index import ConceptIndex
 from .embeddings import ProblemEmbedding
+from .embedding_index import EmbeddingIndex
+from .hybrid_retriever import HybridRetriever
+from .problem_pack import DEFAULT_DIFFICULTY, ProblemRow, load_problem_pack
+from .problem_templates import TemplateLibrary
+from .vector_store import (
+    NumpyVectorStore,
+    QuantizedVectorStore,
+    create_vector_store,
+)
+
+logger = logging.getLogger(__name__)
+
+PROBLEM_BANK_FILE = "data/problems/fifth_grade_problems_all_english_v2.json"
+PROBLEM_BANK_FILES = (PROBLEM_BANK_FILE, "data/problems/problem_bank.json")
+PACK_FILE = "data/packs/problem_bank.pack"  # PROBLEM_BANK_FILES에서 자동 생성
+TEMPLATE_CACHE_FILE = "data/packs/problem_templates.json"  # 팩에서 자동 생성
+QUIZ_PROBLEM_COUNT = 45
 
 
 class ProblemGenerator:
     def __init__(self):
         """RAG 기반 문제 생성기 초기화"""
-        self.embedding_model = ProblemEmbedding()
+        self.embedding_model = ProblemEmbedding()  # 모델은 실제 인코딩 시점에 로드
+        self.embedding_index = EmbeddingIndex()
+        self.vector_store = None
+        self.hybrid_retriever = None
+        self.template_library = None
+        self._rng = np.random.default_rng()
+        self._index_checked = False
+        self._lock = threading.RLock()  # 증분 갱신/압축 중 검색이 섞이지 않도록
+        self.retired = False  # 다음 버전이 게시되면 True (인덱스 파일은 최신만 씀)
         self.load_problem_database()
         self.current_difficulty = "중"
 
     def load_problem_database(self):
-        """문제 데이터베이스 로드"""
+        """문제 데이터베이스 로드 (컴파일된 컬럼형 팩을 memmap으로 열기)"""
+        self.problem_pack = load_problem_pack(PROBLEM_BANK_FILES, PACK_FILE)
+        # 필드는 접근할 때 디코딩되는 지연 뷰
+        self.problems = self.problem_pack.rows() if self.problem_pack else []
+
+        # 요청마다 전체를 훑지 않도록 (개념, 난이도) 색인을 한 번만 생성
+        self.concept_index = ConceptIndex.build(self.problems)
+        self._row_by_id = {p.get("id"): row for row, p in enumerate(self.problems)}
+        self._deleted_rows: Set[int] = set()  # 압축 전까지 검색에서 제외할 행
+
+    def _ensure_embedding_index(self) -> bool:
+        """디스크 임베딩 인덱스를 열고, 없거나 오래된 경우에만 새로 생성
+
+        Returns:
+            bool: 인덱스 사용 가능 여부
+        """
+        if self._index_checked:
+            return self.embedding_index.is_loaded
+        self._index_checked = True
+
+        if self.problem_pack is None:
+            return False
+        # 디스크 인덱스를 만든 모델이 현재 설정에서 쓸 수 있으면 모델을 로드하지
+        # 않고 그 이름으로 확인 (모델은 실제로 인코딩할 때 로드)
+        stored_model = self.embedding_index.stored_model_name()
+        if stored_model in self.embedding_model.candidate_model_names():
+            if self.embedding_index.load(self._index_source_hash(stored_model)):
+                self.embedding_model.adopt_model_name(stored_model)
+                return True
+
+        source_hash = self._index_source_hash(self.embedding_model.model_name)
+        if self.embedding_index.load(source_hash):
+            return True
+
+        try:
+            writer = self.embedding_index.create_writer(
+                [p["id"] for p in self.problems],
+                self.embedding_model.dimension,
+                source_hash,
+                self.embedding_model.model_name,
+            )
+            self.embedding_model.vector_store = writer
+            self.embedding_model.batch_embed_problems(self.problems)
+            writer.commit()
+        except Exception as e:
+            logger.warning(f"임베딩 인덱스 생성 실패: {str(e)}")
+            return False
+        return self.embedding_index.is_loaded
+
+    def _index_source_hash(self, model_name: str) -> str:
+        """팩에 기록된 원본 해시와 모델 이름으로 인덱스 해시 계산 (원본 파일은 다시 읽지 않음)"""
+        return hashlib.sha256(
+            f"{self.problem_pack.source_hash}\0{model_name}".encode("utf-8")
+        ).hexdigest()
+
+    def _ensure_vector_store(self) -> bool:
+        """임베딩 인덱스를 검색용 벡터 저장소로 감싸기"""
+        if self.vector_store is not None:
+            return True
+        if self.retired:
+            # 교체된 생성기는 인덱스 파일을 쓰지 않음 (어휘 검색/표본 추출로 대체)
+            return False
+        if not self._ensure_embedding_index():
+            return False
+
+        # 저장소 행 번호 = 인덱스 행 번호. 인덱스에만 남은 문제는 삭제 표시
+        index = self.embedding_index
+        problems_by_id = {p["id"]: p for p in self._live_problems()}
+        stale_ids = [i for i in index.ids if i not in problems_by_id]
+        if stale_ids:
+            index.delete(stale_ids)
+        problems = [problems_by_id.get(i, {"id": i}) for i in index.ids]
+
+        store = create_vector_store(index.dim, size_hint=index.count)
+        if isinstance(store, QuantizedVectorStore):
+            # 압축 행렬로 검색하고 memmap 원본으로 재점수화
+            codes, quantizer = index.load_quantized(store.storage)
+            store = QuantizedVectorStore.from_matrix(
+                index.vectors,
+                problems,
+                store.storage,
+                store.rescore_factor,
+                quantizer=quantizer,
+                codes=codes,
+            )
+        elif isinstance(store, NumpyVectorStore):
+            # memmap 행렬을 복사 없이 그대로 사용
+            store = NumpyVectorStore.from_matrix(index.vectors, problems)
+        else:
+            store.add_vectors(index.vectors, problems)
+        store.remove(index.tombstones)
+        self.vector_store = store
+
+        # 인덱스 생성 이후 추가되었거나, 행이 삭제 표시된 뒤 다시 살아난 문제만
+        # 임베딩 (다른 생성기가 같은 인덱스에서 stale로 지운 저장소 문제 등)
+        self._append_embeddings(
+            [
+                p
+                for i, p in problems_by_id.items()
+                if i not in index.id_to_row or index.id_to_row[i] in index.tombstones
+            ]
+        )
+        return True
+
+    def _live_problems(self) -> List[Dict]:
+        return [
+            p for row, p in enumerate(self.problems) if row not in self._deleted_rows
+        ]
+
+    def _append_embeddings(self, problems: List[Dict]) -> None:
+        """새 문제를 임베딩하여 디스크 인덱스와 벡터 저장소 끝에 추가"""
+        self._append_vectors(problems, self._embed_problems(problems))
+
+    def _embed_problems(self, problems: List[Dict]) -> Optional[np.ndarray]:
+        """
+        문제를 입력 순서대로 임베딩 (실패하면 None)
+        - 길이순으로 묶어 인코딩한 결과를 원래 위치에 다시 배치하므로
+          i번째 벡터는 항상 i번째 문제의 벡터
+        """
+        if not problems:
+            return None
+        vectors = None
+        try:
+            for positions, embeddings in self.embedding_model.iter_batch_embeddings(
+                [p["text"] for p in problems]
+            ):
+                if vectors is None:
+                    vectors = np.empty(
+                        (len(problems), embeddings.shape[1]), dtype=np.float32
+                    )
+                vectors[positions] = embeddings
+        except Exception as e:
+            logger.warning(f"새 문제 임베딩 실패: {str(e)}")
+            return None
+        return vectors
+
+    def _append_vectors(
+        self, problems: List[Dict], vectors: Optional[np.ndarray]
+    ) -> None:
+        """임베딩한 문제를 문제 목록과 같은 순서로 인덱스와 벡터 저장소 끝에 추가"""
+        if not problems or vectors is None:
+            return
+        try:
+            self.embedding_index.append([p["id"] for p in problems], vectors)
+            if isinstance(self.vector_store, NumpyVectorStore):
+                # 추가된 memmap 행을 복사 없이 그대로 사용
+                self.vector_store.extend_from_matrix(
+                    self.embedding_index.vectors, problems
+                )
+            else:
+                self.vector_store.add_vectors(vectors, problems)
+        except Exception as e:
+            logger.warning(f"새 문제 임베딩 추가 실패: {str(e)}")
+
+    def _encode_queries(self, queries: List[str]) -> Optional[np.ndarray]:
+        """쿼리 목록을 한 번에 임베딩 (모델을 사용할 수 없으면 None)"""
         try:
-            with open(
-                "data/problems/fifth_grade_problems_all_english_v2.json",
-                "r",
-                encoding="utf-8",
-            ) as f:
-                self.problems = json.load(f)["problems"]
-        except FileNotFoundError:
-            self.problems = []
+            return self.embedding_model.model.encode(
+                queries,
+                batch_size=self.embedding_model.batch_size,
+                normalize_embeddings=True,
+                convert_to_numpy=True,
+                show_progress_bar=False,
+            )
+        except Exception as e:
+            logger.warning(f"쿼리 임베딩 실패, 어휘 검색만 사용합니다: {str(e)}")
+            return None
+
+    def _get_hybrid_retriever(self) -> HybridRetriever:
+        """어휘 + 임베딩 하이브리드 검색기 (처음 사용할 때 생성)"""
+        if self.hybrid_retriever is None:
+            dense_vectors, dense_mask = None, None
+            if self._ensure_vector_store():
+                dense_vectors, dense_mask = self._dense_vectors()
+            else:
+                logger.info("임베딩 인덱스를 사용할 수 없어 어휘 검색만 사용합니다.")
+            self.hybrid_retriever = HybridRetriever(
+                self.problems,
+                dense_vectors,
+                encode_queries=self._encode_queries,
+                dense_mask=dense_mask,
+            )
+        return self.hybrid_retriever
+
+    def _dense_vectors(self) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        문제 행 순서에 맞춘 임베딩 행렬과 벡터가 있는 행 표시
+        - 인덱스 행 순서가 문제 목록과 같으면 memmap을 복사 없이 사용하고,
+          다르면 ID로 인덱스 행을 찾아 모음 (없거나 삭제 표시된 행은 제외)
+        Returns:
+            Tuple[Optional[np.ndarray], Optional[np.ndarray]]: (n, dim) 행렬과
+                (n,) 표시 (모든 행에 벡터가 있으면 None)
+        """
+        index = self.embedding_index
+        ids = [p["id"] for p in self.problems]
+        if index.ids == ids:
+            vectors = index.vectors
+            rows = np.arange(len(ids), dtype=np.int64)
+        else:
+            rows = np.fromiter(
+                (index.id_to_row.get(i, -1) for i in ids),
+                dtype=np.int64,
+                count=len(ids),
+            )
+            vectors = None
+        mask = rows >= 0
+        if index.tombstones:
+            mask &= ~np.isin(rows, np.fromiter(index.tombstones, dtype=np.int64))
+        if not mask.any():
+            logger.info("문제와 맞는 임베딩이 없어 어휘 검색만 사용합니다.")
+            return None, None
+        if vectors is None:
+            vectors = np.zeros((len(ids), index.dim), dtype=np.float32)
+            vectors[mask] = index.vectors[rows[mask]]
+        if mask.all():
+            return vectors, None
+        missing = ~mask
+        if self._deleted_rows:
+            missing[list(self._deleted_rows)] = False  # 삭제된 문제는 검색 대상이 아님
+        if missing.any():
+            logger.info(
+                f"임베딩이 없는 문제 {int(missing.sum())}개는 어휘 점수만 사용합니다."
+            )
+        return vectors, mask
+
+    def retrieve_problems(
+        self, queries: List[str], top_k: int = 3, difficulty: Optional[str] = None
+    ) -> List[List[Dict]]:
+        """
+        여러 쿼리에 대한 문제를 하이브리드 검색으로 한 번에 조회
+        Args:
+            queries (List[str]): 개념 이름이나 문제 문장 목록 (예: 퀴즈 전체 문제)
+            top_k (int): 쿼리당 반환할 문제 수
+            difficulty (Optional[str]): 지정 시 해당 난이도의 문제로 제한
+        Returns:
+            List[List[Dict]]: 쿼리별 문제 목록
+        """
+        with self._lock:
+            candidate_rows = (
+                None
+                if difficulty is None
+                else self.concept_index.difficulty_candidates(difficulty)
+            )
+            if candidate_rows is None and self._deleted_rows:
+                candidate_rows = np.setdiff1d(
+                    np.arange(len(self.problems)),
+                    np.fromiter(self._deleted_rows, dtype=np.int64),
+                )
+            if candidate_rows is not None and not len(candidate_rows):
+                return [[] for _ in queries]
+
+            results = self._get_hybrid_retriever().retrieve(
+                queries, top_k, candidate_rows=candidate_rows
+            )
+            return [[self.problems[row] for row, _ in hits] for hits in results]
 
     def find_similar_problems(
         self, concept: str, difficulty: str, top_k: int = 3
@@ -36,59 +314,288 @@ class ProblemGenerator:
         Returns:
             List[Dict]: 유사 문제 목록
         """
-        filtered_problems = [
-            p
-            for p in self.problems
-            if p["concept"].lower() == concept.lower()
-            and p["difficulty"].lower() == difficulty.lower()
+        with self._lock:
+            concept = self._bank_concept(concept, difficulty)
+            candidates = self.concept_index.candidates(concept, difficulty)
+
+            if not len(candidates):
+                # 개념 이름이 정확히 일치하지 않으면 하이브리드 검색으로 대체
+                return self.retrieve_problems([concept], top_k, difficulty)[0]
+
+            if len(candidates) > top_k and self._ensure_vector_store():
+                # 임의의 기준 문제와 임베딩이 가까운 순으로 선택
+                anchor = self.problems[candidates[random.randrange(len(candidates))]]
+                query = self.embedding_index.get_vector(anchor["id"])
+                if query is not None:
+                    results = self.vector_store.search(
+                        query,
+                        top_k,
+                        filter_params={"concept": concept, "difficulty": difficulty},
+                    )[0]
+                    if results:
+                        return [problem for problem, _ in results]
+
+            rows = self.concept_index.sample(concept, difficulty, top_k)
+            return [self.problems[row] for row in rows]
+
+    def _bank_concept(self, concept: str, difficulty: str) -> str:
+        """
+        개념 ID나 한국어 이름을 문제 은행의 영어 개념 이름으로 변환
+        - 별칭 표에서 후보 문제가 있는 개념 중 하나를 고르고, 없으면 그대로 반환
+        """
+        if len(self.concept_index.candidates(concept, difficulty)):
+            return concept
+        names = [
+            name
+            for name in get_concept_aliases().dataset_concepts(concept)
+            if len(self.concept_index.candidates(name, difficulty))
         ]
+        return random.choice(names) if names else concept
+
+    def copy(self) -> "ProblemGenerator":
+        """
+        변경을 적용할 다음 생성기 (게시된 생성기는 수정하지 않고 복사본을 수정)
+        - 문제 팩, 임베딩 모델, 템플릿 모음은 공유하고 문제 목록과 색인만 복사
+        - 벡터 저장소가 아직 없으면 임베딩 인덱스도 복사하지 않고 필요할 때 다시 열기
+        """
+        with self._lock:
+            generator = copy.copy(self)
+            generator._lock = threading.RLock()
+            generator._rng = np.random.default_rng()
+            generator.problems = list(self.problems)
+            generator.concept_index = self.concept_index.copy()
+            generator._row_by_id = dict(self._row_by_id)
+            generator._deleted_rows = set(self._deleted_rows)
+            if self.vector_store is not None:
+                generator.embedding_index = self.embedding_index.copy()
+                generator.vector_store = self.vector_store.copy()
+            else:
+                generator.embedding_index = EmbeddingIndex(
+                    self.embedding_index.index_dir, self.embedding_index.name
+                )
+                generator._index_checked = False
+        return generator
+
+    def added_problem_ids(self) -> List[str]:
+        """문제 은행 팩이 아니라 add_problems로 추가된 (문제 저장소의) 문제 ID"""
+        with self._lock:
+            return [
+                p["id"] for p in self._live_problems() if not isinstance(p, ProblemRow)
+            ]
+
+    def retire(self) -> None:
+        """다음 생성기가 게시될 때 호출 (진행 중인 인덱스 열기가 끝날 때까지 대기)"""
+        with self._lock:
+            self.retired = True
+
+    def add_problem(self, problem: Dict) -> None:
+        """
+        문제를 데이터베이스에 추가하고 (개념, 난이도) 색인을 갱신
+        Args:
+            problem (Dict): 추가할 문제
+        """
+        self.add_problems([problem])
+
+    def add_problems(self, problems: Iterable[Dict]) -> int:
+        """
+        여러 문제를 한 번에 추가하고 색인을 증분 갱신
+        - 벡터 저장소가 이미 열려 있으면 새 문제만 임베딩하여 인덱스 끝에 추가
+        - 이미 있는 ID의 문제는 무시
+        Args:
+            problems (Iterable[Dict]): 추가할 문제 (문제 저장소 형식의 question 필드도 허용)
+        Returns:
+            int: 실제로 추가된 문제 수
+        """
+        candidates = {}
+        for problem in problems:
+            problem = dict(problem)
+            problem.setdefault("id", str(uuid.uuid4()))
+            problem.setdefault("text", problem.get("question", ""))
+            problem.setdefault("difficulty", DEFAULT_DIFFICULTY)
+            candidates.setdefault(problem["id"], problem)
+
+        with self._lock:
+            new = [p for i, p in candidates.items() if i not in self._row_by_id]
+            embed = self.vector_store is not None
+        # 모델 인코딩은 잠금 밖에서 수행하여 검색 요청을 막지 않음
+        vectors = self._embed_problems(new) if embed else None
+
+        with self._lock:
+            keep = [i for i, p in enumerate(new) if p["id"] not in self._row_by_id]
+            added = [new[i] for i in keep]
+            for problem in added:
+                row = len(self.problems)
+                self.problems.append(problem)
+                self._row_by_id[problem["id"]] = row
+                self.concept_index.add(
+                    row, problem.get("concept", ""), problem["difficulty"]
+                )
+
+            if added:
+                self.hybrid_retriever = None  # 다음 검색 시 다시 생성
+                if self.vector_store is not None:
+                    if vectors is None and not embed:
+                        # 인코딩하는 동안 벡터 저장소가 열린 경우
+                        vectors = self._embed_problems(added)
+                    elif vectors is not None:
+                        vectors = vectors[keep]
+                    self._append_vectors(added, vectors)
+            return len(added)
+
+    def remove_problems(self, problem_ids: Iterable[str]) -> int:
+        """
+        문제를 삭제 표시 (실제 제거는 compact에서 수행)
+        Args:
+            problem_ids (Iterable[str]): 삭제할 문제 ID 목록
+        Returns:
+            int: 삭제 표시된 문제 수
+        """
+        with self._lock:
+            removed = []
+            for problem_id in problem_ids:
+                row = self._row_by_id.pop(problem_id, None)
+                if row is None:
+                    continue
+                problem = self.problems[row]
+                self._deleted_rows.add(row)
+                self.concept_index.remove(
+                    row, problem.get("concept", ""), problem.get("difficulty", "")
+                )
+                removed.append(problem_id)
 
-        if not filtered_problems:
-            return []
+            if removed:
+                self.hybrid_retriever = None
+                if self.embedding_index.is_loaded:
+                    rows = self.embedding_index.delete(removed)
+                    if self.vector_store is not None:
+                        self.vector_store.remove(rows)
+            return len(removed)
 
-        return random.sample(filtered_problems, min(top_k, len(filtered_problems)))
+    @property
+    def tombstone_ratio(self) -> float:
+        """삭제 표시된 행의 비율 (문제 목록과 임베딩 인덱스 중 큰 값)"""
+        problem_ratio = (
+            len(self._deleted_rows) / len(self.problems) if self.problems else 0.0
+        )
+        return max(problem_ratio, self.embedding_index.tombstone_ratio)
+
+    def compact(self) -> None:
+        """
+        삭제 표시된 문제를 제거하고 색인과 벡터 저장소를 다시 구성
+        - 새 임베딩 파일은 잠금 밖에서 기록하고, 교체만 잠금 안에서 수행
+        - 게시 전의 복사본에서 실행되므로 벡터 저장소도 바로 다시 만듦
+        """
+        with self._lock:
+            index_loaded = self.embedding_index.is_loaded
+        plan = self.embedding_index.write_compacted() if index_loaded else None
+
+        with self._lock:
+            if plan is not None:
+                if self.embedding_index.install_compacted(plan) is None:
+                    return  # 기록하는 동안 인덱스가 바뀜 (다음 압축에서 다시 시도)
+                self.vector_store = None  # 압축된 인덱스로 다시 생성
+            self.problems = self._live_problems()
+            self.concept_index = ConceptIndex.build(self.problems)
+            self._row_by_id = {p.get("id"): row for row, p in enumerate(self.problems)}
+            self._deleted_rows = set()
+            self.hybrid_retriever = None
+            if plan is not None:
+                self._ensure_vector_store()
+
+    def _get_template_library(self) -> TemplateLibrary:
+        """파라미터 템플릿 모음 (처음 사용할 때 디스크 캐시를 열거나 컴파일)"""
+        with self._lock:
+            if self.template_library is None:
+                if self.problem_pack is None:
+                    self.template_library = TemplateLibrary.compile(self.problems)
+                else:
+                    self.template_library = TemplateLibrary.load_or_compile(
+                        self.problems,
+                        self.problem_pack.source_hash,
+                        TEMPLATE_CACHE_FILE,
+                    )
+            return self.template_library
 
     def modify_problem(self, base_problem: Dict) -> Dict:
         """
         기존 문제를 변형하여 새로운 객관식 문제 생성
+        - 기준 문제의 템플릿이 있으면 숫자를 새로 뽑고 정답을 다시 계산
+        - 템플릿이 없으면 숫자를 바꾸지 않고 원래 정답으로 보기를 생성
         Args:
             base_problem (Dict): 기준이 되는 문제
         Returns:
             Dict: 변형된 새로운 문제
         """
-        modified_problem = base_problem.copy()
+        library = self._get_template_library()
+        template = library.by_problem_id.get(base_problem.get("id"))
+        if template is not None:
+            variants = library.generate([template], 1, self._rng)
+            if variants:
+                variant = variants[0]
+                return {
+                    "text": variant["question"],
+                    "options": variant["options"],
+                    "correct_answer": variant["correct_answer"],
+                    "solution": variant["explanation"],
+                }
 
-        # 문제 텍스트에서 숫자 추출 및 변경
-        numbers = [int(n) for n in str(base_problem["text"]).split() if n.isdigit()]
-        if numbers:
-            for num in numbers:
-                modified_num = num + random.randint(-5, 5)
-                modified_problem["text"] = modified_problem["text"].replace(
-                    str(num), str(modified_num)
-                )
-
-        # 객관식 보기 생성
-        correct_answer = int(modified_problem.get("answer", "0"))
+        correct_answer = str(base_problem.get("answer", ""))
         options = self._generate_options(correct_answer)
-
         return {
-            "text": modified_problem["text"],
+            "text": base_problem["text"],
             "options": options,
-            "correct_answer": 1,  # 정답은 항상 첫 번째 보기로 설정
-            "solution": modified_problem.get("solution", ""),
+            "correct_answer": options.index(correct_answer) + 1,
+            "solution": base_problem.get("solution", ""),
         }
 
-    def _generate_options(self, correct_answer: int) -> List[str]:
-        """객관식 보기 생성"""
-        options = [str(correct_answer)]  # 정답을 첫 번째 보기로
+    def _generate_options(self, correct_answer: str) -> List[str]:
+        """객관식 보기 생성 (정답 위치는 무작위)"""
+        try:
+            value = int(correct_answer)
+        except ValueError:
+            return [correct_answer]
 
-        # 오답 생성
-        while len(options) < 4:
-            wrong_answer = correct_answer + random.randint(-10, 10)
-            if wrong_answer != correct_answer and str(wrong_answer) not in options:
-                options.append(str(wrong_answer))
+        wrong = generate_distractors([value], rng=self._rng)
+        options, _ = build_option_sets([value], wrong, self._rng)
+        return [str(option) for option in options[0]]
 
-        return options
+    def generate_quiz(
+        self, concept: str, difficulty: str, problem_count: int = QUIZ_PROBLEM_COUNT
+    ) -> List[Dict]:
+        """
+        파라미터 템플릿으로 퀴즈 전체를 한 번에 생성 (LLM 호출 없음)
+        Args:
+            concept (str): 수학 개념
+            difficulty (str): 난이도
+            problem_count (int): 생성할 문제 수
+        Returns:
+            List[Dict]: 생성된 문제 목록 (템플릿이 없으면 빈 목록)
+        """
+        library = self._get_template_library()
+        templates = library.for_concept(concept) or [
+            template
+            for name in get_concept_aliases().dataset_concepts(concept)
+            for template in library.for_concept(name)
+        ]
+        if not templates:
+            # 개념 이름이 템플릿과 일치하지 않으면 유사 문제의 템플릿 사용
+            similar = self.find_similar_problems(concept, difficulty, top_k=10)
+            templates = list(
+                {
+                    t.template_id: t
+                    for t in (library.by_problem_id.get(p.get("id")) for p in similar)
+                    if t is not None
+                }.values()
+            )
+        same_difficulty = [t for t in templates if t.difficulty == difficulty]
+        problems = library.generate(
+            same_difficulty or templates, problem_count, self._rng
+        )
+
+        next_problems = self._generate_next_problems(concept, difficulty)
+        for problem in problems:
+            problem["next_problems"] = next_problems
+        return problems
 
     def generate_problem(self, concept: str, difficulty: str) -> Dict:
         """
@@ -151,12 +658,86 @@ class ProblemGenerator:
         }
 
     def _get_related_concept(self, concept: str) -> str:
-        """관련 개념 반환"""
-        concept_relations = {
-            "최대공약수": ["최소공배수", "약수"],
-            "최소공배수": ["최대공약수", "배수"],
-            "약수 구하기": ["최대공약수", "소수"],
-            "소수 판별": ["약수 구하기", "소인수분해"],
-        }
-        related = concept_relations.get(concept, [])
+        """관련 개념 반환 (같은 단원의 개념과 선수 개념 중 하나)"""
+        related = get_concept_aliases().related_concepts(concept)
         return random.choice(related) if related else concept
+
+
+_generator_watcher: Optional[SnapshotWatcher] = None
+_generator_watcher_lock = threading.Lock()
+
+
+def _build_generator(previous: Optional[Snapshot]) -> ProblemGenerator:
+    """
+    문제 은행에서 새 생성기를 만들기
+    - 저장소를 읽기 전에 새 유지기의 변경 피드 구독부터 시작하여, 만드는 동안의
+      저장/삭제 이벤트를 큐에 쌓아 두었다가 게시 후 적용 (_start_maintainer)
+    - 다시 읽을 때는 그다음에 이전 유지기를 멈춰 두 생성기가 같은 인덱스 파일을
+      동시에 쓰지 않게 함 (만들기에 실패하면 다시 연결)
+    - 교체 전에 저장소의 문제와 임베딩 인덱스까지 준비하여 첫 요청이 기다리지 않게 함
+    """
+    from core.problem.problem_repository import ProblemRepository
+    from .index_maintainer import IndexMaintainer
+
+    generator = ProblemGenerator()
+    repository = ProblemRepository()
+    # LSH 후보의 임베딩 코사인 확인에 같은 임베딩 모델 사용
+    repository.dedup.encode = generator._encode_queries
+    generator.maintainer = IndexMaintainer(generator, repository)
+    generator.maintainer.subscribe()
+
+    previous_maintainer = previous.value.maintainer if previous is not None else None
+    if previous_maintainer is not None:
+        previous_maintainer.stop()
+        previous_maintainer.generator.retire()
+    try:
+        generator.add_problems(repository.get_all_problems())
+        if previous is not None:
+            with generator._lock:
+                generator._ensure_vector_store()
+    except Exception:
+        generator.maintainer.stop()
+        if previous_maintainer is not None:
+            previous_maintainer.generator.retired = False
+            previous_maintainer.start()
+        raise
+    return generator
+
+
+def _start_maintainer(previous: Snapshot, current: Snapshot) -> None:
+    """다시 만든 생성기가 게시되면 변경 피드 구독 시작 (진행 중인 요청은 이전 생성기 사용)"""
+    current.value.maintainer.start(previous.value.maintainer.publish)
+
+
+def _get_generator_watcher() -> SnapshotWatcher:
+    global _generator_watcher
+    if _generator_watcher is None:
+        with _generator_watcher_lock:
+            if _generator_watcher is None:
+                watcher = SnapshotWatcher(
+                    PROBLEM_BANK_FILES,
+                    _build_generator,
+                    "problem-bank",
+                    on_swap=_start_maintainer,
+                )
+                watcher.current().maintainer.start(watcher.publish)
+                _generator_watcher = watcher.start()
+    return _generator_watcher
+
+
+def get_problem_generator() -> ProblemGenerator:
+    """
+    프로세스 전역 문제 생성기 반환
+    - 처음 호출할 때 생성하고 문제 저장소 변경 피드에 연결하여 색인을 증분 유지
+      (변경은 복사본에 적용하여 다음 버전으로 게시하므로 받은 생성기는 바뀌지 않음)
+    - 문제 은행 파일이 바뀌면 백그라운드에서 새 생성기를 만들어 교체
+      (요청 처리 중에는 받은 생성기를 끝까지 사용)
+    Returns:
+        ProblemGenerator: 현재 스냅샷의 문제 생성기
+    """
+    return _get_generator_watcher().current()
+
+
+def get_problem_bank_snapshot() -> Snapshot:
+    """현재 문제 은행 스냅샷 (버전, 생성 시간 확인용)"""
+    return _get_generator_watcher().snapshot
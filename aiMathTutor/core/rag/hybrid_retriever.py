@@ -0,0 +1,138 @@
+"""어휘 + 임베딩 하이브리드 검색 모듈
+
+미리 계산한 TF-IDF 희소 행렬과 임베딩 행렬로 각각 점수를 매긴 뒤
+Reciprocal Rank Fusion(RRF)으로 합칩니다. 여러 쿼리를 한 번의 행렬
+연산으로 처리하므로 퀴즈 전체 문제를 한 번에 검색할 수 있습니다.
+"""
+
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+RRF_K = 60  # RRF 상수 (순위가 낮은 결과의 영향을 완만하게 줄임)
+
+
+def _ranks(scores: np.ndarray) -> np.ndarray:
+    """(m, n) 점수 행렬의 행별 순위 (0이 가장 높은 점수)"""
+    order = np.argsort(-scores, axis=1, kind="stable")
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(scores.shape[1])[np.newaxis, :], axis=1)
+    return ranks
+
+
+class HybridRetriever:
+    def __init__(
+        self,
+        problems: List[dict],
+        dense_vectors: Optional[np.ndarray] = None,
+        encode_queries: Optional[Callable[[List[str]], np.ndarray]] = None,
+        rrf_k: int = RRF_K,
+        dense_mask: Optional[np.ndarray] = None,
+    ):
+        """
+        하이브리드 검색기 초기화
+        Args:
+            problems (List[dict]): 행 순서대로 정렬된 문제 목록
+            dense_vectors (Optional[np.ndarray]): 문제와 같은 순서의 (n, dim) 정규화 임베딩
+            encode_queries (Optional[Callable]): 쿼리 목록을 (m, dim) 임베딩으로 변환하는 함수
+                (None을 반환하면 어휘 점수만 사용)
+            rrf_k (int): RRF 상수
+            dense_mask (Optional[np.ndarray]): (n,) 임베딩이 있는 행 표시
+                (False인 행은 어휘 점수만 사용, None이면 모든 행에 임베딩이 있음)
+        """
+        self.problems = problems
+        self.dense_vectors = dense_vectors
+        self.dense_mask = dense_mask
+        self.encode_queries = encode_queries
+        self.rrf_k = rrf_k
+
+        # 숫자가 많은 문제도 잡을 수 있도록 한 글자 토큰과 숫자를 유지
+        self.vectorizer = TfidfVectorizer(
+            token_pattern=r"(?u)\b\w+\b",
+            ngram_range=(1, 2),
+            sublinear_tf=True,
+        )
+        self.sparse_matrix = self.vectorizer.fit_transform(
+            [self._document_text(p) for p in problems]
+        ).tocsr()
+
+    @staticmethod
+    def _document_text(problem: dict) -> str:
+        return " ".join(
+            str(problem.get(field, "")) for field in ("concept", "unit", "text")
+        )
+
+    def lexical_scores(self, queries: List[str]) -> np.ndarray:
+        """(m, n) TF-IDF 코사인 점수"""
+        query_matrix = self.vectorizer.transform(queries)
+        return (query_matrix @ self.sparse_matrix.T).toarray()
+
+    def dense_scores(
+        self, queries: List[str], query_vectors: Optional[np.ndarray] = None
+    ) -> Optional[np.ndarray]:
+        """(m, n) 임베딩 코사인 점수 (임베딩을 사용할 수 없으면 None)"""
+        if self.dense_vectors is None:
+            return None
+        if query_vectors is None:
+            if self.encode_queries is None:
+                return None
+            query_vectors = self.encode_queries(queries)
+            if query_vectors is None:
+                return None
+        query_vectors = np.asarray(query_vectors, dtype=np.float32)
+        scores = query_vectors @ np.asarray(self.dense_vectors).T
+        if self.dense_mask is not None:
+            scores[:, ~self.dense_mask] = -np.inf  # 임베딩이 없는 행은 가장 낮은 순위
+        return scores
+
+    def retrieve(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        query_vectors: Optional[np.ndarray] = None,
+        candidate_rows: Optional[np.ndarray] = None,
+    ) -> List[List[Tuple[int, float]]]:
+        """
+        배치 쿼리를 한 번에 검색하여 RRF 점수순 결과 반환
+        Args:
+            queries (List[str]): 쿼리 문자열 목록
+            top_k (int): 쿼리당 반환할 결과 수
+            query_vectors (Optional[np.ndarray]): 미리 계산된 (m, dim) 쿼리 임베딩
+            candidate_rows (Optional[np.ndarray]): 검색 대상 행으로 제한
+        Returns:
+            List[List[Tuple[int, float]]]: 쿼리별 (문제 행 번호, RRF 점수) 목록
+        """
+        if not queries or not self.problems or top_k <= 0:
+            return [[] for _ in queries]
+
+        lexical = self.lexical_scores(queries)
+        dense = self.dense_scores(queries, query_vectors)
+        dense_mask = self.dense_mask
+        if candidate_rows is not None:
+            candidate_rows = np.asarray(candidate_rows, dtype=np.int64)
+            lexical = lexical[:, candidate_rows]
+            dense = None if dense is None else dense[:, candidate_rows]
+            dense_mask = None if dense_mask is None else dense_mask[candidate_rows]
+
+        # 어휘가 전혀 겹치지 않는 문제는 어휘 순위 점수를 받지 않음
+        fused = np.where(lexical > 0, 1.0 / (self.rrf_k + 1 + _ranks(lexical)), 0.0)
+        if dense is not None:
+            dense_fused = 1.0 / (self.rrf_k + 1 + _ranks(dense))
+            if dense_mask is not None:
+                dense_fused = np.where(dense_mask, dense_fused, 0.0)
+            fused += dense_fused
+
+        k = min(top_k, fused.shape[1])
+        top = np.argpartition(-fused, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(fused, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        if candidate_rows is not None:
+            top = candidate_rows[top]
+
+        return [
+            [(int(row), float(score)) for row, score in zip(rows, scores) if score > 0]
+            for rows, scores in zip(top, top_scores)
+        ]
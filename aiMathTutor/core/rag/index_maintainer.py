@@ -0,0 +1,184 @@
+"""RAG 색인 증분 유지 모듈
+
+ProblemRepository의 변경 피드(save/delete 이벤트)를 구독하여 문제 생성기의
+(개념, 난이도) 색인과 임베딩 인덱스를 전체 재생성 없이 갱신합니다.
+게시된 생성기는 고치지 않고, 최신 생성기의 복사본에 이벤트 묶음을 적용한 뒤
+다음 버전으로 게시합니다 (읽는 쪽은 항상 완성된 생성기만 봄).
+- save: 새 ID의 벡터만 인덱스 끝에 추가
+- delete: 행을 삭제 표시(tombstone)
+- 삭제 표시 비율이 임계값을 넘으면 같은 워커 스레드에서 압축 (추가/삭제와
+  겹치지 않으며, 새 파일 기록 중에도 검색은 계속 진행)
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+COMPACTION_RATIO = 0.2  # 삭제 표시 비율이 이 값을 넘으면 압축
+BATCH_SIZE = 256  # 한 번에 적용할 최대 이벤트 수
+
+
+class IndexMaintainer:
+    def __init__(
+        self,
+        generator,
+        repository,
+        compaction_ratio: float = COMPACTION_RATIO,
+        batch_size: int = BATCH_SIZE,
+    ):
+        """
+        색인 유지기 초기화
+        Args:
+            generator (ProblemGenerator): 갱신할 RAG 문제 생성기
+            repository (ProblemRepository): 변경 피드를 제공하는 문제 저장소
+            compaction_ratio (float): 압축을 시작할 삭제 표시 비율
+            batch_size (int): 한 번에 적용할 최대 이벤트 수
+        """
+        self.generator = generator  # 가장 최근에 게시한 생성기
+        self.publish: Optional[Callable] = None
+        self.repository = repository
+        self.compaction_ratio = compaction_ratio
+        self.batch_size = batch_size
+        self._events: "queue.Queue[Dict]" = queue.Queue()
+        self._worker = None
+        self.applied_seq = 0  # 마지막으로 적용한 이벤트 번호
+
+    def subscribe(self) -> None:
+        """변경 피드 구독만 시작 (start 전까지 이벤트는 큐에 쌓아 둠)"""
+        self.repository.subscribe(self.on_change)
+
+    def start(self, publish: Optional[Callable] = None) -> None:
+        """
+        변경 피드를 구독하고 저장소의 현재 문제와 맞춘 뒤 쌓인 이벤트 적용 시작
+        Args:
+            publish (Optional[Callable]): (다음 생성기, 걸린 시간)을 받아 게시하는 함수
+                (SnapshotWatcher.publish). 없으면 이전에 받은 함수를 쓰고, 그것도
+                없으면 생성기를 그 자리에서 수정
+        """
+        if publish is not None:
+            self.publish = publish
+        if self._worker is not None:
+            return
+        self.subscribe()
+        self._update(self._reconcile)
+
+        self._worker = threading.Thread(
+            target=self._run, name="rag-index-maintainer", daemon=True
+        )
+        self._worker.start()
+
+    def stop(self) -> None:
+        """구독 해제 후 남은 이벤트를 적용하고 워커 종료"""
+        self.repository.unsubscribe(self.on_change)
+        if self._worker is None:
+            return
+        self._events.put(None)
+        self._worker.join()
+        self._worker = None
+
+    def on_change(self, event: Dict) -> None:
+        """변경 피드 구독 함수 (저장 요청 경로에서는 큐에 넣기만 함)"""
+        self._events.put(event)
+
+    def flush(self) -> None:
+        """지금까지 받은 이벤트(와 그에 따른 압축)가 모두 적용될 때까지 대기"""
+        self._events.join()
+
+    def _run(self) -> None:
+        while True:
+            events = [self._events.get()]
+            # 쌓인 이벤트를 묶어서 한 번에 임베딩/삭제
+            while len(events) < self.batch_size:
+                try:
+                    events.append(self._events.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = None in events
+            try:
+                self.apply([event for event in events if event is not None])
+            except Exception as e:
+                logger.error(f"RAG 색인 갱신 실패: {str(e)}")
+            finally:
+                for _ in events:
+                    self._events.task_done()
+            if stop:
+                return
+
+    def apply(self, events: List[Dict]) -> None:
+        """
+        이벤트 묶음을 순서대로 적용 (연속된 같은 종류의 이벤트는 한 번에 처리)
+        Args:
+            events (List[Dict]): 변경 피드 이벤트 목록
+        """
+        groups: List[tuple] = []
+        for event in events:
+            if not groups or groups[-1][0] != event["type"]:
+                groups.append((event["type"], []))
+            groups[-1][1].append(event["problem"])
+            self.applied_seq = max(self.applied_seq, event["seq"])
+
+        def change(generator) -> int:
+            changed = sum(
+                self._apply_group(generator, event_type, problems)
+                for event_type, problems in groups
+            )
+            if generator.tombstone_ratio > self.compaction_ratio:
+                changed += self._compact(generator)
+            return changed
+
+        self._update(change)
+
+    def _update(self, change: Callable) -> None:
+        """
+        최신 생성기의 복사본에 변경을 적용하고 다음 버전으로 게시
+        - 바뀐 것이 없으면 게시하지 않음
+        - 게시 함수가 없으면 (게시 전의 생성기) 그 자리에서 수정
+        """
+        if self.publish is None:
+            change(self.generator)
+            return
+        start = time.perf_counter()
+        generator = self.generator.copy()
+        if not change(generator):
+            return
+        self.generator.retire()
+        self.generator = generator
+        self.publish(generator, time.perf_counter() - start)
+
+    def _reconcile(self, generator) -> int:
+        """
+        저장소의 현재 문제와 맞추기 (구독하지 않던 동안 놓친 저장/삭제 반영)
+        Returns:
+            int: 추가하거나 삭제 표시한 문제 수
+        """
+        problems = self.repository.get_all_problems()
+        stored_ids = {p.get("id") for p in problems}
+        added = generator.add_problems(problems)
+        removed = generator.remove_problems(
+            i for i in generator.added_problem_ids() if i not in stored_ids
+        )
+        return added + removed
+
+    def _apply_group(self, generator, event_type: str, problems: List[Dict]) -> int:
+        if event_type == "save":
+            added = generator.add_problems(problems)
+            logger.info(f"RAG 색인에 문제 {added}개를 추가했습니다.")
+            return added
+        if event_type == "delete":
+            removed = generator.remove_problems(p.get("id") for p in problems)
+            logger.info(f"RAG 색인에서 문제 {removed}개를 삭제 표시했습니다.")
+            return removed
+        return 0
+
+    def _compact(self, generator) -> int:
+        try:
+            generator.compact()
+            return 1
+        except Exception as e:
+            logger.error(f"RAG 색인 압축 실패: {str(e)}")
+            return 0
@@ -0,0 +1,207 @@
+"""임베딩 모델 레지스트리
+
+문장 임베딩 모델을 처음 실제로 사용할 때 한 번만 로드하고, 프로세스 안의
+모든 Streamlit 세션/스레드가 같은 인스턴스를 공유하도록 관리합니다.
+EMBEDDING_WORKER_PROCESS=1 이면 모델을 별도 워커 프로세스에서 실행하여
+UI 프로세스의 메모리 사용량을 작게 유지합니다.
+"""
+
+import logging
+import multiprocessing
+import os
+import resource
+import threading
+import time
+from typing import Dict, List, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def _current_rss_mb() -> float:
+    """현재 프로세스의 상주 메모리(RSS)를 MB 단위로 반환"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        # /proc가 없는 환경(macOS 등)에서는 최대 RSS로 대신함
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return (
+            max_rss / (1024 * 1024)
+            if os.uname().sysname == "Darwin"
+            else max_rss / 1024
+        )
+
+
+def _load_sentence_transformer(model_name: str):
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(model_name)
+
+
+def _worker_main(model_name: str, conn) -> None:
+    """워커 프로세스: 모델을 로드한 뒤 인코딩 요청을 처리"""
+    try:
+        rss_before = _current_rss_mb()
+        start = time.perf_counter()
+        model = _load_sentence_transformer(model_name)
+        conn.send(
+            (
+                "ready",
+                {
+                    "dimension": model.get_sentence_embedding_dimension(),
+                    "worker_load_seconds": time.perf_counter() - start,
+                    "worker_rss_mb": _current_rss_mb(),
+                    "worker_rss_delta_mb": _current_rss_mb() - rss_before,
+                },
+            )
+        )
+    except Exception as e:
+        conn.send(("error", str(e)))
+        return
+
+    while True:
+        try:
+            command, payload = conn.recv()
+        except EOFError:
+            break
+        if command == "stop":
+            break
+        try:
+            texts, kwargs = payload
+            conn.send(("ok", model.encode(texts, **kwargs)))
+        except Exception as e:
+            conn.send(("error", str(e)))
+
+
+class WorkerModelProxy:
+    def __init__(self, model_name: str):
+        """
+        워커 프로세스에서 실행되는 모델의 대리 객체
+        - SentenceTransformer의 encode / get_sentence_embedding_dimension만 제공
+        Args:
+            model_name (str): 로드할 모델 이름
+        """
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe()
+        self._process = context.Process(
+            target=_worker_main, args=(model_name, child_conn), daemon=True
+        )
+        self._process.start()
+        child_conn.close()  # 워커가 비정상 종료되면 recv가 EOFError를 내도록
+        self._lock = threading.Lock()  # 파이프는 한 번에 한 요청만 처리
+
+        try:
+            status, info = self._conn.recv()
+        except EOFError:
+            status, info = "error", "워커 프로세스가 종료되었습니다."
+        if status != "ready":
+            self.close()
+            raise RuntimeError(f"임베딩 워커 시작 실패: {info}")
+        self.worker_info: Dict = info
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.worker_info["dimension"]
+
+    def encode(self, texts: Union[str, List[str]], **kwargs) -> np.ndarray:
+        with self._lock:
+            self._conn.send(("encode", (texts, kwargs)))
+            status, result = self._conn.recv()
+        if status != "ok":
+            raise RuntimeError(f"임베딩 워커 오류: {result}")
+        return result
+
+    def close(self) -> None:
+        try:
+            self._conn.send(("stop", None))
+        except (OSError, BrokenPipeError):
+            pass
+        self._process.join(timeout=5)
+
+
+class ModelRegistry:
+    _instance = None
+    _is_initialized = False
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ModelRegistry, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        """프로세스 전역 모델 레지스트리 초기화"""
+        if not self._is_initialized:
+            self._lock = threading.Lock()
+            self._model_locks: Dict[str, threading.Lock] = {}
+            self._models: Dict[str, object] = {}
+            self._metrics: Dict[str, Dict] = {}
+            self.use_worker_process = os.getenv("EMBEDDING_WORKER_PROCESS") == "1"
+            self._is_initialized = True
+
+    def get_model(self, model_name: str):
+        """
+        모델 반환 (처음 호출 시 로드, 이후에는 공유 인스턴스 반환)
+        Args:
+            model_name (str): 모델 이름
+        Returns:
+            SentenceTransformer 또는 WorkerModelProxy
+        """
+        model = self._models.get(model_name)
+        if model is not None:
+            return model
+
+        with self._lock:
+            model_lock = self._model_locks.setdefault(model_name, threading.Lock())
+
+        # 같은 모델을 여러 스레드가 동시에 로드하지 않도록 모델별로 잠금
+        with model_lock:
+            model = self._models.get(model_name)
+            if model is None:
+                model = self._load(model_name)
+                self._models[model_name] = model
+        return model
+
+    def _load(self, model_name: str):
+        rss_before = _current_rss_mb()
+        start = time.perf_counter()
+
+        if self.use_worker_process:
+            model = WorkerModelProxy(model_name)
+            metrics = {"mode": "worker_process", **model.worker_info}
+        else:
+            model = _load_sentence_transformer(model_name)
+            metrics = {"mode": "in_process"}
+
+        metrics.update(
+            {
+                "load_seconds": time.perf_counter() - start,
+                "ui_rss_mb": _current_rss_mb(),
+                "ui_rss_delta_mb": _current_rss_mb() - rss_before,
+            }
+        )
+        self._metrics[model_name] = metrics
+        logger.info(
+            f"임베딩 모델 로드 완료: {model_name} "
+            f"({metrics['load_seconds']:.2f}초, {metrics['mode']})"
+        )
+        return model
+
+    def is_loaded(self, model_name: str) -> bool:
+        return model_name in self._models
+
+    def get_metrics(self) -> Dict[str, Dict]:
+        """모델별 로드 시간과 상주 메모리 지표"""
+        return {
+            name: {**metrics, "current_rss_mb": _current_rss_mb()}
+            for name, metrics in self._metrics.items()
+        }
+
+    def unload(self, model_name: str) -> None:
+        """모델을 레지스트리에서 제거 (워커 프로세스는 종료)"""
+        with self._lock:
+            model = self._models.pop(model_name, None)
+            self._metrics.pop(model_name, None)
+        if isinstance(model, WorkerModelProxy):
+            model.close()
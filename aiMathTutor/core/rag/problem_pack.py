@@ -0,0 +1,410 @@
+"""컬럼형 문제 팩 모듈
+
+문제 은행 JSON 파일들을 문제 단위로 펼쳐 하나의 바이너리 팩 파일로
+컴파일하고, numpy.memmap으로 열어 행 단위 지연 뷰를 제공합니다.
+
+- domain/unit/concept/difficulty: 문자열 풀 + uint16 인덱스 열
+- id/question/explanation, 보기 값: UTF-8 바이트 블록 + int64 오프셋 배열
+- 보기: 문제별 보기 오프셋 + 보기 키 인덱스(uint8) 열
+- 정답: 문제 안에서 정답 보기의 위치를 담은 int8 열 (-1이면 없음)
+
+원본 파일의 크기/수정 시각이 바뀌면 내용 해시를 다시 확인하고, 내용이
+바뀐 경우에만 다시 컴파일합니다.
+
+실행 (aiMathTutor 디렉토리에서):
+    python -m core.rag.problem_pack
+"""
+
+import hashlib
+import json
+import logging
+import os
+import struct
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PACK_MAGIC = b"PBPK"
+PACK_FORMAT_VERSION = 1
+PACK_ALIGNMENT = 8
+DEFAULT_DIFFICULTY = "중"  # 문제 은행에 난이도 정보가 없는 경우의 기본값
+
+FIELDS = (
+    "id",
+    "domain",
+    "unit",
+    "concept",
+    "difficulty",
+    "text",
+    "options",
+    "answer",
+    "solution",
+)
+POOLED_FIELDS = ("domain", "unit", "concept", "difficulty")
+TEXT_FIELDS = ("id", "text", "solution")
+
+
+def flatten_problem_bank(data, id_prefix: str = "") -> List[Dict]:
+    """
+    문제 은행 JSON을 문제 단위 목록으로 변환
+    - 개념별 중첩 구조: [{"domain", "unit", "concept", "problem": {"1": {...}}}]
+    - 평면 구조: {"problems": [{...}]}
+    Args:
+        data: json.load 결과
+        id_prefix (str): 여러 파일의 문제 ID가 겹치지 않도록 붙일 접두사
+    Returns:
+        List[Dict]: id, domain, unit, concept, difficulty, text, options, answer(보기 키), solution
+    """
+    if isinstance(data, dict):
+        problems = []
+        for idx, item in enumerate(data.get("problems", [])):
+            problems.append(
+                {
+                    "id": str(item.get("id", f"{id_prefix}{idx:06d}")),
+                    "domain": item.get("domain", ""),
+                    "unit": item.get("unit", ""),
+                    "concept": item.get("concept", ""),
+                    "difficulty": item.get("difficulty", DEFAULT_DIFFICULTY),
+                    "text": item.get("text", item.get("question", "")),
+                    "options": item.get("options", {}),
+                    "answer": item.get("answer"),
+                    "solution": item.get("solution", item.get("explanation", "")),
+                }
+            )
+        return problems
+
+    problems = []
+    for entry_idx, entry in enumerate(data):
+        for number, item in entry.get("problem", {}).items():
+            problems.append(
+                {
+                    "id": f"{id_prefix}{entry_idx:04d}-{number}",
+                    "domain": entry.get("domain", ""),
+                    "unit": entry.get("unit", ""),
+                    "concept": entry.get("concept", ""),
+                    "difficulty": item.get(
+                        "difficulty", entry.get("difficulty", DEFAULT_DIFFICULTY)
+                    ),
+                    "text": item.get("question", ""),
+                    "options": item.get("options", {}),
+                    "answer": item.get("answer"),
+                    "solution": item.get("explanation", ""),
+                }
+            )
+    return problems
+
+
+def _source_stats(source_files: Sequence[str]) -> List[List]:
+    stats = []
+    for path in source_files:
+        try:
+            st = os.stat(path)
+            stats.append([path, st.st_size, st.st_mtime_ns])
+        except OSError:
+            stats.append([path, -1, 0])
+    return stats
+
+
+def _sources_hash(source_files: Sequence[str]) -> str:
+    digest = hashlib.sha256()
+    for path in source_files:
+        digest.update(path.encode("utf-8") + b"\0")
+        try:
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+        except FileNotFoundError:
+            digest.update(b"missing")
+    return digest.hexdigest()
+
+
+class _Pool:
+    """문자열 인터닝 풀"""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def intern(self, value) -> int:
+        value = str(value)
+        idx = self._index.get(value)
+        if idx is None:
+            idx = self._index[value] = len(self.values)
+            self.values.append(value)
+        return idx
+
+
+class _TextColumn:
+    """UTF-8 바이트 블록 + 오프셋 배열"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.offsets: List[int] = [0]
+
+    def append(self, value: str) -> None:
+        data = str(value).encode("utf-8")
+        self.chunks.append(data)
+        self.offsets.append(self.offsets[-1] + len(data))
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        blob = np.frombuffer(b"".join(self.chunks), dtype=np.uint8)
+        return blob, np.asarray(self.offsets, dtype=np.int64)
+
+
+def compile_problem_pack(source_files: Sequence[str], pack_file: str) -> str:
+    """
+    문제 은행 파일들을 컬럼형 팩 파일로 컴파일
+    Args:
+        source_files (Sequence[str]): 문제 은행 JSON 파일 목록 (첫 파일은 ID 접두사 없음)
+        pack_file (str): 출력 팩 파일 경로
+    Returns:
+        str: 원본 내용 해시
+    """
+    problems: List[Dict] = []
+    for file_idx, path in enumerate(source_files):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            logger.warning(f"문제 은행 파일이 없습니다: {path}")
+            continue
+        prefix = (
+            "" if file_idx == 0 else os.path.splitext(os.path.basename(path))[0] + "/"
+        )
+        problems.extend(flatten_problem_bank(data, prefix))
+
+    pools = {field: _Pool() for field in POOLED_FIELDS}
+    pooled = {field: [] for field in POOLED_FIELDS}
+    texts = {field: _TextColumn() for field in TEXT_FIELDS}
+    option_keys = _Pool()
+    option_key_column: List[int] = []
+    option_values = _TextColumn()
+    option_offsets = [0]
+    answers: List[int] = []
+
+    for problem in problems:
+        for field in POOLED_FIELDS:
+            pooled[field].append(pools[field].intern(problem[field]))
+        for field, column in texts.items():
+            column.append(problem[field])
+
+        options = problem["options"] if isinstance(problem["options"], dict) else {}
+        answer = -1
+        for position, (key, value) in enumerate(options.items()):
+            option_key_column.append(option_keys.intern(key))
+            # 원래 타입(정수 등)을 보존하도록 JSON으로 기록
+            option_values.append(json.dumps(value, ensure_ascii=False))
+            if str(key) == str(problem["answer"]):
+                answer = position
+        if answer < 0:
+            # 평면 구조는 정답을 보기 값으로 기록하기도 함
+            values = [str(v) for v in options.values()]
+            if str(problem["answer"]) in values:
+                answer = values.index(str(problem["answer"]))
+        option_offsets.append(len(option_key_column))
+        answers.append(answer)
+
+    if len(option_keys.values) > 255 or any(
+        len(p.values) > 65535 for p in pools.values()
+    ):
+        raise ValueError("문자열 풀 크기가 팩 형식의 한도를 넘었습니다.")
+
+    sections: Dict[str, np.ndarray] = {}
+    for field in POOLED_FIELDS:
+        sections[field] = np.asarray(pooled[field], dtype=np.uint16)
+    for field, column in texts.items():
+        sections[f"{field}_blob"], sections[f"{field}_offsets"] = column.arrays()
+    sections["option_offsets"] = np.asarray(option_offsets, dtype=np.int64)
+    sections["option_keys"] = np.asarray(option_key_column, dtype=np.uint8)
+    sections["option_values_blob"], sections["option_values_offsets"] = (
+        option_values.arrays()
+    )
+    sections["answer"] = np.asarray(answers, dtype=np.int8)
+
+    source_hash = _sources_hash(source_files)
+    header = {
+        "version": PACK_FORMAT_VERSION,
+        "count": len(problems),
+        "source_hash": source_hash,
+        "sources": _source_stats(source_files),
+        "pools": {field: pools[field].values for field in POOLED_FIELDS},
+        "option_keys": option_keys.values,
+        "sections": {},
+    }
+
+    # 헤더 길이를 알아야 섹션 오프셋이 정해지므로 오프셋은 헤더 끝 기준 상대값으로 기록
+    offset = 0
+    for name, array in sections.items():
+        header["sections"][name] = {
+            "offset": offset,
+            "dtype": array.dtype.str,
+            "length": len(array),
+        }
+        offset += -(-array.nbytes // PACK_ALIGNMENT) * PACK_ALIGNMENT
+
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    prefix_len = 4 + 8 + len(header_bytes)
+    padding = -prefix_len % PACK_ALIGNMENT
+
+    os.makedirs(os.path.dirname(pack_file) or ".", exist_ok=True)
+    tmp_file = pack_file + ".tmp"
+    with open(tmp_file, "wb") as f:
+        f.write(PACK_MAGIC)
+        f.write(struct.pack("<II", PACK_FORMAT_VERSION, len(header_bytes) + padding))
+        f.write(header_bytes + b" " * padding)
+        for array in sections.values():
+            data = array.tobytes()
+            f.write(data)
+            f.write(b"\0" * (-len(data) % PACK_ALIGNMENT))
+    os.replace(tmp_file, pack_file)
+    logger.info(f"문제 팩을 생성했습니다: {pack_file} ({len(problems)}문제)")
+    return source_hash
+
+
+class ProblemRow(Mapping):
+    """팩의 한 문제에 대한 지연 뷰 (필드에 접근할 때만 디코딩)"""
+
+    __slots__ = ("_pack", "row")
+
+    def __init__(self, pack: "ProblemPack", row: int):
+        self._pack = pack
+        self.row = row
+
+    def __getitem__(self, field: str):
+        return self._pack.field(self.row, field)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(FIELDS)
+
+    def __len__(self) -> int:
+        return len(FIELDS)
+
+    def copy(self) -> Dict:
+        return dict(self)
+
+    def __repr__(self) -> str:
+        return f"ProblemRow({self.row}, id={self['id']!r})"
+
+
+class ProblemPack:
+    def __init__(self, pack_file: str):
+        """
+        팩 파일을 memmap으로 열기
+        Args:
+            pack_file (str): 팩 파일 경로
+        """
+        self.pack_file = pack_file
+        self._buffer = np.memmap(pack_file, dtype=np.uint8, mode="r")
+        if self._buffer[:4].tobytes() != PACK_MAGIC:
+            raise ValueError(f"문제 팩 파일 형식이 아닙니다: {pack_file}")
+        version, header_len = struct.unpack("<II", self._buffer[4:12].tobytes())
+        if version != PACK_FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 문제 팩 버전입니다: {version}")
+
+        self.header = json.loads(self._buffer[12 : 12 + header_len].tobytes())
+        self.count = self.header["count"]
+        self.source_hash = self.header["source_hash"]
+        self.pools = self.header["pools"]
+        self.option_keys = self.header["option_keys"]
+
+        base = 12 + header_len
+        self.columns: Dict[str, np.ndarray] = {}
+        for name, section in self.header["sections"].items():
+            dtype = np.dtype(section["dtype"])
+            start = base + section["offset"]
+            end = start + section["length"] * dtype.itemsize
+            self.columns[name] = self._buffer[start:end].view(dtype)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, row: int) -> ProblemRow:
+        if not -self.count <= row < self.count:
+            raise IndexError(row)
+        return ProblemRow(self, row % self.count if self.count else row)
+
+    def __iter__(self) -> Iterator[ProblemRow]:
+        return (ProblemRow(self, row) for row in range(self.count))
+
+    def rows(self) -> List[ProblemRow]:
+        """모든 문제의 지연 뷰 목록 (디코딩하지 않음)"""
+        return [ProblemRow(self, row) for row in range(self.count)]
+
+    def _text(self, name: str, idx: int) -> str:
+        offsets = self.columns[f"{name}_offsets"]
+        blob = self.columns[f"{name}_blob"]
+        return blob[offsets[idx] : offsets[idx + 1]].tobytes().decode("utf-8")
+
+    def _options(self, row: int) -> Dict:
+        start, end = self.columns["option_offsets"][row : row + 2]
+        keys = self.columns["option_keys"]
+        return {
+            self.option_keys[keys[i]]: json.loads(self._text("option_values", i))
+            for i in range(start, end)
+        }
+
+    def field(self, row: int, field: str):
+        """한 문제의 필드 값 디코딩"""
+        if field in POOLED_FIELDS:
+            return self.pools[field][self.columns[field][row]]
+        if field in TEXT_FIELDS:
+            return self._text(field, row)
+        if field == "options":
+            return self._options(row)
+        if field == "answer":
+            # 정답은 보기 키가 아니라 보기 값(문자열)으로 제공
+            position = int(self.columns["answer"][row])
+            if position < 0:
+                return ""
+            start = self.columns["option_offsets"][row]
+            return str(json.loads(self._text("option_values", start + position)))
+        raise KeyError(field)
+
+    def column(self, field: str) -> List[str]:
+        """풀링된 필드의 행별 값 (개념 색인 생성 등 일괄 처리용)"""
+        pool = self.pools[field]
+        return [pool[idx] for idx in self.columns[field]]
+
+    def is_fresh(self, source_files: Sequence[str]) -> bool:
+        """원본 파일 목록과 크기/수정 시각이 같은지 확인 (같지 않으면 내용 해시 비교)"""
+        if [s[0] for s in self.header["sources"]] != list(source_files):
+            return False
+        if self.header["sources"] == _source_stats(source_files):
+            return True
+        return _sources_hash(source_files) == self.source_hash
+
+
+def load_problem_pack(
+    source_files: Sequence[str], pack_file: str
+) -> Optional[ProblemPack]:
+    """
+    팩 파일을 열고, 없거나 원본이 바뀌었으면 다시 컴파일
+    Args:
+        source_files (Sequence[str]): 문제 은행 JSON 파일 목록
+        pack_file (str): 팩 파일 경로
+    Returns:
+        Optional[ProblemPack]: 열린 팩 (컴파일할 수 없으면 None)
+    """
+    try:
+        pack = ProblemPack(pack_file)
+        if pack.is_fresh(source_files):
+            return pack
+    except (OSError, ValueError, KeyError):
+        pass
+
+    try:
+        compile_problem_pack(source_files, pack_file)
+        return ProblemPack(pack_file)
+    except (OSError, ValueError) as e:
+        logger.warning(f"문제 팩 생성 실패: {str(e)}")
+        return None
+
+
+if __name__ == "__main__":
+    from .generator import PACK_FILE, PROBLEM_BANK_FILES
+
+    logging.basicConfig(level=logging.INFO)
+    compile_problem_pack(PROBLEM_BANK_FILES, PACK_FILE)
@@ -0,0 +1,549 @@
+"""파라미터 템플릿 모듈
+
+문제 은행의 문장에서 숫자를 슬롯으로 바꾼 뼈대가 같은 문제들을 묶고,
+예시 문제의 정답을 모두 재현하는 계산식을 찾아 파라미터 템플릿으로
+컴파일합니다. 템플릿은 디스크에 캐시되며, 슬롯 값을 NumPy로 한 번에
+뽑아 정답이 맞는 변형 문제를 대량으로 만듭니다.
+
+실행 (aiMathTutor 디렉토리에서):
+    python -m core.rag.problem_templates
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import uuid
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from core.problem.distractors import build_option_sets, generate_distractors
+
+from .concept_index import normalize_key
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_FORMAT_VERSION = 1
+NUMBER_PATTERN = re.compile(r"(?<![\w.])\d+(?:\.\d+)?(?![\w.]\d)")
+MIN_EXAMPLES = 2  # 계산식을 확정하기 위한 최소 예시 수
+MAX_RESAMPLE = 20  # 제약 조건을 어긴 행을 다시 뽑는 최대 횟수
+SCALE_FACTORS = range(2, 13)  # 정다각형 둘레 등 문장에 없는 배수
+# 정수 정답이 나오려면 첫 인자가 배수여야 하는 연산: 두 번째 인자 b로 정한 배수 단위
+INTEGRAL_STEPS = {
+    "div": lambda b: b,
+    "percent": lambda b: 100 // np.gcd(b, 100),
+    "half_mul": lambda b: 2 // np.gcd(b, 2),
+}
+
+# op 이름 → (인자 수, 계산 함수, 풀이 표시 형식)
+OPS = {
+    "add": (2, lambda a, b: a + b, "{0} + {1}"),
+    "sub": (2, lambda a, b: a - b, "{0} - {1}"),
+    "mul": (2, lambda a, b: a * b, "{0} × {1}"),
+    "div": (2, lambda a, b: a / b, "{0} ÷ {1}"),
+    "half_mul": (2, lambda a, b: a * b / 2, "{0} × {1} ÷ 2"),
+    "percent": (2, lambda a, b: a * b / 100, "{0} × {1} ÷ 100"),
+    "twice_mul": (2, lambda a, b: 2 * a * b, "2 × {0} × {1}"),
+    "divmod": (2, None, "{0} ÷ {1}"),
+    "square": (1, lambda a: a * a, "{0} × {0}"),
+    "cube": (1, lambda a: a * a * a, "{0} × {0} × {0}"),
+    "scale": (1, None, "{0} × {k}"),
+}
+
+
+def _format_number(value: float, decimals: int) -> str:
+    return str(int(round(value))) if decimals == 0 else f"{value:.{decimals}f}"
+
+
+def _answer_kind(answers: List[str]) -> Optional[str]:
+    """예시 정답 문자열의 형식 ('int', 'float', 'divmod')"""
+    if all(re.fullmatch(r"-?\d+", a) for a in answers):
+        return "int"
+    if all(re.fullmatch(r"-?\d+\.\d+", a) for a in answers):
+        return "float"
+    if all(re.fullmatch(r"\d+ R\d+", a) for a in answers):
+        return "divmod"
+    return None
+
+
+def _candidate_expressions(n_slots: int) -> Iterable[Dict]:
+    """우선순위 순서의 후보 계산식 (단순한 식부터)"""
+    for op, (arity, _, _) in OPS.items():
+        if arity == 1:
+            for i in range(n_slots):
+                if op == "scale":
+                    for k in SCALE_FACTORS:
+                        yield {"op": op, "args": [i], "k": k}
+                else:
+                    yield {"op": op, "args": [i]}
+        elif n_slots >= 2:
+            for i in range(n_slots):
+                for j in range(n_slots):
+                    if i != j:
+                        yield {"op": op, "args": [i, j]}
+
+
+def evaluate(expression: Dict, values: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """
+    (n, slots) 슬롯 값 행렬에 계산식을 벡터 연산으로 적용
+    Returns:
+        Tuple[np.ndarray, ...]: divmod는 (몫, 나머지), 나머지는 (값,)
+    """
+    args = [values[:, i] for i in expression["args"]]
+    op = expression["op"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if op == "divmod":
+            return np.floor_divide(*args), np.mod(*args)
+        if op == "scale":
+            return (args[0] * expression["k"],)
+        return (OPS[op][1](*args),)
+
+
+def format_answers(kind: str, results: Tuple[np.ndarray, ...]) -> List[str]:
+    """계산 결과를 문제 은행과 같은 정답 문자열로 변환"""
+    if kind == "divmod":
+        quotient, remainder = results
+        return [f"{int(q)} R{int(r)}" for q, r in zip(quotient, remainder)]
+    values = results[0]
+    if kind == "int":
+        return [str(int(round(v))) for v in values]
+    return [str(round(float(v), 2)) for v in values]
+
+
+class ProblemTemplate:
+    def __init__(
+        self,
+        template_id: str,
+        skeleton: str,
+        slots: List[Dict],
+        expression: Dict,
+        answer_kind: str,
+        concept: str,
+        difficulty: str,
+        unit: str = "",
+        domain: str = "",
+        source_ids: Optional[List[str]] = None,
+    ):
+        """
+        파라미터 템플릿
+        Args:
+            template_id (str): 템플릿 ID (뼈대와 개념의 해시)
+            skeleton (str): 숫자 자리를 {0}, {1}...로 바꾼 문장
+            slots (List[Dict]): 슬롯별 {"min", "max", "decimals", "constant"}
+            expression (Dict): {"op", "args", ("k")} 정답 계산식
+            answer_kind (str): 'int', 'float', 'divmod'
+            concept (str): 수학 개념
+            difficulty (str): 난이도
+            unit (str): 단원
+            domain (str): 영역
+            source_ids (Optional[List[str]]): 템플릿을 만든 원본 문제 ID
+        """
+        self.template_id = template_id
+        self.skeleton = skeleton
+        self.slots = slots
+        self.expression = expression
+        self.answer_kind = answer_kind
+        self.concept = concept
+        self.difficulty = difficulty
+        self.unit = unit
+        self.domain = domain
+        self.source_ids = source_ids or []
+
+    def constraints_ok(self, values: np.ndarray) -> np.ndarray:
+        """
+        행별 제약 조건 (0으로 나누기 금지, 결과가 음수가 되지 않음,
+        정수 정답 템플릿은 결과가 정수 등)
+        """
+        ok = np.ones(len(values), dtype=bool)
+        op, args = self.expression["op"], self.expression["args"]
+        if op in ("div", "divmod"):
+            ok &= values[:, args[1]] != 0
+        if op in ("sub", "divmod"):
+            ok &= values[:, args[0]] >= values[:, args[1]]
+        if self.answer_kind == "int" and op != "divmod":
+            # 반올림하면 틀린 정답이 되므로 나누어떨어지지 않는 행은 제외
+            result = evaluate(self.expression, values)[0]
+            ok &= np.isfinite(result)
+            ok &= np.isclose(result, np.round(result), rtol=0, atol=1e-9)
+        for i, slot in enumerate(self.slots):
+            if not slot["constant"]:
+                ok &= (values[:, i] >= slot["min"]) & (values[:, i] <= slot["max"])
+        return ok
+
+    def _snap_integral(self, values: np.ndarray) -> None:
+        """
+        정수 정답 템플릿의 나눗셈/백분율/절반 계산에서 첫 인자를 가장 가까운
+        배수로 옮겨 나누어떨어지게 함 (다시 뽑는 횟수를 줄임)
+        """
+        op, args = self.expression["op"], self.expression["args"]
+        if self.answer_kind != "int" or op not in INTEGRAL_STEPS:
+            return
+        a, b = args
+        if self.slots[a]["constant"] or self.slots[a]["decimals"]:
+            return
+        if self.slots[b]["decimals"]:
+            return
+        low, high = self.slots[a]["min"], self.slots[a]["max"]
+        step = np.abs(INTEGRAL_STEPS[op](values[:, b].astype(np.int64)))
+        step = np.maximum(step, 1).astype(np.float64)
+        snapped = np.round(values[:, a] / step) * step
+        snapped = np.where(snapped < low, snapped + step, snapped)
+        snapped = np.where(snapped > high, snapped - step, snapped)
+        values[:, a] = snapped
+
+    def sample_values(self, n: int, rng: np.random.Generator) -> np.ndarray:
+        """(n, slots) 슬롯 값 행렬 (제약 조건을 어긴 행은 다시 뽑고, 끝내 어기면 제외)"""
+
+        def draw(count: int) -> np.ndarray:
+            columns = []
+            for slot in self.slots:
+                if slot["constant"]:
+                    columns.append(np.full(count, slot["min"], dtype=np.float64))
+                elif slot["decimals"] == 0:
+                    columns.append(
+                        rng.integers(slot["min"], slot["max"] + 1, size=count).astype(
+                            np.float64
+                        )
+                    )
+                else:
+                    columns.append(
+                        np.round(
+                            rng.uniform(slot["min"], slot["max"], size=count),
+                            slot["decimals"],
+                        )
+                    )
+            if not columns:
+                return np.empty((count, 0))
+            values = np.stack(columns, axis=1)
+            self._snap_integral(values)
+            return values
+
+        values = draw(n)
+        for _ in range(MAX_RESAMPLE):
+            bad = ~self.constraints_ok(values)
+            if not bad.any():
+                break
+            values[bad] = draw(int(bad.sum()))
+        return values[self.constraints_ok(values)]
+
+    def instantiate(self, n: int, rng: np.random.Generator) -> List[Dict]:
+        """
+        변형 문제를 한 번에 생성
+        Args:
+            n (int): 생성할 문제 수
+            rng (np.random.Generator): 난수 생성기
+        Returns:
+            List[Dict]: {"text", "answer", "values", "solution"} 목록
+        """
+        values = self.sample_values(n, rng)
+        results = evaluate(self.expression, values)
+        answers = format_answers(self.answer_kind, results)
+        solution_format = OPS[self.expression["op"]][2]
+
+        problems = []
+        for row, answer in zip(values, answers):
+            numbers = [
+                _format_number(v, slot["decimals"]) for v, slot in zip(row, self.slots)
+            ]
+            operands = [numbers[i] for i in self.expression["args"]]
+            problems.append(
+                {
+                    "text": self.skeleton.format(*numbers),
+                    "answer": answer,
+                    "values": row,
+                    "solution": (
+                        solution_format.format(*operands, k=self.expression.get("k"))
+                        + f" = {answer}"
+                    ),
+                }
+            )
+        return problems
+
+    def to_dict(self) -> Dict:
+        return {
+            "template_id": self.template_id,
+            "skeleton": self.skeleton,
+            "slots": self.slots,
+            "expression": self.expression,
+            "answer_kind": self.answer_kind,
+            "concept": self.concept,
+            "difficulty": self.difficulty,
+            "unit": self.unit,
+            "domain": self.domain,
+            "source_ids": self.source_ids,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ProblemTemplate":
+        return cls(**data)
+
+
+def _skeleton(text: str) -> Tuple[str, List[str]]:
+    """문장의 숫자를 {0}, {1}... 슬롯으로 바꾼 뼈대와 숫자 목록"""
+    numbers = NUMBER_PATTERN.findall(text)
+    parts = NUMBER_PATTERN.split(text.replace("{", "{{").replace("}", "}}"))
+    skeleton = "".join(
+        part + (f"{{{i}}}" if i < len(numbers) else "") for i, part in enumerate(parts)
+    )
+    return skeleton, numbers
+
+
+def _fit_template(key: Tuple, examples: List[Dict]) -> Optional[ProblemTemplate]:
+    """같은 뼈대의 예시 문제들로 슬롯 범위와 정답 계산식을 결정"""
+    skeleton, concept = key
+    values = np.asarray([e["numbers"] for e in examples], dtype=np.float64)
+    answers = [str(e["answer"]) for e in examples]
+    kind = _answer_kind(answers)
+    if kind is None or values.shape[1] == 0:
+        return None
+
+    slots = []
+    for column, raw in zip(values.T, zip(*[e["raw_numbers"] for e in examples])):
+        decimals = max(len(r.split(".")[1]) if "." in r else 0 for r in raw)
+        slots.append(
+            {
+                "min": float(column.min()) if decimals else int(column.min()),
+                "max": float(column.max()) if decimals else int(column.max()),
+                "decimals": decimals,
+                "constant": bool(np.all(column == column[0])),
+            }
+        )
+
+    for expression in _candidate_expressions(values.shape[1]):
+        if kind == "divmod" and expression["op"] != "divmod":
+            continue
+        if kind != "divmod" and expression["op"] == "divmod":
+            continue
+        results = evaluate(expression, values)
+        if not all(np.all(np.isfinite(r)) for r in results):
+            continue
+        if kind == "int" and not np.allclose(results[0], np.round(results[0])):
+            continue
+        if format_answers(kind, results) == answers:
+            first = examples[0]["problem"]
+            return ProblemTemplate(
+                template_id=hashlib.sha1(
+                    f"{concept}\0{skeleton}".encode("utf-8")
+                ).hexdigest()[:16],
+                skeleton=skeleton,
+                slots=slots,
+                expression=expression,
+                answer_kind=kind,
+                concept=first.get("concept", ""),
+                difficulty=first.get("difficulty", ""),
+                unit=first.get("unit", ""),
+                domain=first.get("domain", ""),
+                source_ids=[e["problem"].get("id") for e in examples],
+            )
+    return None
+
+
+class TemplateLibrary:
+    def __init__(self, templates: List[ProblemTemplate]):
+        """
+        개념별 / 원본 문제별로 조회할 수 있는 템플릿 모음
+        Args:
+            templates (List[ProblemTemplate]): 템플릿 목록
+        """
+        self.templates = templates
+        self.by_concept: Dict[str, List[ProblemTemplate]] = {}
+        self.by_problem_id: Dict[str, ProblemTemplate] = {}
+        for template in templates:
+            concept_key, _ = normalize_key(template.concept, "")
+            self.by_concept.setdefault(concept_key, []).append(template)
+            for problem_id in template.source_ids:
+                self.by_problem_id[problem_id] = template
+
+    def __len__(self) -> int:
+        return len(self.templates)
+
+    @classmethod
+    def compile(cls, problems: Iterable) -> "TemplateLibrary":
+        """
+        문제 목록을 (개념, 뼈대)로 묶어 템플릿 컴파일
+        Args:
+            problems (Iterable): id, concept, text, answer 필드를 가진 문제
+        Returns:
+            TemplateLibrary: 정답 계산식을 찾은 템플릿 모음
+        """
+        groups: Dict[Tuple, List[Dict]] = {}
+        for problem in problems:
+            skeleton, raw_numbers = _skeleton(str(problem.get("text", "")))
+            if not raw_numbers:
+                continue
+            key = (skeleton, problem.get("concept", ""))
+            groups.setdefault(key, []).append(
+                {
+                    "problem": problem,
+                    "raw_numbers": raw_numbers,
+                    "numbers": [float(n) for n in raw_numbers],
+                    "answer": problem.get("answer", ""),
+                }
+            )
+
+        templates = []
+        for key, examples in groups.items():
+            if len(examples) < MIN_EXAMPLES:
+                continue
+            template = _fit_template(key, examples)
+            if template is not None:
+                templates.append(template)
+        logger.info(
+            f"템플릿 {len(templates)}개를 컴파일했습니다. (뼈대 {len(groups)}개)"
+        )
+        return cls(templates)
+
+    def save(self, cache_file: str, source_hash: str) -> None:
+        os.makedirs(os.path.dirname(cache_file) or ".", exist_ok=True)
+        tmp_file = cache_file + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": TEMPLATE_FORMAT_VERSION,
+                    "source_hash": source_hash,
+                    "templates": [t.to_dict() for t in self.templates],
+                },
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_file, cache_file)
+
+    @classmethod
+    def load(cls, cache_file: str, source_hash: str) -> Optional["TemplateLibrary"]:
+        """캐시가 없거나 원본 해시가 다르면 None"""
+        try:
+            with open(cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (
+            data.get("version") != TEMPLATE_FORMAT_VERSION
+            or data.get("source_hash") != source_hash
+        ):
+            return None
+        return cls([ProblemTemplate.from_dict(t) for t in data["templates"]])
+
+    @classmethod
+    def load_or_compile(
+        cls, problems: Iterable, source_hash: str, cache_file: str
+    ) -> "TemplateLibrary":
+        """디스크 캐시를 열고, 없거나 오래된 경우에만 컴파일하여 저장"""
+        library = cls.load(cache_file, source_hash)
+        if library is None:
+            library = cls.compile(problems)
+            try:
+                library.save(cache_file, source_hash)
+            except OSError as e:
+                logger.warning(f"템플릿 캐시 저장 실패: {str(e)}")
+        return library
+
+    def for_concept(self, concept: str) -> List[ProblemTemplate]:
+        concept_key, _ = normalize_key(concept, "")
+        return self.by_concept.get(concept_key, [])
+
+    def generate(
+        self,
+        templates: List[ProblemTemplate],
+        n: int,
+        rng: np.random.Generator,
+        options_count: int = 4,
+    ) -> List[Dict]:
+        """
+        템플릿들에 n개를 고르게 나누어 객관식 문제 생성
+        Args:
+            templates (List[ProblemTemplate]): 사용할 템플릿
+            n (int): 생성할 문제 수
+            rng (np.random.Generator): 난수 생성기
+            options_count (int): 보기 수
+        Returns:
+            List[Dict]: question/options/correct_answer/explanation 형식의 문제 목록
+        """
+        if not templates or n <= 0:
+            return []
+        counts = np.bincount(
+            rng.integers(0, len(templates), size=n), minlength=len(templates)
+        )
+
+        problems = []
+        for template, count in zip(templates, counts):
+            if not count:
+                continue
+            variants = template.instantiate(int(count), rng)
+            if not variants:
+                continue
+            option_sets, positions = _option_sets(
+                template, variants, options_count, rng
+            )
+            for variant, options, position in zip(variants, option_sets, positions):
+                problems.append(
+                    {
+                        "id": str(uuid.uuid4()),
+                        "question": variant["text"],
+                        "options": list(options),
+                        "correct_answer": int(position) + 1,
+                        "explanation": variant["solution"],
+                        "concept": template.concept,
+                        "difficulty": template.difficulty,
+                        "template_id": template.template_id,
+                    }
+                )
+        rng.shuffle(problems)
+        return problems
+
+
+def _option_sets(
+    template: ProblemTemplate,
+    variants: List[Dict],
+    options_count: int,
+    rng: np.random.Generator,
+) -> Tuple[List[List[str]], np.ndarray]:
+    """
+    한 템플릿의 변형 문제 전체에 대한 보기를 오답 엔진으로 한 번에 생성
+    Returns:
+        Tuple[List[List[str]], np.ndarray]: 문제별 보기 목록과 정답 위치 (0부터)
+    """
+    answers = np.asarray([v["answer"] for v in variants])
+    if template.answer_kind == "divmod":
+        # 몫에 오개념 규칙을 적용하고 나머지는 그대로 둠
+        quotient_remainder = np.char.partition(answers, " R")
+        quotients = quotient_remainder[:, 0].astype(np.int64)
+        wrong = generate_distractors(
+            quotients,
+            rules=("off_by_one", "digit_swap"),
+            n_wrong=options_count - 1,
+            rng=rng,
+        )
+        wrong = np.char.add(
+            wrong.astype(str), (" R" + quotient_remainder[:, 2])[:, None]
+        )
+    elif template.answer_kind == "int":
+        operands = np.stack([v["values"] for v in variants])[
+            :, template.expression["args"]
+        ]
+        wrong = generate_distractors(
+            answers.astype(np.int64),
+            operands if operands.shape[1] == 2 else None,
+            n_wrong=options_count - 1,
+            rng=rng,
+        ).astype(str)
+    else:
+        # 소수는 백분의 일 단위 정수로 바꿔 규칙을 적용
+        cents = np.round(answers.astype(np.float64) * 100).astype(np.int64)
+        wrong = generate_distractors(cents, n_wrong=options_count - 1, rng=rng)
+        wrong = np.array(
+            [[str(round(c / 100, 2)) for c in row] for row in wrong], dtype=str
+        )
+    options, positions = build_option_sets(answers, wrong, rng)
+    return options.tolist(), positions
+
+
+if __name__ == "__main__":
+    from .generator import PACK_FILE, PROBLEM_BANK_FILES, TEMPLATE_CACHE_FILE
+    from .problem_pack import load_problem_pack
+
+    logging.basicConfig(level=logging.INFO)
+    pack = load_problem_pack(PROBLEM_BANK_FILES, PACK_FILE)
+    library = TemplateLibrary.compile(pack.rows())
+    library.save(TEMPLATE_CACHE_FILE, pack.source_hash)
@@ -0,0 +1,81 @@
+"""임베딩 양자화 모듈
+
+임베딩 행렬을 float16 또는 차원별 스케일을 갖는 대칭 int8로 압축하고,
+압축된 상태에서 쿼리 점수를 계산합니다.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+STORAGE_MODES = ("float32", "float16", "int8")
+STORAGE_DTYPES = {"float32": np.float32, "float16": np.float16, "int8": np.int8}
+SCORE_CHUNK_ROWS = 16384  # 점수 계산 시 한 번에 float32로 복원할 행 수
+
+
+class ScalarQuantizer:
+    def __init__(self, mode: str = "int8", scale: Optional[np.ndarray] = None):
+        """
+        스칼라 양자화기 초기화
+        Args:
+            mode (str): 'float32', 'float16', 'int8' 중 하나
+            scale (Optional[np.ndarray]): int8 모드의 (dim,) 차원별 스케일 (없으면 fit으로 계산)
+        """
+        if mode not in STORAGE_MODES:
+            raise ValueError(f"지원하지 않는 저장 방식입니다: {mode}")
+        self.mode = mode
+        self.dtype = STORAGE_DTYPES[mode]
+        self.scale = None if scale is None else np.asarray(scale, dtype=np.float32)
+
+    def fit(self, vectors: np.ndarray, chunk_rows: int = SCORE_CHUNK_ROWS) -> None:
+        """int8 모드의 차원별 스케일 계산 (|x|의 최댓값을 127에 대응)"""
+        if self.mode != "int8":
+            return
+        max_abs = np.zeros(vectors.shape[1], dtype=np.float32)
+        for start in range(0, len(vectors), chunk_rows):
+            chunk = np.abs(np.asarray(vectors[start : start + chunk_rows]))
+            np.maximum(max_abs, chunk.max(axis=0), out=max_abs)
+        self.scale = np.where(max_abs > 0, max_abs / 127.0, 1.0).astype(np.float32)
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """float32 벡터를 저장 형식으로 변환"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.mode != "int8":
+            return vectors.astype(self.dtype)
+        if self.scale is None:
+            self.fit(vectors)
+        codes = np.rint(vectors / self.scale)
+        return np.clip(codes, -127, 127).astype(np.int8)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """저장 형식을 float32 벡터로 복원"""
+        decoded = np.asarray(codes, dtype=np.float32)
+        return decoded * self.scale if self.mode == "int8" else decoded
+
+    def scores(
+        self,
+        codes: np.ndarray,
+        queries: np.ndarray,
+        chunk_rows: int = SCORE_CHUNK_ROWS,
+    ) -> np.ndarray:
+        """
+        압축된 행렬과 쿼리의 내적을 청크 단위로 계산
+        - int8: (codes * scale) · q = codes · (q * scale) 이므로 쿼리에 스케일을 곱해 계산
+        Args:
+            codes (np.ndarray): (n, dim) 압축 행렬
+            queries (np.ndarray): (m, dim) float32 쿼리
+            chunk_rows (int): 한 번에 float32로 변환할 행 수
+        Returns:
+            np.ndarray: (m, n) 근사 점수
+        """
+        queries = np.asarray(queries, dtype=np.float32)
+        if self.mode == "int8":
+            queries = queries * self.scale
+        if self.mode == "float32":
+            return queries @ np.asarray(codes).T
+
+        scores = np.empty((len(queries), len(codes)), dtype=np.float32)
+        for start in range(0, len(codes), chunk_rows):
+            chunk = np.asarray(codes[start : start + chunk_rows], dtype=np.float32)
+            scores[:, start : start + len(chunk)] = queries @ chunk.T
+        return scores
@@ -0,0 +1,550 @@
+"""벡터 저장소 모듈
+
+문제 임베딩 검색을 위한 VectorStore 인터페이스와 백엔드를 제공합니다.
+- NumpyVectorStore: 행렬-벡터 곱과 argpartition을 이용한 정확한 검색 (소규모 문제 은행)
+- QuantizedVectorStore: float16/int8로 압축된 행렬에서 검색 후 원본 정밀도로 재점수화
+- FaissVectorStore: FAISS flat/IVF/HNSW 인덱스를 이용한 검색 (대규모 문제 은행)
+
+백엔드는 create_vector_store의 config(또는 VECTOR_STORE_BACKEND 환경 변수)로 선택합니다.
+"""
+
+import copy
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .quantization import SCORE_CHUNK_ROWS, STORAGE_DTYPES, ScalarQuantizer
+
+try:
+    import faiss
+except ImportError:  # faiss-cpu가 없으면 NumPy 백엔드만 사용
+    faiss = None
+
+FILTER_FIELDS = ("concept", "difficulty")
+AUTO_FAISS_THRESHOLD = 20000  # auto 모드에서 FAISS로 전환하는 문제 수
+EXACT_FILTER_LIMIT = 4096  # 필터 결과가 이보다 작으면 근사 검색 대신 정확한 검색
+RESCORE_FACTOR = 4  # 압축 검색 후 원본 정밀도로 다시 계산할 후보 배수 (k * factor)
+
+
+def _normalize(value) -> str:
+    return str(value).strip().lower()
+
+
+class VectorStore(ABC):
+    def __init__(self, dim: int):
+        """
+        벡터 저장소 초기화
+        Args:
+            dim (int): 임베딩 차원
+        """
+        self.dim = dim
+        self.metadata: List[dict] = []
+        self._postings: Dict[Tuple[str, str], List[int]] = {}
+        self._deleted: Set[int] = set()  # 삭제 표시된 행 (압축 전까지 검색에서 제외)
+
+    def __len__(self) -> int:
+        return len(self.metadata)
+
+    @property
+    def live_count(self) -> int:
+        return len(self.metadata) - len(self._deleted)
+
+    def copy(self) -> "VectorStore":
+        """
+        메타데이터 색인과 삭제 표시를 복사한 저장소
+        - 벡터 행렬은 공유하며, 추가는 원본이 보지 않는 끝 행에만 기록됨
+        """
+        store = copy.copy(self)
+        store.metadata = list(self.metadata)
+        store._postings = {key: list(rows) for key, rows in self._postings.items()}
+        store._deleted = set(self._deleted)
+        return store
+
+    def remove(self, rows: Iterable[int]) -> None:
+        """행을 삭제 표시 (벡터는 그대로 두고 검색 결과에서만 제외)"""
+        self._deleted.update(int(row) for row in rows if 0 <= row < len(self))
+
+    def add_vectors(self, vectors: np.ndarray, problems: List[dict]) -> None:
+        """
+        벡터와 메타데이터 추가
+        Args:
+            vectors (np.ndarray): (n, dim) 정규화된 임베딩 행렬
+            problems (List[dict]): 벡터에 대응하는 문제 목록
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if vectors.ndim == 1:
+            vectors = vectors[np.newaxis, :]
+        if len(vectors) != len(problems):
+            raise ValueError("벡터 수와 문제 수가 일치하지 않습니다.")
+
+        start = len(self.metadata)
+        self._add(vectors)
+        for offset, problem in enumerate(problems):
+            self._index_metadata(start + offset, problem)
+        self.metadata.extend(problems)
+
+    def _index_metadata(self, row: int, problem: dict) -> None:
+        """필터링용 (필드, 값) → 행 목록 색인 갱신"""
+        for field in FILTER_FIELDS:
+            if field in problem:
+                key = (field, _normalize(problem[field]))
+                self._postings.setdefault(key, []).append(row)
+
+    def _filter_rows(self, filter_params: Optional[Dict]) -> Optional[np.ndarray]:
+        """필터 조건을 만족하는 행 번호 배열 (필터가 없으면 None)"""
+        if not filter_params:
+            return None
+
+        allowed = None
+        for field, value in filter_params.items():
+            rows = np.asarray(
+                self._postings.get((field, _normalize(value)), []), dtype=np.int64
+            )
+            allowed = (
+                rows
+                if allowed is None
+                else np.intersect1d(allowed, rows, assume_unique=True)
+            )
+        if self._deleted and len(allowed):
+            deleted = np.fromiter(self._deleted, dtype=np.int64)
+            allowed = allowed[~np.isin(allowed, deleted)]
+        return allowed
+
+    def search(
+        self,
+        queries: np.ndarray,
+        top_k: int = 5,
+        filter_params: Optional[Dict] = None,
+    ) -> List[List[Tuple[dict, float]]]:
+        """
+        배치 쿼리에 대해 유사도가 높은 문제 검색
+        Args:
+            queries (np.ndarray): (dim,) 또는 (m, dim) 정규화된 쿼리 벡터
+            top_k (int): 쿼리당 반환할 결과 수
+            filter_params (Optional[Dict]): concept/difficulty 메타데이터 필터
+        Returns:
+            List[List[Tuple[dict, float]]]: 쿼리별 (문제, 유사도) 목록
+        """
+        queries = np.ascontiguousarray(queries, dtype=np.float32)
+        if queries.ndim == 1:
+            queries = queries[np.newaxis, :]
+
+        rows, scores = self.search_rows(queries, top_k, filter_params)
+        return [
+            [
+                (self.metadata[row], float(score))
+                for row, score in zip(row_list, score_list)
+                if row >= 0
+            ]
+            for row_list, score_list in zip(rows, scores)
+        ]
+
+    def search_rows(
+        self,
+        queries: np.ndarray,
+        top_k: int,
+        filter_params: Optional[Dict] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        배치 쿼리의 상위 행 번호와 유사도 반환 (결과가 모자라면 행 번호 -1)
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (m, k) 행 번호, (m, k) 유사도
+        """
+        allowed = self._filter_rows(filter_params)
+        k = min(top_k, self.live_count if allowed is None else len(allowed))
+        if k <= 0 or not len(queries):
+            return (
+                np.full((len(queries), 0), -1, dtype=np.int64),
+                np.zeros((len(queries), 0), dtype=np.float32),
+            )
+        if allowed is not None or not self._deleted:
+            return self._search(queries, k, allowed)
+
+        # 필터가 없으면 삭제된 행 수만큼 더 가져온 뒤 제외
+        rows, scores = self._search(
+            queries, min(k + len(self._deleted), len(self)), None
+        )
+        keep = ~np.isin(rows, np.fromiter(self._deleted, dtype=np.int64))
+        order = np.argsort(~keep, axis=1, kind="stable")[:, :k]
+        rows = np.where(
+            np.take_along_axis(keep, order, axis=1),
+            np.take_along_axis(rows, order, axis=1),
+            -1,
+        )
+        return rows, np.take_along_axis(scores, order, axis=1)
+
+    @abstractmethod
+    def _add(self, vectors: np.ndarray) -> None:
+        """백엔드에 벡터 추가"""
+
+    @abstractmethod
+    def _search(
+        self, queries: np.ndarray, k: int, allowed: Optional[np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """백엔드 검색 (k는 결과 가능 개수 이하로 보정되어 전달됨)"""
+
+
+class NumpyVectorStore(VectorStore):
+    def __init__(self, dim: int, capacity: int = 1024):
+        """
+        NumPy 기반 정확한 검색 저장소
+        Args:
+            dim (int): 임베딩 차원
+            capacity (int): 초기 행렬 용량 (가득 차면 두 배로 확장)
+        """
+        super().__init__(dim)
+        self._matrix = np.empty((capacity, dim), dtype=np.float32)
+        self._size = 0
+
+    @classmethod
+    def from_matrix(
+        cls, matrix: np.ndarray, problems: List[dict]
+    ) -> "NumpyVectorStore":
+        """
+        기존 행렬(memmap 포함)을 복사 없이 감싸는 저장소 생성
+        Args:
+            matrix (np.ndarray): (n, dim) float32 임베딩 행렬
+            problems (List[dict]): 행 순서대로 정렬된 문제 목록
+        """
+        if len(matrix) != len(problems):
+            raise ValueError("벡터 수와 문제 수가 일치하지 않습니다.")
+        store = cls(matrix.shape[1], capacity=0)
+        store._matrix = matrix
+        store._size = len(matrix)
+        for row, problem in enumerate(problems):
+            store._index_metadata(row, problem)
+        store.metadata = list(problems)
+        return store
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self._matrix[: self._size]
+
+    def extend_from_matrix(self, matrix: np.ndarray, problems: List[dict]) -> None:
+        """
+        끝에 새 행이 추가된 원본 행렬(memmap 포함)로 교체하고 새 행의 메타데이터 추가
+        - 디스크 인덱스에 이미 기록된 벡터를 다시 복사하지 않음
+        Args:
+            matrix (np.ndarray): 기존 행 뒤에 len(problems)개 행이 추가된 행렬
+            problems (List[dict]): 추가된 행에 대응하는 문제 목록
+        """
+        start = self._size
+        if len(matrix) - start != len(problems):
+            raise ValueError("벡터 수와 문제 수가 일치하지 않습니다.")
+        self._matrix = matrix
+        self._size = len(matrix)
+        for offset, problem in enumerate(problems):
+            self._index_metadata(start + offset, problem)
+        self.metadata.extend(problems)
+
+    def _add(self, vectors: np.ndarray) -> None:
+        needed = self._size + len(vectors)
+        if needed > len(self._matrix) or not self._matrix.flags.writeable:
+            capacity = max(needed, 2 * len(self._matrix), 1024)
+            matrix = np.empty((capacity, self.dim), dtype=np.float32)
+            matrix[: self._size] = self._matrix[: self._size]
+            self._matrix = matrix
+        self._matrix[self._size : needed] = vectors
+        self._size = needed
+
+    def _search(
+        self, queries: np.ndarray, k: int, allowed: Optional[np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        matrix = self.vectors if allowed is None else self.vectors[allowed]
+        scores = queries @ matrix.T  # (m, n) 단일 행렬 곱
+
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        rows = top if allowed is None else allowed[top]
+        return rows.astype(np.int64, copy=False), top_scores
+
+
+class QuantizedVectorStore(NumpyVectorStore):
+    def __init__(
+        self,
+        dim: int,
+        storage: str = "int8",
+        rescore_factor: int = RESCORE_FACTOR,
+        capacity: int = 1024,
+    ):
+        """
+        압축 행렬로 후보를 찾고 원본 정밀도로 재점수화하는 저장소
+        - 원본 float32 행렬은 보통 디스크 memmap이므로 재점수화할 행만 읽음
+        Args:
+            dim (int): 임베딩 차원
+            storage (str): 'float16' 또는 'int8'
+            rescore_factor (int): k * rescore_factor개 후보를 원본 정밀도로 재계산 (1 이하면 생략)
+            capacity (int): 초기 행렬 용량
+        """
+        super().__init__(dim, capacity=capacity)
+        self.storage = storage
+        self.rescore_factor = rescore_factor
+        self.quantizer = ScalarQuantizer(storage)
+        self._codes = np.empty((capacity, dim), dtype=STORAGE_DTYPES[storage])
+
+    @classmethod
+    def from_matrix(
+        cls,
+        matrix: np.ndarray,
+        problems: List[dict],
+        storage: str = "int8",
+        rescore_factor: int = RESCORE_FACTOR,
+        quantizer: Optional[ScalarQuantizer] = None,
+        codes: Optional[np.ndarray] = None,
+    ) -> "QuantizedVectorStore":
+        """
+        원본 행렬(memmap 포함)과 미리 압축된 행렬로 저장소 생성
+        Args:
+            matrix (np.ndarray): (n, dim) float32 원본 임베딩 행렬 (재점수화용)
+            problems (List[dict]): 행 순서대로 정렬된 문제 목록
+            storage (str): 'float16' 또는 'int8'
+            rescore_factor (int): 재점수화 후보 배수
+            quantizer (Optional[ScalarQuantizer]): codes를 만든 양자화기
+            codes (Optional[np.ndarray]): (n, dim) 압축 행렬 (없으면 청크 단위로 생성)
+        """
+        if len(matrix) != len(problems):
+            raise ValueError("벡터 수와 문제 수가 일치하지 않습니다.")
+        store = cls(matrix.shape[1], storage, rescore_factor, capacity=0)
+        store._matrix = matrix
+        store._size = len(matrix)
+        if codes is None:
+            store.quantizer.fit(matrix)
+            codes = np.empty(matrix.shape, dtype=STORAGE_DTYPES[storage])
+            for start in range(0, len(matrix), SCORE_CHUNK_ROWS):
+                codes[start : start + SCORE_CHUNK_ROWS] = store.quantizer.encode(
+                    matrix[start : start + SCORE_CHUNK_ROWS]
+                )
+        else:
+            store.quantizer = quantizer
+        store._codes = codes
+        for row, problem in enumerate(problems):
+            store._index_metadata(row, problem)
+        store.metadata = list(problems)
+        return store
+
+    def copy(self) -> "QuantizedVectorStore":
+        store = super().copy()
+        store.quantizer = copy.copy(self.quantizer)
+        return store
+
+    @property
+    def memory_bytes(self) -> int:
+        """검색 시 상주하는 압축 행렬과 스케일의 크기"""
+        scale_bytes = 0 if self.quantizer.scale is None else self.quantizer.scale.nbytes
+        return self._codes[: self._size].nbytes + scale_bytes
+
+    def _add(self, vectors: np.ndarray) -> None:
+        start = self._size
+        super()._add(vectors)
+        self._encode_rows(start, vectors)
+
+    def extend_from_matrix(self, matrix: np.ndarray, problems: List[dict]) -> None:
+        start = self._size
+        super().extend_from_matrix(matrix, problems)
+        self._encode_rows(start, np.asarray(matrix[start:], dtype=np.float32))
+
+    def _encode_rows(self, start: int, vectors: np.ndarray) -> None:
+        """start 행부터 압축 행렬에 기록 (가득 찼거나 읽기 전용이면 확장/복사)"""
+        if self.quantizer.mode == "int8" and self.quantizer.scale is None:
+            self.quantizer.fit(vectors)
+        if self._size > len(self._codes) or not self._codes.flags.writeable:
+            capacity = max(self._size, 2 * len(self._codes))
+            codes = np.empty((capacity, self.dim), dtype=self._codes.dtype)
+            codes[:start] = self._codes[:start]
+            self._codes = codes
+        self._codes[start : self._size] = self.quantizer.encode(vectors)
+
+    def _search(
+        self, queries: np.ndarray, k: int, allowed: Optional[np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        codes = self._codes[: self._size] if allowed is None else self._codes[allowed]
+        scores = self.quantizer.scores(codes, queries)  # 압축 상태에서 근사 점수
+
+        n_candidates = min(max(k, k * self.rescore_factor), scores.shape[1])
+        top = np.argpartition(-scores, n_candidates - 1, axis=1)[:, :n_candidates]
+        rows = top if allowed is None else allowed[top]
+
+        if self.rescore_factor > 1:
+            # 후보 행만 원본 정밀도로 읽어 다시 점수 계산
+            unique_rows, inverse = np.unique(rows, return_inverse=True)
+            full = np.asarray(self._matrix[unique_rows], dtype=np.float32)
+            candidate_vectors = full[inverse.reshape(rows.shape)]
+            top_scores = np.einsum("md,mcd->mc", queries, candidate_vectors)
+        else:
+            top_scores = np.take_along_axis(scores, top, axis=1)
+
+        order = np.argsort(-top_scores, axis=1)[:, :k]
+        rows = np.take_along_axis(rows, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        return rows.astype(np.int64, copy=False), top_scores
+
+
+class FaissVectorStore(VectorStore):
+    INDEX_TYPES = ("flat", "ivf", "hnsw")
+
+    def __init__(
+        self,
+        dim: int,
+        index_type: str = "hnsw",
+        nlist: int = 256,
+        nprobe: int = 16,
+        hnsw_m: int = 32,
+        ef_search: int = 64,
+        exact_filter_limit: int = EXACT_FILTER_LIMIT,
+    ):
+        """
+        FAISS 기반 검색 저장소 (내적 = 정규화 벡터의 코사인 유사도)
+        Args:
+            dim (int): 임베딩 차원
+            index_type (str): 'flat', 'ivf', 'hnsw' 중 하나
+            nlist (int): IVF 클러스터 수 (학습 데이터가 적으면 자동으로 줄임)
+            nprobe (int): IVF 검색 시 탐색할 클러스터 수
+            hnsw_m (int): HNSW 노드당 연결 수
+            ef_search (int): HNSW 검색 후보 크기
+            exact_filter_limit (int): 필터된 후보가 이 수 이하이면 후보만 정확히 검색
+        """
+        if faiss is None:
+            raise ImportError("FAISS 백엔드를 사용하려면 faiss-cpu를 설치하세요.")
+        if index_type not in self.INDEX_TYPES:
+            raise ValueError(f"지원하지 않는 FAISS 인덱스 유형입니다: {index_type}")
+
+        super().__init__(dim)
+        self.index_type = index_type
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.ef_search = ef_search
+        self.exact_filter_limit = exact_filter_limit
+
+        if index_type == "flat":
+            self.index = faiss.IndexFlatIP(dim)
+        elif index_type == "hnsw":
+            self.index = faiss.IndexHNSWFlat(dim, hnsw_m, faiss.METRIC_INNER_PRODUCT)
+            self.index.hnsw.efSearch = ef_search
+        else:
+            self.index = None  # 첫 벡터 추가 시 학습
+
+    def copy(self) -> "FaissVectorStore":
+        store = super().copy()
+        if self.index is not None:
+            store.index = faiss.clone_index(self.index)
+        return store
+
+    def _add(self, vectors: np.ndarray) -> None:
+        if self.index is None:
+            # 클러스터당 최소 39개 학습 벡터를 보장하도록 nlist 조정
+            nlist = max(1, min(self.nlist, len(vectors) // 39))
+            self._quantizer = faiss.IndexFlatIP(self.dim)
+            self.index = faiss.IndexIVFFlat(
+                self._quantizer, self.dim, nlist, faiss.METRIC_INNER_PRODUCT
+            )
+            self.index.train(vectors)
+            self.index.nprobe = min(self.nprobe, nlist)
+            self.index.set_direct_map_type(faiss.DirectMap.Array)
+        self.index.add(vectors)
+
+    def _search_params(self, allowed: Optional[np.ndarray]):
+        if allowed is None:
+            return None
+        selector = faiss.IDSelectorBatch(allowed.astype(np.int64))
+        if self.index_type == "ivf":
+            return faiss.SearchParametersIVF(sel=selector, nprobe=self.index.nprobe)
+        if self.index_type == "hnsw":
+            return faiss.SearchParametersHNSW(sel=selector, efSearch=self.ef_search)
+        return faiss.SearchParameters(sel=selector)
+
+    def _search(
+        self, queries: np.ndarray, k: int, allowed: Optional[np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        if allowed is not None and len(allowed) <= self.exact_filter_limit:
+            # 선택도가 높은 필터는 근사 인덱스의 재현율이 급격히 떨어지므로
+            # 후보 벡터만 복원하여 정확히 검색
+            candidates = self.index.reconstruct_batch(allowed.astype(np.int64))
+            scores = queries @ candidates.T
+            top = np.argsort(-scores, axis=1)[:, :k]
+            return allowed[top], np.take_along_axis(scores, top, axis=1)
+
+        params = self._search_params(allowed)
+        scores, rows = self.index.search(queries, k, params=params)
+        return rows, scores
+
+
+def create_vector_store(
+    dim: int, config: Optional[Dict] = None, size_hint: int = 0
+) -> VectorStore:
+    """
+    설정에 따라 벡터 저장소 생성
+    Args:
+        dim (int): 임베딩 차원
+        config (Optional[Dict]): {'backend': 'numpy' | 'faiss-flat' | 'faiss-ivf'
+            | 'faiss-hnsw' | 'auto', 'storage': 'float32' | 'float16' | 'int8',
+            ...백엔드별 옵션}
+        size_hint (int): 예상 문제 수 (auto 모드에서 백엔드 선택에 사용)
+    Returns:
+        VectorStore: 생성된 벡터 저장소
+    """
+    config = dict(config or {})
+    backend = config.pop("backend", os.getenv("VECTOR_STORE_BACKEND", "auto"))
+    storage = config.pop("storage", os.getenv("VECTOR_STORE_STORAGE", "float32"))
+
+    if backend == "auto":
+        backend = (
+            "faiss-hnsw"
+            if faiss is not None and size_hint >= AUTO_FAISS_THRESHOLD
+            else "numpy"
+        )
+
+    if backend == "numpy":
+        if storage != "float32":
+            return QuantizedVectorStore(dim, storage, **config)
+        return NumpyVectorStore(dim, **config)
+    if backend.startswith("faiss-"):
+        return FaissVectorStore(dim, index_type=backend[len("faiss-") :], **config)
+    raise ValueError(f"지원하지 않는 벡터 저장소 백엔드입니다: {backend}")
+
+
+def evaluate_recall(
+    store: VectorStore,
+    exact_store: VectorStore,
+    queries: np.ndarray,
+    top_k: int = 10,
+    filter_params: Optional[Dict] = None,
+) -> Dict:
+    """
+    정확한 검색 결과 대비 recall@k와 쿼리 지연 시간 측정
+    Args:
+        store (VectorStore): 평가할 저장소
+        exact_store (VectorStore): 기준이 되는 정확한 검색 저장소
+        queries (np.ndarray): (m, dim) 쿼리 행렬
+        top_k (int): 비교할 상위 결과 수
+        filter_params (Optional[Dict]): 메타데이터 필터
+    Returns:
+        Dict: recall@k와 쿼리당 평균 지연 시간(ms)
+    """
+    queries = np.ascontiguousarray(queries, dtype=np.float32)
+
+    start = time.perf_counter()
+    exact_rows, _ = exact_store.search_rows(queries, top_k, filter_params)
+    exact_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    start = time.perf_counter()
+    rows, _ = store.search_rows(queries, top_k, filter_params)
+    store_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    hits = sum(
+        len(np.intersect1d(found[found >= 0], expected[expected >= 0]))
+        for found, expected in zip(rows, exact_rows)
+    )
+    total = int((exact_rows >= 0).sum())
+
+    return {
+        f"recall@{top_k}": hits / total if total else 1.0,
+        "latency_ms": store_ms,
+        "exact_latency_ms": exact_ms,
+    }